@@ -20,6 +20,7 @@ class Alb(Construct):
             id: str,
             vpc: Vpc,
             asg: Asg,
+            deregistration_delay: int = 10,
             health_check_path: str = "/",
             target_group_https: bool = True,
             **props):
@@ -169,7 +170,7 @@ class Alb(Construct):
             target_group_attributes=[
                 aws_elasticloadbalancingv2.CfnTargetGroup.TargetGroupAttributeProperty(
                     key='deregistration_delay.timeout_seconds',
-                    value='10'
+                    value=str(deregistration_delay)
                 )
             ],
             target_type="instance",
@@ -1,32 +1,46 @@
+import math
+
 from aws_cdk import (
     Aws,
     aws_autoscaling,
     aws_backup,
     aws_cloudwatch,
+    aws_dlm,
     aws_ec2,
     aws_events,
     aws_iam,
     aws_lambda,
     aws_logs,
+    aws_ssm,
     CfnAutoScalingReplacingUpdate,
     CfnAutoScalingRollingUpdate,
     CfnAutoScalingScheduledAction,
     CfnCondition,
     CfnCreationPolicy,
     CfnDeletionPolicy,
+    CfnMapping,
     CfnOutput,
     CfnParameter,
     CfnResourceSignal,
+    CfnRule,
+    CfnRuleAssertion,
     CfnTag,
     CfnUpdatePolicy,
     CustomResource,
     Duration,
     Fn,
+    Stack,
     Tags,
     Token
 )
 
 from constructs import Construct
+from oe_patterns_cdk_common.bootstrap_runner import BootstrapRunner
+from oe_patterns_cdk_common.cloudwatch_agent import CloudWatchAgentConfig
+from oe_patterns_cdk_common.compressed_user_data import CompressedUserData
+from oe_patterns_cdk_common.instance_types import InstanceTypes
+from oe_patterns_cdk_common.performance_profile import PerformanceProfile
+from oe_patterns_cdk_common.subnet_az_provider import SubnetAzProvider
 from oe_patterns_cdk_common.util import Util
 from oe_patterns_cdk_common.vpc import Vpc
 
@@ -34,24 +48,62 @@ class Asg(Construct):
 
     TWO_YEARS_IN_DAYS=731
 
-    GRAVITON_INSTANCE_TYPES = [
-        "t4g.nano", "t4g.micro", "t4g.small", "t4g.medium", "t4g.large", "t4g.xlarge", "t4g.2xlarge",
-        "a1.medium", "a1.large", "a1.xlarge", "a1.2xlarge", "a1.4xlarge", "a1.metal",
-        "c7g.medium", "c7g.large", "c7g.xlarge", "c7g.2xlarge", "c7g.4xlarge", "c7g.8xlarge", "c7g.12xlarge", "c7g.16xlarge", "c7g.metal",
-        "m7g.medium", "m7g.large", "m7g.xlarge", "m7g.2xlarge", "m7g.4xlarge", "m7g.8xlarge", "m7g.12xlarge", "m7g.16xlarge", "m7g.metal",
-        "r7g.medium", "r7g.large", "r7g.xlarge", "r7g.2xlarge", "r7g.4xlarge", "r7g.8xlarge", "r7g.12xlarge", "r7g.16xlarge", "r7g.metal"
-    ]
-
-    STANDARD_INSTANCE_TYPES = [
-        "t2.nano", "t2.micro", "t2.small", "t2.medium", "t2.large", "t2.xlarge", "t2.2xlarge",
-        "t3.nano", "t3.micro", "t3.small", "t3.medium", "t3.large", "t3.xlarge", "t3.2xlarge",
-        "c5.large", "c5.xlarge", "c5.2xlarge", "c5.4xlarge", "c5.9xlarge", "c5.12xlarge", "c5.18xlarge", "c5.24xlarge", "c5.metal",
-        "c5d.large", "c5d.xlarge", "c5d.2xlarge", "c5d.4xlarge", "c5d.9xlarge", "c5d.12xlarge", "c5d.18xlarge", "c5d.24xlarge",
-        "m5.large", "m5.xlarge", "m5.2xlarge", "m5.4xlarge", "m5.8xlarge", "m5.12xlarge", "m5.16xlarge", "m5.24xlarge", "m5.metal",
-        "m5d.large", "m5d.xlarge", "m5d.2xlarge", "m5d.4xlarge", "m5d.8xlarge", "m5d.12xlarge", "m5d.16xlarge", "m5d.24xlarge", "m5d.metal",
-        "r5.large", "r5.xlarge", "r5.2xlarge", "r5.4xlarge", "r5.8xlarge", "r5.12xlarge", "r5.16xlarge", "r5.24xlarge", "r5.metal",
-        "r5d.large", "r5d.xlarge", "r5d.2xlarge", "r5d.4xlarge", "r5d.8xlarge", "r5d.12xlarge", "r5d.16xlarge", "r5d.24xlarge", "r5d.metal"
-    ]
+    VOLUME_IOPS = [ 3000, 4000, 5000, 6000, 8000, 10000, 12000, 16000, 20000, 32000, 48000, 64000 ]
+    VOLUME_THROUGHPUTS = [ 125, 250, 500, 750, 1000 ]
+    GP3_MAX_IOPS = 16000
+    GP3_MAX_IOPS_PER_GIB = 500
+    GP3_MAX_THROUGHPUT_PER_IOPS = 0.25
+    IO2_MAX_IOPS_PER_GIB = 1000
+
+    # hibernation requires an encrypted root volume with room for the instance memory,
+    # instance store volumes can not be hibernated
+    HIBERNATION_INSTANCE_FAMILIES = [ "c5", "c7i", "m4", "m5", "m7i", "r4", "r5", "r6i", "r7i", "t2", "t3" ]
+    HIBERNATION_MAX_MEMORY_GIB = 150
+    HIBERNATION_INSTANCE_TYPES = InstanceTypes.query(
+        families=HIBERNATION_INSTANCE_FAMILIES,
+        local_nvme=False,
+        max_memory_gib=HIBERNATION_MAX_MEMORY_GIB,
+        metal=False
+    )
+    DATA_VOLUME_SNAPSHOT_TAG = "DataVolumeSnapshotSet"
+    # a hibernated in service instance fails its health checks, so they are suspended
+    HIBERNATION_SUSPENDED_PROCESSES = [ "HealthCheck", "ReplaceUnhealthy", "AZRebalance" ]
+
+    # bootstrap runner step of each built-in user data part, parts sharing shell state share a step;
+    # the remaining parts run in order once all steps have succeeded
+    BOOTSTRAP_PART_STEPS = {
+        "script_cloudwatch_fetch_config.sh": "cloudwatch_agent",
+        "script_cloudwatch_start.sh": "cloudwatch_agent",
+        "performance_profile": "performance_profile",
+        "script_attach_ebs.sh": "data_volume",
+        "script_prewarm_data_volume.sh": "data_volume",
+        "script_mount_instance_store.sh": "instance_store",
+        "user_data_contents": "user_data",
+        "script_graceful_drain.sh": "graceful_drain"
+    }
+    # both steps may install mdadm, which fails while the other holds the package manager lock
+    BOOTSTRAP_STEP_DEPENDENCIES = {
+        "instance_store": [ "data_volume" ]
+    }
+
+    DATA_VOLUME_FILESYSTEMS = [ "ext4", "xfs" ]
+    # mount options only supported by some filesystems, and the ones the construct manages
+    DATA_VOLUME_FILESYSTEM_MOUNT_OPTIONS = { "allocsize": "xfs", "commit": "ext4", "data": "ext4" }
+    DATA_VOLUME_MANAGED_MOUNT_OPTIONS = [ "defaults", "discard", "nofail" ]
+    # mdadm default chunk size, ext4 does not detect the RAID0 geometry itself
+    DATA_VOLUME_RAID_CHUNK_KIB = 512
+    DATA_VOLUME_RESTORE_MODES = [ "fast_snapshot_restore", "prewarm" ]
+    # continuous discard on every delete, or a weekly batch with fstrim.timer
+    DATA_VOLUME_TRIM_MODES = [ "discard", "fstrim" ]
+
+    PLACEMENT_STRATEGIES = [ "cluster", "partition", "spread" ]
+    MAX_PLACEMENT_PARTITIONS = 7
+
+    GRAVITON_INSTANCE_FAMILIES = [ "t4g", "a1", "c7g", "m7g", "r7g", "c8g", "m8g", "r8g" ]
+    GRAVITON_INSTANCE_TYPES = InstanceTypes.query(families=GRAVITON_INSTANCE_FAMILIES)
+
+    STANDARD_INSTANCE_FAMILIES = [ "t2", "t3", "c5", "c5d", "m5", "m5d", "r5", "r5d", "c7i", "m7i", "r7i" ]
+    STANDARD_INSTANCE_TYPES = InstanceTypes.query(families=STANDARD_INSTANCE_FAMILIES)
 
     def __init__(
             self,
@@ -64,27 +116,75 @@ class Asg(Construct):
             allow_update_secret: bool = False,
             allowed_instance_types: 'list[str]' = [],
             ami_id_param_name_suffix: str = "",
+            bootstrap_steps: 'list[dict]' = [],
+            cloudwatch_agent_log_files: 'list[dict]' = [],
             create_and_update_timeout_minutes: int = 15,
+            data_volume_count: int = 1,
+            data_volume_filesystem: str = "xfs",
+            data_volume_mkfs_options: str = "",
+            data_volume_mount_options: 'list[str]' = [],
+            data_volume_restore_mode: str = None,
+            data_volume_trim: str = None,
             default_instance_type: str = None,
+            deployment_instance_refresh: bool = False,
             deployment_rolling_update: bool = False,
+            drain_ports: 'list[int]' = [80, 443],
             excluded_instance_families: 'list[str]' = [],
             excluded_instance_sizes: 'list[str]' = [],
             health_check_type: str = 'EC2',
+            instance_store_mount_path: str = None,
+            metrics_collection_interval: int = None,
+            metrics_procstat_patterns: 'list[str]' = [],
+            metrics_profile: str = "standard",
+            mixed_instance_types: 'list[str]' = [],
             notification_topic_arn: str = None,
+            performance_profile: str = None,
             pipeline_bucket_arn: str = None,
+            placement_partition_count: int = None,
+            placement_strategy: str = None,
             root_volume_device_name: str = "/dev/sda1",
             root_volume_size: int = 0,
             secret_arns: 'list[str]' = [],
             singleton: bool = False,
             use_data_volume: bool = False,
+            use_data_volume_recovery: bool = False,
             use_graviton: bool = True,
+            use_bootstrap_runner: bool = False,
+            use_business_hours_schedule: bool = False,
+            use_capacity_reservation: bool = False,
+            use_cloudwatch_agent_config: bool = False,
+            use_cloudwatch_agent_emf: bool = False,
+            use_compressed_user_data: bool = False,
+            use_graceful_drain: bool = False,
+            use_hibernation: bool = False,
+            use_mixed_instances_policy: bool = False,
             use_public_subnets: bool = False,
+            use_subnet_az_provider: bool = False,
+            use_target_tracking_scaling: bool = False,
+            use_warm_pool: bool = False,
             user_data_contents: str = None,
             user_data_variables: dict = {},
             **props):
         super().__init__(scope, id, **props)
+        self._id = id
         self._singleton = singleton
         self._use_data_volume = use_data_volume
+        self._data_volume_count = data_volume_count
+        self._root_volume_size = root_volume_size
+        self._use_mixed_instances_policy = use_mixed_instances_policy
+        self._use_target_tracking_scaling = use_target_tracking_scaling and not singleton
+        self._use_warm_pool = use_warm_pool and not singleton
+        self._deployment_instance_refresh = deployment_instance_refresh and not singleton
+        self._use_business_hours_schedule = use_business_hours_schedule and not singleton
+        self._use_graceful_drain = use_graceful_drain
+        self._use_capacity_reservation = use_capacity_reservation
+        self.scaling_request_count_target_param = None
+        self.cloudwatch_agent_config = CloudWatchAgentConfig(
+            metrics_profile=metrics_profile,
+            metrics_collection_interval=metrics_collection_interval,
+            procstat_patterns=metrics_procstat_patterns
+        )
+        self.performance_profile = PerformanceProfile(performance_profile) if performance_profile else None
 
         if use_graviton:
             if not default_instance_type:
@@ -101,10 +201,76 @@ class Asg(Construct):
                not any(item.endswith(size) for size in excluded_instance_sizes):
                 filtered_defaults.append(item)
 
+        instance_type_allowed_values = allowed_instance_types if allowed_instance_types else filtered_defaults
+        if data_volume_restore_mode is not None:
+            if data_volume_restore_mode not in Asg.DATA_VOLUME_RESTORE_MODES:
+                raise ValueError(f"data_volume_restore_mode must be one of {', '.join(Asg.DATA_VOLUME_RESTORE_MODES)}")
+            if not use_data_volume or data_volume_count != 1:
+                raise ValueError("data_volume_restore_mode requires use_data_volume with a single data volume restored from a snapshot")
+        self._data_volume_restore_mode = data_volume_restore_mode
+        if bootstrap_steps and not use_bootstrap_runner:
+            raise ValueError("bootstrap_steps requires use_bootstrap_runner")
+        if data_volume_filesystem not in Asg.DATA_VOLUME_FILESYSTEMS:
+            raise ValueError(f"data_volume_filesystem must be one of {', '.join(Asg.DATA_VOLUME_FILESYSTEMS)}")
+        if data_volume_trim is not None and data_volume_trim not in Asg.DATA_VOLUME_TRIM_MODES:
+            raise ValueError(f"data_volume_trim must be one of {', '.join(Asg.DATA_VOLUME_TRIM_MODES)}")
+        for option in data_volume_mount_options:
+            name = option.split("=")[0]
+            if name in Asg.DATA_VOLUME_MANAGED_MOUNT_OPTIONS:
+                raise ValueError(f"data_volume_mount_options can not include {name}, it is set by the construct (see data_volume_trim for discard)")
+            if Asg.DATA_VOLUME_FILESYSTEM_MOUNT_OPTIONS.get(name, data_volume_filesystem) != data_volume_filesystem:
+                raise ValueError(f"data_volume_mount_options {name} is only supported by {Asg.DATA_VOLUME_FILESYSTEM_MOUNT_OPTIONS[name]}")
+        if use_data_volume_recovery and not (singleton and use_data_volume and data_volume_count == 1):
+            raise ValueError("use_data_volume_recovery requires singleton and use_data_volume with a single data volume")
+        self._use_data_volume_recovery = use_data_volume_recovery
+        self._use_subnet_az_provider = use_subnet_az_provider
+        # instances hibernate into the warm pool, or a singleton instance is hibernated in
+        # service by the hibernate automation document, which suspends health checks first
+        if use_hibernation:
+            if not (singleton or self._use_warm_pool):
+                raise ValueError("use_hibernation requires singleton or use_warm_pool")
+            if instance_store_mount_path:
+                raise ValueError("use_hibernation can not be used with instance_store_mount_path")
+            if root_volume_size == 0:
+                raise ValueError("root_volume_size is required when use_hibernation is True, the root volume is sized to it plus the instance memory")
+            if use_mixed_instances_policy:
+                raise ValueError("use_hibernation can not be used with use_mixed_instances_policy")
+            if default_instance_type not in Asg.HIBERNATION_INSTANCE_TYPES:
+                raise ValueError(f"default_instance_type {default_instance_type} does not support hibernation")
+            instance_type_allowed_values = [
+                item for item in instance_type_allowed_values if item in Asg.HIBERNATION_INSTANCE_TYPES
+            ]
+        if placement_strategy is not None and placement_strategy not in Asg.PLACEMENT_STRATEGIES:
+            raise ValueError(f"placement_strategy must be one of {', '.join(Asg.PLACEMENT_STRATEGIES)}")
+        if placement_strategy == "partition":
+            if placement_partition_count is None or not 1 <= placement_partition_count <= Asg.MAX_PLACEMENT_PARTITIONS:
+                raise ValueError(f"placement_partition_count between 1 and {Asg.MAX_PLACEMENT_PARTITIONS} is required when placement_strategy is partition")
+        elif placement_partition_count is not None:
+            raise ValueError("placement_partition_count can only be used when placement_strategy is partition")
+        if placement_strategy == "cluster":
+            # burstable instances can not be launched in a cluster placement group
+            for item in [default_instance_type] + mixed_instance_types:
+                instance_type = InstanceTypes.get(item)
+                if instance_type and instance_type.burstable:
+                    raise ValueError(f"Instance type {item} is burstable and can not be used with placement_strategy cluster")
+            instance_type_allowed_values = [
+                item for item in instance_type_allowed_values
+                if not (InstanceTypes.get(item) and InstanceTypes.get(item).burstable)
+            ]
+        if use_mixed_instances_policy:
+            if not mixed_instance_types:
+                raise ValueError("mixed_instance_types is required when use_mixed_instances_policy is True")
+            if default_instance_type in mixed_instance_types:
+                raise ValueError(f"default_instance_type {default_instance_type} can not also be listed in mixed_instance_types")
+            # launch template overrides must be unique
+            instance_type_allowed_values = [
+                item for item in instance_type_allowed_values if item not in mixed_instance_types
+            ]
+
         self.instance_type_param = CfnParameter(
             self,
             "AsgInstanceType",
-            allowed_values=allowed_instance_types if allowed_instance_types else filtered_defaults,
+            allowed_values=instance_type_allowed_values,
             default=default_instance_type,
             description="Required: The EC2 instance type for the application Auto Scaling Group."
         )
@@ -169,6 +335,296 @@ class Asg(Construct):
             )
             self.min_size_param.override_logical_id(f"{id}MinSize")
 
+        if self._use_target_tracking_scaling:
+            self.scaling_cpu_target_param = CfnParameter(
+                self,
+                "AsgScalingCpuTarget",
+                default=70,
+                description="Optional: The target average CPU utilization percentage for the Auto Scaling Group. Set to 0 to disable CPU based scaling.",
+                min_value=0,
+                max_value=100,
+                type="Number"
+            )
+            self.scaling_cpu_target_param.override_logical_id(f"{id}ScalingCpuTarget")
+            self.scaling_cpu_target_condition = CfnCondition(
+                self,
+                "AsgScalingCpuTargetCondition",
+                expression=Fn.condition_not(Fn.condition_equals(self.scaling_cpu_target_param.value, "0"))
+            )
+            self.scaling_cpu_target_condition.override_logical_id(f"{id}ScalingCpuTargetCondition")
+            self.scaling_network_in_target_param = CfnParameter(
+                self,
+                "AsgScalingNetworkInTarget",
+                default=0,
+                description="Optional: The target average number of bytes received per instance for the Auto Scaling Group. Set to 0 to disable network in based scaling.",
+                min_value=0,
+                type="Number"
+            )
+            self.scaling_network_in_target_param.override_logical_id(f"{id}ScalingNetworkInTarget")
+            self.scaling_network_in_target_condition = CfnCondition(
+                self,
+                "AsgScalingNetworkInTargetCondition",
+                expression=Fn.condition_not(Fn.condition_equals(self.scaling_network_in_target_param.value, "0"))
+            )
+            self.scaling_network_in_target_condition.override_logical_id(f"{id}ScalingNetworkInTargetCondition")
+            self.scaling_network_out_target_param = CfnParameter(
+                self,
+                "AsgScalingNetworkOutTarget",
+                default=0,
+                description="Optional: The target average number of bytes sent per instance for the Auto Scaling Group. Set to 0 to disable network out based scaling.",
+                min_value=0,
+                type="Number"
+            )
+            self.scaling_network_out_target_param.override_logical_id(f"{id}ScalingNetworkOutTarget")
+            self.scaling_network_out_target_condition = CfnCondition(
+                self,
+                "AsgScalingNetworkOutTargetCondition",
+                expression=Fn.condition_not(Fn.condition_equals(self.scaling_network_out_target_param.value, "0"))
+            )
+            self.scaling_network_out_target_condition.override_logical_id(f"{id}ScalingNetworkOutTargetCondition")
+            self.predictive_scaling_mode_param = CfnParameter(
+                self,
+                "AsgPredictiveScalingMode",
+                allowed_values=[ "Disabled", "ForecastOnly", "ForecastAndScale" ],
+                default="Disabled",
+                description="Optional: Predictive scaling mode for the Auto Scaling Group. Forecasts use the CPU and ALB request count targets of the reactive scaling policies."
+            )
+            self.predictive_scaling_mode_param.override_logical_id(f"{id}PredictiveScalingMode")
+            self.predictive_scaling_scheduling_buffer_param = CfnParameter(
+                self,
+                "AsgPredictiveScalingSchedulingBuffer",
+                default=300,
+                description="Required: The number of seconds by which predictive scaling launches instances ahead of the forecasted load.",
+                min_value=0,
+                max_value=3600,
+                type="Number"
+            )
+            self.predictive_scaling_scheduling_buffer_param.override_logical_id(f"{id}PredictiveScalingSchedulingBuffer")
+            self.predictive_scaling_condition = CfnCondition(
+                self,
+                "AsgPredictiveScalingCondition",
+                expression=Fn.condition_not(Fn.condition_equals(self.predictive_scaling_mode_param.value, "Disabled"))
+            )
+            self.predictive_scaling_condition.override_logical_id(f"{id}PredictiveScalingCondition")
+            self.predictive_cpu_scaling_condition = CfnCondition(
+                self,
+                "AsgPredictiveCpuScalingCondition",
+                expression=Fn.condition_and(self.predictive_scaling_condition, self.scaling_cpu_target_condition)
+            )
+            self.predictive_cpu_scaling_condition.override_logical_id(f"{id}PredictiveCpuScalingCondition")
+
+        if use_mixed_instances_policy:
+            self.on_demand_base_capacity_param = CfnParameter(
+                self,
+                "AsgOnDemandBaseCapacity",
+                default=1,
+                description="Required: The minimum number of instances in the Auto Scaling Group that are always On-Demand instances.",
+                min_value=0,
+                type="Number"
+            )
+            self.on_demand_base_capacity_param.override_logical_id(f"{id}OnDemandBaseCapacity")
+            self.on_demand_percentage_above_base_capacity_param = CfnParameter(
+                self,
+                "AsgOnDemandPercentageAboveBaseCapacity",
+                default=100,
+                description="Required: The percentage of instances above the On-Demand base capacity that are On-Demand instances. The remainder are Spot instances.",
+                min_value=0,
+                max_value=100,
+                type="Number"
+            )
+            self.on_demand_percentage_above_base_capacity_param.override_logical_id(f"{id}OnDemandPercentageAboveBaseCapacity")
+            self.spot_allocation_strategy_param = CfnParameter(
+                self,
+                "AsgSpotAllocationStrategy",
+                allowed_values=[
+                    "price-capacity-optimized",
+                    "capacity-optimized",
+                    "capacity-optimized-prioritized",
+                    "lowest-price"
+                ],
+                default="price-capacity-optimized",
+                description="Required: The strategy used to allocate Spot instances across the instance types of the Auto Scaling Group."
+            )
+            self.spot_allocation_strategy_param.override_logical_id(f"{id}SpotAllocationStrategy")
+
+        if self._use_business_hours_schedule:
+            self.business_hours_schedule_param = CfnParameter(
+                self,
+                "AsgBusinessHoursSchedule",
+                allowed_values=[ "true", "false" ],
+                default="false",
+                description="Optional: If 'true', the Auto Scaling Group is scaled to the off hours capacity outside of business hours."
+            )
+            self.business_hours_schedule_param.override_logical_id(f"{id}BusinessHoursSchedule")
+            self.business_hours_schedule_condition = CfnCondition(
+                self,
+                "AsgBusinessHoursScheduleCondition",
+                expression=Fn.condition_equals(self.business_hours_schedule_param.value, "true")
+            )
+            self.business_hours_schedule_condition.override_logical_id(f"{id}BusinessHoursScheduleCondition")
+            self.business_hours_start_param = CfnParameter(
+                self,
+                "AsgBusinessHoursStart",
+                default="0 8 * * MON-FRI",
+                description="Required: The cron expression for the start of business hours, when the Auto Scaling Group returns to its configured capacity."
+            )
+            self.business_hours_start_param.override_logical_id(f"{id}BusinessHoursStart")
+            self.business_hours_end_param = CfnParameter(
+                self,
+                "AsgBusinessHoursEnd",
+                default="0 18 * * MON-FRI",
+                description="Required: The cron expression for the end of business hours, when the Auto Scaling Group is scaled to the off hours capacity."
+            )
+            self.business_hours_end_param.override_logical_id(f"{id}BusinessHoursEnd")
+            self.business_hours_time_zone_param = CfnParameter(
+                self,
+                "AsgBusinessHoursTimeZone",
+                default="Etc/UTC",
+                description="Required: The IANA time zone for the business hours cron expressions, for example 'America/New_York'."
+            )
+            self.business_hours_time_zone_param.override_logical_id(f"{id}BusinessHoursTimeZone")
+            self.off_hours_capacity_param = CfnParameter(
+                self,
+                "AsgOffHoursCapacity",
+                default=0,
+                description="Required: The minimum size and desired capacity of the Auto Scaling Group outside of business hours.",
+                min_value=0,
+                type="Number"
+            )
+            self.off_hours_capacity_param.override_logical_id(f"{id}OffHoursCapacity")
+
+        if self._deployment_instance_refresh:
+            self.instance_refresh_min_healthy_percentage_param = CfnParameter(
+                self,
+                "AsgInstanceRefreshMinHealthyPercentage",
+                default=90,
+                description="Required: The percentage of the Auto Scaling Group that must remain in service during an instance refresh.",
+                min_value=0,
+                max_value=100,
+                type="Number"
+            )
+            self.instance_refresh_min_healthy_percentage_param.override_logical_id(f"{id}InstanceRefreshMinHealthyPercentage")
+            self.instance_refresh_instance_warmup_param = CfnParameter(
+                self,
+                "AsgInstanceRefreshInstanceWarmup",
+                default=300,
+                description="Required: The number of seconds after a new instance is in service before the instance refresh moves on to the next batch.",
+                min_value=0,
+                type="Number"
+            )
+            self.instance_refresh_instance_warmup_param.override_logical_id(f"{id}InstanceRefreshInstanceWarmup")
+            self.instance_refresh_checkpoint_percentages_param = CfnParameter(
+                self,
+                "AsgInstanceRefreshCheckpointPercentages",
+                allowed_pattern=r"^((\d{1,2},)*100)?$",
+                constraint_description="must be a comma separated list of ascending percentages ending with 100",
+                default="",
+                description="Optional: Comma separated list of percentages of replaced instances at which an instance refresh pauses, ending with 100. Leave blank to refresh without checkpoints."
+            )
+            self.instance_refresh_checkpoint_percentages_param.override_logical_id(f"{id}InstanceRefreshCheckpointPercentages")
+            self.instance_refresh_checkpoint_delay_param = CfnParameter(
+                self,
+                "AsgInstanceRefreshCheckpointDelay",
+                default=300,
+                description="Required: The number of seconds an instance refresh waits at each checkpoint.",
+                min_value=0,
+                type="Number"
+            )
+            self.instance_refresh_checkpoint_delay_param.override_logical_id(f"{id}InstanceRefreshCheckpointDelay")
+            self.instance_refresh_skip_matching_param = CfnParameter(
+                self,
+                "AsgInstanceRefreshSkipMatching",
+                allowed_values=[ "true", "false" ],
+                default="true",
+                description="Required: If 'true', an instance refresh skips instances already running the latest launch template version."
+            )
+            self.instance_refresh_skip_matching_param.override_logical_id(f"{id}InstanceRefreshSkipMatching")
+
+        if self._use_warm_pool:
+            self.warm_pool_state_param = CfnParameter(
+                self,
+                "AsgWarmPoolState",
+                # instances can only hibernate with hibernation enabled in the launch template
+                allowed_values=[ "Stopped", "Hibernated", "Running" ] if use_hibernation else [ "Stopped", "Running" ],
+                default="Stopped",
+                description="Required: The state of pre-initialized instances in the Auto Scaling Group warm pool."
+            )
+            self.warm_pool_state_param.override_logical_id(f"{id}WarmPoolState")
+            self.warm_pool_min_size_param = CfnParameter(
+                self,
+                "AsgWarmPoolMinSize",
+                default=0,
+                description="Required: The minimum number of instances to maintain in the Auto Scaling Group warm pool.",
+                min_value=0,
+                type="Number"
+            )
+            self.warm_pool_min_size_param.override_logical_id(f"{id}WarmPoolMinSize")
+            self.warm_pool_max_prepared_capacity_param = CfnParameter(
+                self,
+                "AsgWarmPoolMaxPreparedCapacity",
+                default=-1,
+                description="Required: The maximum number of instances allowed in the warm pool and in service combined. Set to -1 to use the maximum size of the Auto Scaling Group.",
+                min_value=-1,
+                type="Number"
+            )
+            self.warm_pool_max_prepared_capacity_param.override_logical_id(f"{id}WarmPoolMaxPreparedCapacity")
+
+        if use_graceful_drain:
+            self.drain_timeout_param = CfnParameter(
+                self,
+                "AsgDrainTimeout",
+                default=300,
+                description="Required: The maximum number of seconds a terminating instance waits for open connections to drain before it is terminated.",
+                max_value=7200,
+                min_value=30,
+                type="Number"
+            )
+            self.drain_timeout_param.override_logical_id(f"{id}DrainTimeout")
+
+        if use_capacity_reservation:
+            self.capacity_reservation_preference_param = CfnParameter(
+                self,
+                "AsgCapacityReservationPreference",
+                allowed_values=[ "open", "targeted", "none" ],
+                default="open",
+                description="Required: Launch instances into any open capacity reservation with matching attributes ('open'), only into the capacity reservation or resource group given by the capacity reservation target ('targeted'), or never into a capacity reservation ('none')."
+            )
+            self.capacity_reservation_preference_param.override_logical_id(f"{id}CapacityReservationPreference")
+            self.capacity_reservation_target_param = CfnParameter(
+                self,
+                "AsgCapacityReservationTarget",
+                default="",
+                description="Optional: A capacity reservation id or capacity reservation resource group ARN. Required when the capacity reservation preference is 'targeted'."
+            )
+            self.capacity_reservation_target_param.override_logical_id(f"{id}CapacityReservationTarget")
+            self.capacity_reservation_targeted_condition = CfnCondition(
+                self,
+                "AsgCapacityReservationTargetedCondition",
+                expression=Fn.condition_equals(self.capacity_reservation_preference_param.value, "targeted")
+            )
+            self.capacity_reservation_targeted_condition.override_logical_id(f"{id}CapacityReservationTargetedCondition")
+            self.capacity_reservation_resource_group_condition = CfnCondition(
+                self,
+                "AsgCapacityReservationResourceGroupCondition",
+                expression=Fn.condition_equals(
+                    Fn.select(0, Fn.split(":", self.capacity_reservation_target_param.value_as_string)),
+                    "arn"
+                )
+            )
+            self.capacity_reservation_resource_group_condition.override_logical_id(f"{id}CapacityReservationResourceGroupCondition")
+            capacity_reservation_target_rule = CfnRule(
+                self,
+                "AsgCapacityReservationTargetRule",
+                assertions=[
+                    CfnRuleAssertion(
+                        assert_=Fn.condition_not(Fn.condition_equals(self.capacity_reservation_target_param.value_as_string, "")),
+                        assert_description="A capacity reservation target is required when the capacity reservation preference is 'targeted'."
+                    )
+                ],
+                rule_condition=Fn.condition_equals(self.capacity_reservation_preference_param.value_as_string, "targeted")
+            )
+            capacity_reservation_target_rule.override_logical_id(f"{id}CapacityReservationTargetRule")
+
         # cloudwatch
         self.app_log_group = aws_logs.CfnLogGroup(
             self,
@@ -187,6 +643,25 @@ class Asg(Construct):
         self.system_log_group.cfn_options.deletion_policy = CfnDeletionPolicy.RETAIN
         self.system_log_group.override_logical_id(f"{id}SystemLogGroup")
 
+        if use_cloudwatch_agent_config:
+            # generated agent config, applied on boot with amazon-cloudwatch-agent-ctl fetch-config
+            self.cloudwatch_agent_config_parameter = aws_ssm.CfnParameter(
+                self,
+                "CloudWatchAgentConfigParameter",
+                description="CloudWatch agent configuration for the application Auto Scaling Group.",
+                tier="Intelligent-Tiering",
+                type="String",
+                value=Stack.of(self).to_json_string(
+                    self.cloudwatch_agent_config.config(
+                        self.app_log_group.ref,
+                        self.system_log_group.ref,
+                        log_files=cloudwatch_agent_log_files,
+                        emf=use_cloudwatch_agent_emf
+                    )
+                )
+            )
+            self.cloudwatch_agent_config_parameter.override_logical_id(f"{id}CloudWatchAgentConfigParameter")
+
         # iam
         policies = [
             aws_iam.CfnRole.PolicyProperty(
@@ -241,6 +716,25 @@ class Asg(Construct):
                 policy_name="AllowStreamLogsToCloudWatch"
             )
         )
+        if use_cloudwatch_agent_config:
+            policies.append(
+                aws_iam.CfnRole.PolicyProperty(
+                    policy_document=aws_iam.PolicyDocument(
+                        statements=[
+                            aws_iam.PolicyStatement(
+                                effect=aws_iam.Effect.ALLOW,
+                                actions=[
+                                    "ssm:GetParameter"
+                                ],
+                                resources=[
+                                    f"arn:{Aws.PARTITION}:ssm:{Aws.REGION}:{Aws.ACCOUNT_ID}:parameter/{self.cloudwatch_agent_config_parameter.ref}"
+                                ]
+                            )
+                        ]
+                    ),
+                    policy_name="AllowGetCloudWatchAgentConfig"
+                )
+            )
         if allow_associate_address:
             policies.append(
                 aws_iam.CfnRole.PolicyProperty(
@@ -295,6 +789,45 @@ class Asg(Construct):
                     policy_name="AllowAttachVolume"
                 )
             )
+        if data_volume_restore_mode == "prewarm":
+            policies.append(
+                aws_iam.CfnRole.PolicyProperty(
+                    policy_document=aws_iam.PolicyDocument(
+                        statements=[
+                            aws_iam.PolicyStatement(
+                                effect=aws_iam.Effect.ALLOW,
+                                actions=[
+                                    "ec2:CreateTags"
+                                ],
+                                conditions={
+                                    "ForAllValues:StringEquals": { "aws:TagKeys": [ "Prewarmed" ] }
+                                },
+                                resources=[
+                                    f"arn:{Aws.PARTITION}:ec2:{Aws.REGION}:{Aws.ACCOUNT_ID}:volume/*"
+                                ]
+                            )
+                        ]
+                    ),
+                    policy_name="AllowTagPrewarmedVolume"
+                )
+            )
+        if self._use_warm_pool or use_graceful_drain:
+            policies.append(
+                aws_iam.CfnRole.PolicyProperty(
+                    policy_document=aws_iam.PolicyDocument(
+                        statements=[
+                            aws_iam.PolicyStatement(
+                                effect=aws_iam.Effect.ALLOW,
+                                actions=[
+                                    "autoscaling:CompleteLifecycleAction"
+                                ],
+                                resources=["*"]
+                            )
+                        ]
+                    ),
+                    policy_name="AllowCompleteLifecycleAction"
+                )
+            )
         if pipeline_bucket_arn:
             policies.append(
                 aws_iam.CfnRole.PolicyProperty(
@@ -394,88 +927,289 @@ class Asg(Construct):
         )
         self.disk_usage_alarm_threshold_param.override_logical_id(f"{id}DiskUsageAlarmThreshold")
 
-        # data volume
-        if use_data_volume:
-            # lambda to find az from subnet
-            lambda_code_path = Util.local_path("lambda_subnet_to_az.py")
-            with open(lambda_code_path) as f:
-                lambda_code = f.read()
-            self.subnet_to_az_lambda = aws_lambda.Function(
+        # cpu credits only apply to burstable performance instance families
+        burstable_families = []
+        for item in instance_type_allowed_values + mixed_instance_types:
+            instance_type = InstanceTypes.get(item)
+            if instance_type and instance_type.burstable and instance_type.family not in burstable_families:
+                burstable_families.append(instance_type.family)
+        self._use_cpu_credits = len(burstable_families) > 0
+        if self._use_cpu_credits:
+            self.cpu_credits_param = CfnParameter(
                 self,
-                "AsgSubnetToAzLambda",
-                runtime=aws_lambda.Runtime.PYTHON_3_13,
-                timeout=Duration.seconds(300),
-                handler="index.handler",
-                code=aws_lambda.Code.from_inline(lambda_code)
+                "AsgCpuCredits",
+                allowed_values=[ "standard", "unlimited" ],
+                default="unlimited",
+                description="Required: The credit option for CPU usage of burstable performance (T family) instance types. With 'standard' instances are throttled to baseline when CPU credits run out, with 'unlimited' surplus credits are charged. Ignored for other instance types."
             )
-            self.subnet_to_az_lambda.node.default_child.override_logical_id(f"{id}SubnetToAzLambda")
-            self.subnet_to_az_lambda.role.node.default_child.override_logical_id(f"{id}SubnetToAzLambdaRole")
-            self.subnet_to_az_lambda_subnet_policy = aws_iam.Policy(
+            self.cpu_credits_param.override_logical_id(f"{id}CpuCredits")
+            self.cpu_credit_balance_alarm_threshold_param = CfnParameter(
                 self,
-                "DescribeSubnetsPolicy",
-                statements=[
-                    aws_iam.PolicyStatement(
-                        actions=["ec2:DescribeSubnets"],
-                        resources=["*"]
-                    )
-                ]
+                "AsgCpuCreditBalanceAlarmThreshold",
+                default=20,
+                description="Required: The alarm threshold for the minimum CPU credit balance of burstable performance (T family) instance types.",
+                min_value=0,
+                type="Number"
             )
-            self.subnet_to_az_lambda_subnet_policy.node.default_child.override_logical_id(f"{id}DescribeSubnetsPolicy")
-            self.subnet_to_az_lambda.role.attach_inline_policy(self.subnet_to_az_lambda_subnet_policy)
-            self.subnet_to_az_custom_resource = CustomResource(
+            self.cpu_credit_balance_alarm_threshold_param.override_logical_id(f"{id}CpuCreditBalanceAlarmThreshold")
+            instance_family = Fn.select(0, Fn.split(".", self.instance_type_param.value_as_string))
+            self.burstable_instance_type_condition = CfnCondition(
                 self,
-                "AsgSubnetToAzCustomResource",
-                service_token=self.subnet_to_az_lambda.function_arn,
-                properties={
-                    "aws_region": Aws.REGION,
-                    "subnet_id": vpc.public_subnet1_id() if use_public_subnets else vpc.private_subnet1_id()
-                }
+                "AsgBurstableInstanceTypeCondition",
+                expression=Fn.condition_or(
+                    *[Fn.condition_equals(instance_family, family) for family in burstable_families]
+                ) if len(burstable_families) > 1 else Fn.condition_equals(instance_family, burstable_families[0])
             )
-            self.subnet_to_az_custom_resource.node.default_child.override_logical_id(f"{id}SubnetToAzCustomResource")
+            self.burstable_instance_type_condition.override_logical_id(f"{id}BurstableInstanceTypeCondition")
 
-            self.data_volume_size_param = CfnParameter(
+        if use_data_volume_recovery:
+            self.data_volume_recovery_subnet_param = CfnParameter(
                 self,
-                "AsgDataVolumeSize",
-                type="Number",
-                default="100",
-                description="Required: Size of EBS data volume in GiBs."
+                "AsgDataVolumeRecoverySubnet",
+                allowed_values=[ "", "1", "2" ],
+                default="",
+                description="Optional: To recover from an availability zone outage, set to the subnet (1 or 2) in a healthy availability zone. The instance moves to that subnet and the data volume is replaced by one restored from the latest completed AWS Backup recovery point. Once set, it can not be set back to empty."
             )
-            self.data_volume_size_param.override_logical_id(f"{id}DataVolumeSize")
-
-            self.data_volume_snapshot_param = CfnParameter(
+            self.data_volume_recovery_subnet_param.override_logical_id(f"{id}DataVolumeRecoverySubnet")
+            self.data_volume_recovery_condition = CfnCondition(
                 self,
-                "AsgDataVolumeSnapshot",
-                default="",
-                description="Optional: An EBS snapshot id to restore as a starting point for the data volume.",
+                "AsgDataVolumeRecoveryCondition",
+                expression=Fn.condition_not(Fn.condition_equals(self.data_volume_recovery_subnet_param.value, ""))
             )
-            self.data_volume_snapshot_param.override_logical_id(f"{id}DataVolumeSnapshot")
-
-            self.data_volume_snapshot_condition = CfnCondition(
+            self.data_volume_recovery_condition.override_logical_id(f"{id}DataVolumeRecoveryCondition")
+            self.data_volume_recovery_subnet2_condition = CfnCondition(
                 self,
-                "AsgDataVolumeSnapshotCondition",
-                expression=Fn.condition_not(Fn.condition_equals(self.data_volume_snapshot_param.value, ""))
+                "AsgDataVolumeRecoverySubnet2Condition",
+                expression=Fn.condition_equals(self.data_volume_recovery_subnet_param.value, "2")
             )
-            self.data_volume_snapshot_condition.override_logical_id(f"{id}DataVolumeSnapshotCondition")
+            self.data_volume_recovery_subnet2_condition.override_logical_id(f"{id}DataVolumeRecoverySubnet2Condition")
 
-            self.data_volume = aws_ec2.CfnVolume(
-                self,
-                "AsgDataVolume",
-                availability_zone=Token.as_string(self.subnet_to_az_custom_resource.get_att('az')),
-                encrypted=True,
-                snapshot_id=Token.as_string(
+        # data volume
+        if use_data_volume:
+            subnet_type = "Public" if use_public_subnets else "Private"
+            subnet1_id = vpc.public_subnet1_id() if use_public_subnets else vpc.private_subnet1_id()
+            # the per-Asg subnet to AZ lambda is kept by default so existing stacks keep their
+            # logical IDs and the az attribute, the shared provider becomes the default in 5.0.0
+            if use_subnet_az_provider:
+                self.data_volume_availability_zone = SubnetAzProvider.of(self).availability_zone(f"{vpc.node.id}{subnet_type}Subnet1", subnet1_id)
+                # aliases for patterns referencing the resources of the per-Asg subnet to AZ lambda
+                self.subnet_to_az_lambda = SubnetAzProvider.of(self).lambda_function
+                self.subnet_to_az_lambda_subnet_policy = SubnetAzProvider.of(self).describe_subnets_policy
+                self.subnet_to_az_custom_resource = SubnetAzProvider.of(self).custom_resource
+            else:
+                # lambda to find az from subnet
+                lambda_code_path = Util.local_path("lambda_subnet_to_az.py")
+                with open(lambda_code_path) as f:
+                    lambda_code = f.read()
+                self.subnet_to_az_lambda = aws_lambda.Function(
+                    self,
+                    "AsgSubnetToAzLambda",
+                    runtime=aws_lambda.Runtime.PYTHON_3_13,
+                    timeout=Duration.seconds(300),
+                    handler="index.handler",
+                    code=aws_lambda.Code.from_inline(lambda_code)
+                )
+                self.subnet_to_az_lambda.node.default_child.override_logical_id(f"{id}SubnetToAzLambda")
+                self.subnet_to_az_lambda.role.node.default_child.override_logical_id(f"{id}SubnetToAzLambdaRole")
+                self.subnet_to_az_lambda_subnet_policy = aws_iam.Policy(
+                    self,
+                    "DescribeSubnetsPolicy",
+                    statements=[
+                        aws_iam.PolicyStatement(
+                            actions=["ec2:DescribeSubnets"],
+                            resources=["*"]
+                        )
+                    ]
+                )
+                self.subnet_to_az_lambda_subnet_policy.node.default_child.override_logical_id(f"{id}DescribeSubnetsPolicy")
+                self.subnet_to_az_lambda.role.attach_inline_policy(self.subnet_to_az_lambda_subnet_policy)
+                self.subnet_to_az_custom_resource = CustomResource(
+                    self,
+                    "AsgSubnetToAzCustomResource",
+                    service_token=self.subnet_to_az_lambda.function_arn,
+                    properties={
+                        "aws_region": Aws.REGION,
+                        "subnet_id": subnet1_id
+                    }
+                )
+                self.subnet_to_az_custom_resource.node.default_child.override_logical_id(f"{id}SubnetToAzCustomResource")
+                self.data_volume_availability_zone = Token.as_string(self.subnet_to_az_custom_resource.get_att('az'))
+            if use_data_volume_recovery:
+                subnet2_id = vpc.public_subnet2_id() if use_public_subnets else vpc.private_subnet2_id()
+                self.data_volume_availability_zone = Token.as_string(
                     Fn.condition_if(
-                        self.data_volume_snapshot_condition.logical_id,
-                        self.data_volume_snapshot_param.value_as_string,
-                        Aws.NO_VALUE
+                        self.data_volume_recovery_subnet2_condition.logical_id,
+                        SubnetAzProvider.of(self).availability_zone(f"{vpc.node.id}{subnet_type}Subnet2", subnet2_id),
+                        self.data_volume_availability_zone
                     )
-                ),
-                size=self.data_volume_size_param.value_as_number,
-                volume_type='gp3',
-                tags=[CfnTag(key='Name', value=f"{Aws.STACK_NAME}-pds")]
+                )
+
+            self.data_volume_size_param = CfnParameter(
+                self,
+                "AsgDataVolumeSize",
+                type="Number",
+                default="100",
+                description="Required: Size of EBS data volume in GiBs." if data_volume_count == 1 else f"Required: Size of each of the {data_volume_count} striped EBS data volumes in GiBs."
             )
-            self.data_volume.override_logical_id(f"{id}DataVolume")
-            self.data_volume.cfn_options.deletion_policy = CfnDeletionPolicy.SNAPSHOT
-            self.data_volume.cfn_options.update_replace_policy = CfnDeletionPolicy.SNAPSHOT
+            self.data_volume_size_param.override_logical_id(f"{id}DataVolumeSize")
+
+            (
+                self.data_volume_type_param,
+                self.data_volume_iops_param,
+                self.data_volume_throughput_param,
+                self.data_volume_gp3_condition
+            ) = self._volume_performance_parameters("DataVolume", "EBS data volume", size_param=self.data_volume_size_param)
+
+            # a single snapshot can not be restored onto the members of a striped array, they are
+            # restored from the snapshots of one crash-consistent snapshot set instead
+            self.data_volume_snapshot_param = None
+            self.data_volume_snapshots_param = None
+            if data_volume_count == 1:
+                self.data_volume_snapshot_param = CfnParameter(
+                    self,
+                    "AsgDataVolumeSnapshot",
+                    default="",
+                    description="Optional: An EBS snapshot id to restore as a starting point for the data volume.",
+                )
+                self.data_volume_snapshot_param.override_logical_id(f"{id}DataVolumeSnapshot")
+
+                self.data_volume_snapshot_condition = CfnCondition(
+                    self,
+                    "AsgDataVolumeSnapshotCondition",
+                    expression=Fn.condition_not(Fn.condition_equals(self.data_volume_snapshot_param.value, ""))
+                )
+                self.data_volume_snapshot_condition.override_logical_id(f"{id}DataVolumeSnapshotCondition")
+            else:
+                self.data_volume_snapshots_param = CfnParameter(
+                    self,
+                    "AsgDataVolumeSnapshots",
+                    allowed_pattern=f"^(snap-[0-9a-f]+(,snap-[0-9a-f]+){{{data_volume_count - 1}}})?$",
+                    constraint_description=f"Must be empty or {data_volume_count} comma separated EBS snapshot ids",
+                    default="",
+                    description=f"Optional: {data_volume_count} comma separated EBS snapshot ids from one data volume snapshot set, to restore the striped data volumes from. List them in the order of the volumes they were taken from, tagged {{stack name}}-pds, -pds2 and so on."
+                )
+                self.data_volume_snapshots_param.override_logical_id(f"{id}DataVolumeSnapshots")
+
+                self.data_volume_snapshots_condition = CfnCondition(
+                    self,
+                    "AsgDataVolumeSnapshotsCondition",
+                    expression=Fn.condition_not(Fn.condition_equals(self.data_volume_snapshots_param.value, ""))
+                )
+                self.data_volume_snapshots_condition.override_logical_id(f"{id}DataVolumeSnapshotsCondition")
+
+            if data_volume_restore_mode == "prewarm":
+                self.data_volume_prewarm_rate_param = CfnParameter(
+                    self,
+                    "AsgDataVolumePrewarmRate",
+                    default=100,
+                    description="Required: The rate in MiB/s at which a data volume restored from a snapshot is read in the background to load its blocks.",
+                    min_value=1,
+                    type="Number"
+                )
+                self.data_volume_prewarm_rate_param.override_logical_id(f"{id}DataVolumePrewarmRate")
+
+            if data_volume_restore_mode == "fast_snapshot_restore":
+                # fast snapshot restore is enabled before the volume is created and disabled after, it is billed per hour
+                lambda_code_path = Util.local_path("lambda_data_volume_fast_snapshot_restore.py")
+                with open(lambda_code_path) as f:
+                    lambda_code = f.read()
+                self.fast_snapshot_restore_lambda = aws_lambda.Function(
+                    self,
+                    "AsgFastSnapshotRestoreLambda",
+                    runtime=aws_lambda.Runtime.PYTHON_3_13,
+                    timeout=Duration.seconds(900),
+                    handler="index.handler",
+                    code=aws_lambda.Code.from_inline(lambda_code)
+                )
+                self.fast_snapshot_restore_lambda.node.default_child.override_logical_id(f"{id}FastSnapshotRestoreLambda")
+                self.fast_snapshot_restore_lambda.role.node.default_child.override_logical_id(f"{id}FastSnapshotRestoreLambdaRole")
+                self.fast_snapshot_restore_lambda_policy = aws_iam.Policy(
+                    self,
+                    "FastSnapshotRestorePolicy",
+                    statements=[
+                        aws_iam.PolicyStatement(
+                            actions=[
+                                "ec2:DescribeFastSnapshotRestores",
+                                "ec2:DisableFastSnapshotRestores",
+                                "ec2:EnableFastSnapshotRestores"
+                            ],
+                            resources=["*"]
+                        ),
+                        aws_iam.PolicyStatement(
+                            actions=["lambda:InvokeFunction"],
+                            resources=[self.fast_snapshot_restore_lambda.function_arn]
+                        )
+                    ]
+                )
+                self.fast_snapshot_restore_lambda_policy.node.default_child.override_logical_id(f"{id}FastSnapshotRestorePolicy")
+                self.fast_snapshot_restore_lambda.role.attach_inline_policy(self.fast_snapshot_restore_lambda_policy)
+                self.enable_fast_snapshot_restore_custom_resource = CustomResource(
+                    self,
+                    "AsgEnableFastSnapshotRestoreCustomResource",
+                    service_token=self.fast_snapshot_restore_lambda.function_arn,
+                    properties={
+                        "action": "enable",
+                        "availability_zone": self.data_volume_availability_zone,
+                        "snapshot_id": self.data_volume_snapshot_param.value_as_string
+                    }
+                )
+                self.enable_fast_snapshot_restore_custom_resource.node.default_child.override_logical_id(f"{id}EnableFastSnapshotRestoreCustomResource")
+                self.enable_fast_snapshot_restore_custom_resource.node.add_dependency(self.fast_snapshot_restore_lambda_policy)
+
+            self.data_volumes = []
+            for index in range(1, data_volume_count + 1):
+                suffix = "" if index == 1 else str(index)
+                data_volume = aws_ec2.CfnVolume(
+                    self,
+                    f"AsgDataVolume{suffix}",
+                    availability_zone=self.data_volume_availability_zone,
+                    encrypted=True,
+                    snapshot_id=Token.as_string(
+                        Fn.condition_if(
+                            self.data_volume_snapshot_condition.logical_id,
+                            self.data_volume_snapshot_param.value_as_string,
+                            Aws.NO_VALUE
+                        )
+                    ) if self.data_volume_snapshot_param else Token.as_string(
+                        Fn.condition_if(
+                            self.data_volume_snapshots_condition.logical_id,
+                            Fn.select(index - 1, Fn.split(",", self.data_volume_snapshots_param.value_as_string)),
+                            Aws.NO_VALUE
+                        )
+                    ),
+                    iops=self.data_volume_iops_param.value_as_number,
+                    size=self.data_volume_size_param.value_as_number,
+                    throughput=Token.as_number(
+                        Fn.condition_if(
+                            self.data_volume_gp3_condition.logical_id,
+                            self.data_volume_throughput_param.value_as_number,
+                            Aws.NO_VALUE
+                        )
+                    ),
+                    volume_type=self.data_volume_type_param.value_as_string,
+                    tags=[CfnTag(key='Name', value=f"{Aws.STACK_NAME}-pds{suffix}")]
+                )
+                data_volume.override_logical_id(f"{id}DataVolume{suffix}")
+                data_volume.cfn_options.deletion_policy = CfnDeletionPolicy.SNAPSHOT
+                data_volume.cfn_options.update_replace_policy = CfnDeletionPolicy.SNAPSHOT
+                self.data_volumes.append(data_volume)
+            self.data_volume = self.data_volumes[0]
+
+            if data_volume_restore_mode == "fast_snapshot_restore":
+                self.data_volume.add_dependency(self.enable_fast_snapshot_restore_custom_resource.node.default_child)
+                self.disable_fast_snapshot_restore_custom_resource = CustomResource(
+                    self,
+                    "AsgDisableFastSnapshotRestoreCustomResource",
+                    service_token=self.fast_snapshot_restore_lambda.function_arn,
+                    properties={
+                        "action": "disable",
+                        "availability_zone": self.data_volume_availability_zone,
+                        "snapshot_id": self.data_volume_snapshot_param.value_as_string,
+                        "volume_id": self.data_volume.ref
+                    }
+                )
+                self.disable_fast_snapshot_restore_custom_resource.node.default_child.override_logical_id(f"{id}DisableFastSnapshotRestoreCustomResource")
+                self.disable_fast_snapshot_restore_custom_resource.node.add_dependency(self.fast_snapshot_restore_lambda_policy)
 
             self.data_volume_backup_retention_period_param = CfnParameter(
                 self,
@@ -488,102 +1222,282 @@ class Asg(Construct):
             )
             self.data_volume_backup_retention_period_param.override_logical_id(f"{id}DataVolumeBackupRetentionPeriod")
 
-            self.data_volume_backup_vault_arn_param = CfnParameter(
-                self,
-                "AsgDataVolumeBackupVaultArn",
-                default="",
-                description="Optional: An AWS Backup Vault ARN to use for storing EBS backups. If not specified, a vault will be created."
-            )
-            self.data_volume_backup_vault_arn_param.override_logical_id(f"{id}DataVolumeBackupVaultArn")
+            if data_volume_count == 1:
+                self.data_volume_backup_vault_arn_param = CfnParameter(
+                    self,
+                    "AsgDataVolumeBackupVaultArn",
+                    default="",
+                    description="Optional: An AWS Backup Vault ARN to use for storing EBS backups. If not specified, a vault will be created."
+                )
+                self.data_volume_backup_vault_arn_param.override_logical_id(f"{id}DataVolumeBackupVaultArn")
 
-            self.data_volume_backup_vault_arn_exists_condition = CfnCondition(
-                self,
-                "AsgDataVolumeBackupVaultArnExistsCondition",
-                expression=Fn.condition_not(Fn.condition_equals(self.data_volume_backup_vault_arn_param.value, ""))
-            )
-            self.data_volume_backup_vault_arn_exists_condition.override_logical_id(f"{id}DataVolumeBackupVaultArnExistsCondition")
-            self.data_volume_backup_vault_arn_not_exists_condition = CfnCondition(
-                self,
-                "AsgDataVolumeBackupVaultArnNotExistsCondition",
-                expression=Fn.condition_equals(self.data_volume_backup_vault_arn_param.value, "")
-            )
-            self.data_volume_backup_vault_arn_not_exists_condition.override_logical_id(f"{id}DataVolumeBackupVaultArnNotExistsCondition")
+                self.data_volume_backup_vault_arn_exists_condition = CfnCondition(
+                    self,
+                    "AsgDataVolumeBackupVaultArnExistsCondition",
+                    expression=Fn.condition_not(Fn.condition_equals(self.data_volume_backup_vault_arn_param.value, ""))
+                )
+                self.data_volume_backup_vault_arn_exists_condition.override_logical_id(f"{id}DataVolumeBackupVaultArnExistsCondition")
+                self.data_volume_backup_vault_arn_not_exists_condition = CfnCondition(
+                    self,
+                    "AsgDataVolumeBackupVaultArnNotExistsCondition",
+                    expression=Fn.condition_equals(self.data_volume_backup_vault_arn_param.value, "")
+                )
+                self.data_volume_backup_vault_arn_not_exists_condition.override_logical_id(f"{id}DataVolumeBackupVaultArnNotExistsCondition")
 
-            self.data_volume_backup_vault = aws_backup.CfnBackupVault(
-                self,
-                "AsgDataVolumeBackupVault",
-                backup_vault_name=Util.append_stack_uuid('cfn-stack-id')
-            )
-            self.data_volume_backup_vault.cfn_options.condition = self.data_volume_backup_vault_arn_not_exists_condition
-            self.data_volume_backup_vault.cfn_options.deletion_policy = CfnDeletionPolicy.RETAIN
-            self.data_volume_backup_vault.cfn_options.update_replace_policy = CfnDeletionPolicy.RETAIN
-            self.data_volume_backup_vault.override_logical_id(f"{id}DataVolumeBackupVault")
+                self.data_volume_backup_vault = aws_backup.CfnBackupVault(
+                    self,
+                    "AsgDataVolumeBackupVault",
+                    backup_vault_name=Util.append_stack_uuid('cfn-stack-id')
+                )
+                self.data_volume_backup_vault.cfn_options.condition = self.data_volume_backup_vault_arn_not_exists_condition
+                self.data_volume_backup_vault.cfn_options.deletion_policy = CfnDeletionPolicy.RETAIN
+                self.data_volume_backup_vault.cfn_options.update_replace_policy = CfnDeletionPolicy.RETAIN
+                self.data_volume_backup_vault.override_logical_id(f"{id}DataVolumeBackupVault")
 
-            self.data_volume_backup_plan = aws_backup.CfnBackupPlan(
-                self,
-                "AsgDataVolumeBackupPlan",
-                backup_plan=aws_backup.CfnBackupPlan.BackupPlanResourceTypeProperty(
-                    backup_plan_name=f"{Aws.STACK_NAME}-backup-plan",
-                    backup_plan_rule=[
-                        aws_backup.CfnBackupPlan.BackupRuleResourceTypeProperty(
-                            rule_name=f"{Aws.STACK_NAME}-backup-rule",
-                            schedule_expression=aws_events.Schedule.cron(hour="3", minute="0").expression_string,
-                            target_backup_vault=self.data_volume_backup_vault_name(),
-                            lifecycle=aws_backup.CfnBackupPlan.LifecycleResourceTypeProperty(
-                                delete_after_days=self.data_volume_backup_retention_period_param.value_as_number
+                self.data_volume_backup_plan = aws_backup.CfnBackupPlan(
+                    self,
+                    "AsgDataVolumeBackupPlan",
+                    backup_plan=aws_backup.CfnBackupPlan.BackupPlanResourceTypeProperty(
+                        backup_plan_name=f"{Aws.STACK_NAME}-backup-plan",
+                        backup_plan_rule=[
+                            aws_backup.CfnBackupPlan.BackupRuleResourceTypeProperty(
+                                rule_name=f"{Aws.STACK_NAME}-backup-rule",
+                                schedule_expression=aws_events.Schedule.cron(hour="3", minute="0").expression_string,
+                                target_backup_vault=self.data_volume_backup_vault_name(),
+                                lifecycle=aws_backup.CfnBackupPlan.LifecycleResourceTypeProperty(
+                                    delete_after_days=self.data_volume_backup_retention_period_param.value_as_number
+                                )
                             )
+                        ]
+                    )
+                )
+                self.data_volume_backup_plan.override_logical_id(f"{id}DataVolumeBackupPlan")
+
+                self.data_volume_backup_selection = aws_backup.CfnBackupSelection(
+                    self,
+                    "AsgDataVolumeBackupSelection",
+                    backup_plan_id=self.data_volume_backup_plan.ref,
+                    backup_selection=aws_backup.CfnBackupSelection.BackupSelectionResourceTypeProperty(
+                        iam_role_arn=f"arn:aws:iam::{Aws.ACCOUNT_ID}:role/service-role/AWSBackupDefaultServiceRole",
+                        selection_name=f"{Aws.STACK_NAME}-backup-selection",
+                        resources=[
+                            f"arn:aws:ec2:{Aws.REGION}:{Aws.ACCOUNT_ID}:volume/{self.data_volume.ref}"
+                        ]
+                    )
+                )
+                self.data_volume_backup_selection.override_logical_id(f"{id}DataVolumeBackupSelection")
+            else:
+                # AWS Backup snapshots each volume on its own, so striped data volumes are backed up
+                # by a Data Lifecycle Manager policy for the instance, which snapshots all of its
+                # data volumes at the same point in time as a crash-consistent snapshot set
+                self.data_volume_snapshot_role = aws_iam.CfnRole(
+                    self,
+                    "AsgDataVolumeSnapshotRole",
+                    assume_role_policy_document=aws_iam.PolicyDocument(
+                        statements=[
+                            aws_iam.PolicyStatement(
+                                effect=aws_iam.Effect.ALLOW,
+                                actions=[ "sts:AssumeRole" ],
+                                principals=[ aws_iam.ServicePrincipal("dlm.amazonaws.com") ]
+                            )
+                        ]
+                    ),
+                    managed_policy_arns=[
+                        "arn:aws:iam::aws:policy/service-role/AWSDataLifecycleManagerServiceRole"
+                    ]
+                )
+                self.data_volume_snapshot_role.override_logical_id(f"{id}DataVolumeSnapshotRole")
+
+                self.data_volume_snapshot_policy = aws_dlm.CfnLifecyclePolicy(
+                    self,
+                    "AsgDataVolumeSnapshotPolicy",
+                    description=f"{id} data volume snapshot sets",
+                    execution_role_arn=self.data_volume_snapshot_role.attr_arn,
+                    policy_details=aws_dlm.CfnLifecyclePolicy.PolicyDetailsProperty(
+                        parameters=aws_dlm.CfnLifecyclePolicy.ParametersProperty(
+                            exclude_boot_volume=True
+                        ),
+                        policy_type="EBS_SNAPSHOT_MANAGEMENT",
+                        resource_types=[ "INSTANCE" ],
+                        schedules=[
+                            aws_dlm.CfnLifecyclePolicy.ScheduleProperty(
+                                copy_tags=True,
+                                create_rule=aws_dlm.CfnLifecyclePolicy.CreateRuleProperty(
+                                    cron_expression=aws_events.Schedule.cron(hour="3", minute="0").expression_string
+                                ),
+                                name="Nightly",
+                                retain_rule=aws_dlm.CfnLifecyclePolicy.RetainRuleProperty(
+                                    count=self.data_volume_backup_retention_period_param.value_as_number
+                                )
+                            )
+                        ],
+                        target_tags=[ CfnTag(key=Asg.DATA_VOLUME_SNAPSHOT_TAG, value=f"{Aws.STACK_NAME}-{id}") ]
+                    ),
+                    state="ENABLED"
+                )
+                self.data_volume_snapshot_policy.override_logical_id(f"{id}DataVolumeSnapshotPolicy")
+
+            if use_data_volume_recovery:
+                # Recovery is a stack update: resolving the recovery point takes seconds, creating the
+                # volume from its snapshot about a minute, and replacing the instance in the new subnet
+                # is bounded by create_and_update_timeout_minutes, so the RTO is that timeout plus a few
+                # minutes. Blocks load lazily, see data_volume_restore_mode. The RPO is the daily backup.
+                lambda_code_path = Util.local_path("lambda_data_volume_latest_recovery_point.py")
+                with open(lambda_code_path) as f:
+                    lambda_code = f.read()
+                self.data_volume_recovery_lambda = aws_lambda.Function(
+                    self,
+                    "AsgDataVolumeRecoveryLambda",
+                    runtime=aws_lambda.Runtime.PYTHON_3_13,
+                    timeout=Duration.seconds(300),
+                    handler="index.handler",
+                    code=aws_lambda.Code.from_inline(lambda_code)
+                )
+                self.data_volume_recovery_lambda.node.default_child.override_logical_id(f"{id}DataVolumeRecoveryLambda")
+                self.data_volume_recovery_lambda.role.node.default_child.override_logical_id(f"{id}DataVolumeRecoveryLambdaRole")
+                self.data_volume_recovery_lambda_policy = aws_iam.Policy(
+                    self,
+                    "DataVolumeRecoveryPolicy",
+                    statements=[
+                        aws_iam.PolicyStatement(
+                            actions=[
+                                "backup:ListRecoveryPointsByBackupVault",
+                                "backup:ListTags"
+                            ],
+                            resources=["*"]
                         )
                     ]
                 )
-            )
-            self.data_volume_backup_plan.override_logical_id(f"{id}DataVolumeBackupPlan")
-                                      
-            volume_arn = f"arn:aws:ec2:{Aws.REGION}:{Aws.ACCOUNT_ID}:volume/{self.data_volume.ref}"
-            self.data_volume_backup_selection = aws_backup.CfnBackupSelection(
-                self,
-                "AsgDataVolumeBackupSelection",
-                backup_plan_id=self.data_volume_backup_plan.ref,
-                backup_selection=aws_backup.CfnBackupSelection.BackupSelectionResourceTypeProperty(
-                    iam_role_arn=f"arn:aws:iam::{Aws.ACCOUNT_ID}:role/service-role/AWSBackupDefaultServiceRole",
-                    selection_name=f"{Aws.STACK_NAME}-backup-selection",
-                    resources=[volume_arn]
+                self.data_volume_recovery_lambda_policy.node.default_child.override_logical_id(f"{id}DataVolumeRecoveryPolicy")
+                self.data_volume_recovery_lambda.role.attach_inline_policy(self.data_volume_recovery_lambda_policy)
+                self.data_volume_recovery_custom_resource = CustomResource(
+                    self,
+                    "AsgDataVolumeRecoveryCustomResource",
+                    service_token=self.data_volume_recovery_lambda.function_arn,
+                    properties={
+                        "backup_vault_name": self.data_volume_backup_vault_name(),
+                        "recovery_subnet": self.data_volume_recovery_subnet_param.value_as_string,
+                        "volume_name": f"{Aws.STACK_NAME}-pds"
+                    }
+                )
+                self.data_volume_recovery_custom_resource.node.default_child.override_logical_id(f"{id}DataVolumeRecoveryCustomResource")
+                self.data_volume_recovery_custom_resource.node.add_dependency(self.data_volume_recovery_lambda_policy)
+                self.data_volume.snapshot_id = Token.as_string(
+                    Fn.condition_if(
+                        self.data_volume_recovery_condition.logical_id,
+                        self.data_volume_recovery_custom_resource.get_att_string("snapshot_id"),
+                        self.data_volume.snapshot_id or Aws.NO_VALUE
+                    )
                 )
-            )
-            self.data_volume_backup_selection.override_logical_id(f"{id}DataVolumeBackupSelection")
 
         user_data = None
+        # copy so the shared default and the caller's dict are not modified
+        user_data_variables = dict(user_data_variables)
 
         # Always start CloudWatch agent first for early logging visibility
-        cloudwatch_script_path = Util.local_path("script_cloudwatch_start.sh")
-        with open(cloudwatch_script_path) as f:
-            cloudwatch_script = f.read()
+        if use_cloudwatch_agent_config:
+            cloudwatch_script_name = "script_cloudwatch_fetch_config.sh"
+            with open(Util.local_path(cloudwatch_script_name)) as f:
+                cloudwatch_script = f.read()
+            user_data_variables['AsgCloudWatchAgentConfigParameter'] = self.cloudwatch_agent_config_parameter.ref
+        else:
+            cloudwatch_script_name = "script_cloudwatch_start.sh"
+            with open(Util.local_path(cloudwatch_script_name)) as f:
+                cloudwatch_script = f.read()
+            cloudwatch_script = cloudwatch_script + self.cloudwatch_agent_config.metrics_profile_script()
 
+        # named parts, concatenated in order into the user data script
+        user_data_parts = [(cloudwatch_script_name, cloudwatch_script)]
+        if self.performance_profile:
+            user_data_parts.append(("performance_profile", self.performance_profile.script()))
         if use_data_volume:
-            script_code_path = Util.local_path("script_attach_ebs.sh")
-            with open(script_code_path) as f:
-                script_code = f.read()
-            if user_data_contents is None:
-                user_data_contents = cloudwatch_script + script_code
-            else:
-                user_data_contents = cloudwatch_script + script_code + user_data_contents
+            with open(Util.local_path("script_attach_ebs.sh")) as f:
+                user_data_parts.append(("script_attach_ebs.sh", f.read()))
+            if data_volume_restore_mode == "prewarm":
+                with open(Util.local_path("script_prewarm_data_volume.sh")) as f:
+                    user_data_parts.append(("script_prewarm_data_volume.sh", f.read()))
+                user_data_variables['AsgDataVolumePrewarmRate'] = self.data_volume_prewarm_rate_param.value_as_string
+            data_volume_mount_options = ["defaults"] + data_volume_mount_options + ["nofail"]
+            if data_volume_trim == "discard":
+                data_volume_mount_options.append("discard")
+            if data_volume_filesystem == "ext4" and data_volume_count > 1:
+                # stride and stripe width in 4 KiB blocks
+                stride = Asg.DATA_VOLUME_RAID_CHUNK_KIB // 4
+                data_volume_mkfs_options = f"-E stride={stride},stripe_width={stride * data_volume_count} {data_volume_mkfs_options}".strip()
+            user_data_variables['DataVolumeFilesystem'] = data_volume_filesystem
+            user_data_variables['DataVolumeMkfsOptions'] = data_volume_mkfs_options
+            user_data_variables['DataVolumeMountOptions'] = ",".join(data_volume_mount_options)
+            user_data_variables['DataVolumeTrim'] = data_volume_trim or ""
             user_data_variables['EbsId'] = self.data_volume.ref
+            user_data_variables['EbsIds'] = Fn.join(" ", [data_volume.ref for data_volume in self.data_volumes])
             user_data_variables['AsgId'] = id
-        else:
-            if user_data_contents is None:
-                user_data_contents = cloudwatch_script
-            else:
-                user_data_contents = cloudwatch_script + user_data_contents
+
+        if instance_store_mount_path:
+            # scratch space on local NVMe disks, falls back to the root volume when there are none
+            with open(Util.local_path("script_mount_instance_store.sh")) as f:
+                user_data_parts.append(("script_mount_instance_store.sh", f.read()))
+            user_data_variables['InstanceStorePath'] = instance_store_mount_path
+
+        if self._use_warm_pool:
+            # complete the launch lifecycle action only once the user data has exited with
+            # success, the part sets an exit trap so it goes before the pattern user data
+            with open(Util.local_path("script_complete_lifecycle_action.sh")) as f:
+                user_data_parts.append(("script_complete_lifecycle_action.sh", f.read()))
+            user_data_variables['AsgLaunchLifecycleHookName'] = f"{id}LaunchLifecycleHook"
+
+        if user_data_contents is not None:
+            user_data_parts.append(("user_data_contents", user_data_contents))
 
         # Add log group names for CloudWatch agent configuration
         user_data_variables['AsgAppLogGroup'] = self.app_log_group.ref
         user_data_variables['AsgSystemLogGroup'] = self.system_log_group.ref
 
-        reprovision_snippet = "# reprovision string: ${AsgReprovisionString}"
+        if use_graceful_drain:
+            with open(Util.local_path("script_graceful_drain.sh")) as f:
+                user_data_parts.append(("script_graceful_drain.sh", f.read()))
+            user_data_variables['AsgDrainPorts'] = " ".join(str(port) for port in drain_ports)
+            user_data_variables['AsgDrainTimeout'] = self.drain_timeout_param.value_as_string
+            user_data_variables['AsgTerminationLifecycleHookName'] = f"{id}TerminationLifecycleHook"
+
+        reprovision_snippet = "\n# reprovision string: ${AsgReprovisionString}"
         user_data_variables['IamRole'] = self.iam_instance_role.ref
-        if user_data_contents is None:
-            user_data_contents = reprovision_snippet
+        user_data_parts.append(("reprovision_snippet", reprovision_snippet))
+        if use_bootstrap_runner:
+            # built-in steps and the pattern's bootstrap_steps run concurrently, the pattern
+            # user data, which signals success, once all of them have succeeded
+            part_steps = {}
+            remaining_parts = []
+            for name, contents in user_data_parts:
+                if name in Asg.BOOTSTRAP_PART_STEPS:
+                    part_steps.setdefault(Asg.BOOTSTRAP_PART_STEPS[name], []).append(contents)
+                else:
+                    remaining_parts.append((name, contents))
+            # steps no longer share one shell, the pattern user data gets ASG_BOOTSTRAP_ENV, log,
+            # error_exit, INSTANCE_ID and DEVICE from the bootstrap runner env file instead
+            steps = [
+                {
+                    "name": name,
+                    "contents": "".join(contents),
+                    "depends_on": [
+                        dependency for dependency in Asg.BOOTSTRAP_STEP_DEPENDENCIES.get(name, []) if dependency in part_steps
+                    ]
+                } for name, contents in part_steps.items() if name != "user_data"
+            ] + bootstrap_steps
+            if "user_data" in part_steps:
+                steps.append({
+                    "name": "user_data",
+                    "contents": "".join(part_steps["user_data"]),
+                    "depends_on": [ step["name"] for step in steps ]
+                })
+            self.bootstrap_runner = BootstrapRunner(steps)
+            user_data_parts = self.bootstrap_runner.parts() + remaining_parts
+            user_data_variables['AsgId'] = id
+        if use_compressed_user_data:
+            compressed_user_data = CompressedUserData(user_data_parts)
+            compressed_user_data.check_size()
+            user_data_contents = compressed_user_data.contents()
         else:
-            user_data_contents = user_data_contents + "\n" + reprovision_snippet
+            user_data_contents = "".join(contents for name, contents in user_data_parts)
         user_data = (
             Fn.base64(
                 Fn.sub(
@@ -595,22 +1509,83 @@ class Asg(Construct):
 
         block_device_mappings = None
         if root_volume_size > 0:
+            (
+                self.root_volume_type_param,
+                self.root_volume_iops_param,
+                self.root_volume_throughput_param,
+                self.root_volume_gp3_condition
+            ) = self._volume_performance_parameters("RootVolume", "root volume", root_volume_size)
+            root_volume_size_value = root_volume_size
+            if use_hibernation:
+                # memory is written to the root volume on hibernation, so it is sized for the selected instance type
+                self.hibernation_root_volume_size_mapping = CfnMapping(
+                    self,
+                    "HibernationRootVolumeSize",
+                    mapping={
+                        item: { "Size": root_volume_size + math.ceil(InstanceTypes.get(item).memory_gib) }
+                        for item in instance_type_allowed_values
+                    }
+                )
+                self.hibernation_root_volume_size_mapping.override_logical_id(f"{id}HibernationRootVolumeSize")
+                root_volume_size_value = Token.as_number(
+                    self.hibernation_root_volume_size_mapping.find_in_map(self.instance_type_param.value_as_string, "Size")
+                )
             block_device_mappings = [
                 aws_ec2.CfnLaunchTemplate.BlockDeviceMappingProperty(
                     device_name=root_volume_device_name,
                     ebs=aws_ec2.CfnLaunchTemplate.EbsProperty(
                         encrypted=True,
-                        volume_size=root_volume_size,
-                        volume_type="gp3"
+                        iops=self.root_volume_iops_param.value_as_number,
+                        throughput=Token.as_number(
+                            Fn.condition_if(
+                                self.root_volume_gp3_condition.logical_id,
+                                self.root_volume_throughput_param.value_as_number,
+                                Aws.NO_VALUE
+                            )
+                        ),
+                        volume_size=root_volume_size_value,
+                        volume_type=self.root_volume_type_param.value_as_string
                     )
                 )
             ]
 
+        placement = None
+        if placement_strategy:
+            self.placement_group = aws_ec2.CfnPlacementGroup(
+                self,
+                "PlacementGroup",
+                partition_count=placement_partition_count,
+                strategy=placement_strategy
+            )
+            self.placement_group.override_logical_id(f"{id}PlacementGroup")
+            placement = aws_ec2.CfnLaunchTemplate.PlacementProperty(
+                group_name=self.placement_group.ref
+            )
+
         self.ec2_launch_template = aws_ec2.CfnLaunchTemplate(
             self,
             f"{id}LaunchTemplate",
             launch_template_data=aws_ec2.CfnLaunchTemplate.LaunchTemplateDataProperty(
                 block_device_mappings=block_device_mappings,
+                capacity_reservation_specification=Fn.condition_if(
+                    self.capacity_reservation_targeted_condition.logical_id,
+                    {
+                        "CapacityReservationTarget": Fn.condition_if(
+                            self.capacity_reservation_resource_group_condition.logical_id,
+                            { "CapacityReservationResourceGroupArn": self.capacity_reservation_target_param.value_as_string },
+                            { "CapacityReservationId": self.capacity_reservation_target_param.value_as_string }
+                        )
+                    },
+                    { "CapacityReservationPreference": self.capacity_reservation_preference_param.value_as_string }
+                ) if use_capacity_reservation else None,
+                credit_specification=Fn.condition_if(
+                    self.burstable_instance_type_condition.logical_id,
+                    { "CpuCredits": self.cpu_credits_param.value_as_string },
+                    Aws.NO_VALUE
+                ) if self._use_cpu_credits else None,
+                hibernation_options=aws_ec2.CfnLaunchTemplate.HibernationOptionsProperty(
+                    configured=True
+                ) if use_hibernation else None,
                 image_id=self.ami_id_param.value_as_string,
                 instance_type=self.instance_type_param.value_as_string,
                 iam_instance_profile=aws_ec2.CfnLaunchTemplate.IamInstanceProfileProperty(
@@ -626,25 +1601,80 @@ class Asg(Construct):
                 metadata_options=aws_ec2.CfnLaunchTemplate.MetadataOptionsProperty(
                     http_tokens="required",
                 ),
+                placement=placement,
                 security_group_ids=[ self.sg.attr_group_id ],
                 user_data=user_data
             )
         )
         self.ec2_launch_template.override_logical_id(f"{id}LaunchTemplate")
 
-        if singleton:
+        # a cluster placement group is limited to a single availability zone
+        if use_data_volume_recovery:
+            subnets = [
+                Token.as_string(
+                    Fn.condition_if(
+                        self.data_volume_recovery_subnet2_condition.logical_id,
+                        vpc.public_subnet2_id() if use_public_subnets else vpc.private_subnet2_id(),
+                        vpc.public_subnet1_id() if use_public_subnets else vpc.private_subnet1_id()
+                    )
+                )
+            ]
+        elif singleton or placement_strategy == "cluster":
             subnets = [vpc.public_subnet1_id()] if use_public_subnets else [vpc.private_subnet1_id()]
         else:
             subnets = vpc.public_subnet_ids() if use_public_subnets else vpc.private_subnet_ids()
 
         # autoscaling
+        launch_template_specification = aws_autoscaling.CfnAutoScalingGroup.LaunchTemplateSpecificationProperty(
+            version=self.ec2_launch_template.attr_latest_version_number,
+            launch_template_id=self.ec2_launch_template.ref
+        )
+        mixed_instances_policy = None
+        if use_mixed_instances_policy:
+            # the selected instance type has the highest priority for on-demand capacity
+            overrides = [self.instance_type_param.value_as_string] + mixed_instance_types
+            mixed_instances_policy = aws_autoscaling.CfnAutoScalingGroup.MixedInstancesPolicyProperty(
+                instances_distribution=aws_autoscaling.CfnAutoScalingGroup.InstancesDistributionProperty(
+                    on_demand_allocation_strategy="prioritized",
+                    on_demand_base_capacity=self.on_demand_base_capacity_param.value_as_number,
+                    on_demand_percentage_above_base_capacity=self.on_demand_percentage_above_base_capacity_param.value_as_number,
+                    spot_allocation_strategy=self.spot_allocation_strategy_param.value_as_string
+                ),
+                launch_template=aws_autoscaling.CfnAutoScalingGroup.LaunchTemplateProperty(
+                    launch_template_specification=launch_template_specification,
+                    overrides=[
+                        aws_autoscaling.CfnAutoScalingGroup.LaunchTemplateOverridesProperty(
+                            instance_type=instance_type
+                        ) for instance_type in overrides
+                    ]
+                )
+            )
+        lifecycle_hook_specification_list = []
+        if self._use_warm_pool:
+            lifecycle_hook_specification_list.append(
+                aws_autoscaling.CfnAutoScalingGroup.LifecycleHookSpecificationProperty(
+                    default_result="ABANDON",
+                    heartbeat_timeout=create_and_update_timeout_minutes * 60,
+                    lifecycle_hook_name=f"{id}LaunchLifecycleHook",
+                    lifecycle_transition="autoscaling:EC2_INSTANCE_LAUNCHING"
+                )
+            )
+        if use_graceful_drain:
+            lifecycle_hook_specification_list.append(
+                aws_autoscaling.CfnAutoScalingGroup.LifecycleHookSpecificationProperty(
+                    default_result="CONTINUE",
+                    heartbeat_timeout=self.drain_timeout_param.value_as_number,
+                    lifecycle_hook_name=f"{id}TerminationLifecycleHook",
+                    lifecycle_transition="autoscaling:EC2_INSTANCE_TERMINATING"
+                )
+            )
         self.asg = aws_autoscaling.CfnAutoScalingGroup(
             self,
             "Asg",
-            launch_template=aws_autoscaling.CfnAutoScalingGroup.LaunchTemplateSpecificationProperty(
-                version=self.ec2_launch_template.attr_latest_version_number,
-                launch_template_id=self.ec2_launch_template.ref
-            ),
+            capacity_rebalance=True if use_mixed_instances_policy else None,
+            launch_template=None if use_mixed_instances_policy else launch_template_specification,
+            lifecycle_hook_specification_list=lifecycle_hook_specification_list or None,
+            mixed_instances_policy=mixed_instances_policy,
             desired_capacity="1" if singleton else Token.as_string(self.desired_capacity_param.value),
             health_check_type=health_check_type,
             max_size="1" if singleton else Token.as_string(self.max_size_param.value),
@@ -668,7 +1698,14 @@ class Asg(Construct):
                 )
             )
         else:
-            if deployment_rolling_update:
+            if self._deployment_instance_refresh:
+                # launch template changes are rolled out by the instance refresh custom resource below
+                self.asg.cfn_options.update_policy=CfnUpdatePolicy(
+                    auto_scaling_scheduled_action=CfnAutoScalingScheduledAction(
+                        ignore_unmodified_group_size_properties=True
+                    )
+                )
+            elif deployment_rolling_update:
                 self.asg.cfn_options.update_policy=CfnUpdatePolicy(
                     auto_scaling_rolling_update=CfnAutoScalingRollingUpdate(
                         min_instances_in_service=Token.as_number(self.min_size_param.value),
@@ -683,9 +1720,233 @@ class Asg(Construct):
                 self.asg.cfn_options.update_policy=CfnUpdatePolicy(
                     auto_scaling_replacing_update=CfnAutoScalingReplacingUpdate(
                         will_replace=True
+                    ),
+                    auto_scaling_scheduled_action=CfnAutoScalingScheduledAction(
+                        ignore_unmodified_group_size_properties=True
                     )
                 )
         Tags.of(self.asg).add("Name", "{}/Asg".format(Aws.STACK_NAME))
+        if use_data_volume and data_volume_count > 1:
+            # selects the instance for the data volume snapshot policy
+            Tags.of(self.asg).add(Asg.DATA_VOLUME_SNAPSHOT_TAG, f"{Aws.STACK_NAME}-{id}")
+
+        if singleton and use_hibernation:
+            # stop and start the singleton instance with its memory, without the Auto Scaling
+            # Group replacing it while it is hibernated
+            describe_instance_step = {
+                "name": "describeAutoScalingGroup",
+                "action": "aws:executeAwsApi",
+                "inputs": {
+                    "Service": "autoscaling",
+                    "Api": "DescribeAutoScalingGroups",
+                    "AutoScalingGroupNames": [ self.asg.ref ]
+                },
+                "outputs": [
+                    {
+                        "Name": "InstanceId",
+                        "Selector": "$.AutoScalingGroups[0].Instances[0].InstanceId",
+                        "Type": "String"
+                    }
+                ]
+            }
+            processes_inputs = {
+                "Service": "autoscaling",
+                "AutoScalingGroupName": self.asg.ref,
+                "ScalingProcesses": Asg.HIBERNATION_SUSPENDED_PROCESSES
+            }
+            instance_ids = [ "{{ describeAutoScalingGroup.InstanceId }}" ]
+            self.hibernate_document = aws_ssm.CfnDocument(
+                self,
+                "HibernateDocument",
+                document_type="Automation",
+                content={
+                    "schemaVersion": "0.3",
+                    "description": "Suspends Auto Scaling health checks and hibernates the singleton instance",
+                    "mainSteps": [
+                        describe_instance_step,
+                        {
+                            "name": "suspendProcesses",
+                            "action": "aws:executeAwsApi",
+                            "inputs": { **processes_inputs, "Api": "SuspendProcesses" }
+                        },
+                        {
+                            "name": "hibernateInstance",
+                            "action": "aws:executeAwsApi",
+                            "inputs": {
+                                "Service": "ec2",
+                                "Api": "StopInstances",
+                                "Hibernate": True,
+                                "InstanceIds": instance_ids
+                            }
+                        },
+                        {
+                            "name": "waitForStopped",
+                            "action": "aws:waitForAwsResourceProperty",
+                            "inputs": {
+                                "Service": "ec2",
+                                "Api": "DescribeInstances",
+                                "InstanceIds": instance_ids,
+                                "PropertySelector": "$.Reservations[0].Instances[0].State.Name",
+                                "DesiredValues": [ "stopped" ]
+                            }
+                        }
+                    ]
+                }
+            )
+            self.hibernate_document.override_logical_id(f"{id}HibernateDocument")
+            self.resume_document = aws_ssm.CfnDocument(
+                self,
+                "ResumeDocument",
+                document_type="Automation",
+                content={
+                    "schemaVersion": "0.3",
+                    "description": "Resumes the hibernated singleton instance and Auto Scaling health checks",
+                    "mainSteps": [
+                        describe_instance_step,
+                        {
+                            "name": "startInstance",
+                            "action": "aws:executeAwsApi",
+                            "inputs": {
+                                "Service": "ec2",
+                                "Api": "StartInstances",
+                                "InstanceIds": instance_ids
+                            }
+                        },
+                        {
+                            "name": "waitForRunning",
+                            "action": "aws:waitForAwsResourceProperty",
+                            "inputs": {
+                                "Service": "ec2",
+                                "Api": "DescribeInstances",
+                                "InstanceIds": instance_ids,
+                                "PropertySelector": "$.Reservations[0].Instances[0].State.Name",
+                                "DesiredValues": [ "running" ]
+                            }
+                        },
+                        {
+                            "name": "resumeProcesses",
+                            "action": "aws:executeAwsApi",
+                            "inputs": { **processes_inputs, "Api": "ResumeProcesses" }
+                        }
+                    ]
+                }
+            )
+            self.resume_document.override_logical_id(f"{id}ResumeDocument")
+
+        if self._use_business_hours_schedule:
+            self.business_hours_start_scheduled_action = self.add_scheduled_action(
+                "BusinessHoursStart",
+                self.business_hours_start_param.value_as_string,
+                min_size=self.min_size_param.value_as_number,
+                max_size=self.max_size_param.value_as_number,
+                desired_capacity=self.desired_capacity_param.value_as_number,
+                time_zone=self.business_hours_time_zone_param.value_as_string,
+                condition=self.business_hours_schedule_condition
+            )
+            self.business_hours_end_scheduled_action = self.add_scheduled_action(
+                "BusinessHoursEnd",
+                self.business_hours_end_param.value_as_string,
+                min_size=self.off_hours_capacity_param.value_as_number,
+                desired_capacity=self.off_hours_capacity_param.value_as_number,
+                time_zone=self.business_hours_time_zone_param.value_as_string,
+                condition=self.business_hours_schedule_condition
+            )
+
+        if self._deployment_instance_refresh:
+            lambda_code_path = Util.local_path("lambda_start_instance_refresh.py")
+            with open(lambda_code_path) as f:
+                lambda_code = f.read()
+            self.instance_refresh_lambda = aws_lambda.Function(
+                self,
+                "AsgInstanceRefreshLambda",
+                runtime=aws_lambda.Runtime.PYTHON_3_13,
+                timeout=Duration.seconds(900),
+                handler="index.handler",
+                code=aws_lambda.Code.from_inline(lambda_code)
+            )
+            self.instance_refresh_lambda.node.default_child.override_logical_id(f"{id}InstanceRefreshLambda")
+            self.instance_refresh_lambda.role.node.default_child.override_logical_id(f"{id}InstanceRefreshLambdaRole")
+            self.instance_refresh_lambda_policy = aws_iam.Policy(
+                self,
+                "InstanceRefreshPolicy",
+                statements=[
+                    aws_iam.PolicyStatement(
+                        actions=[
+                            "autoscaling:CancelInstanceRefresh",
+                            "autoscaling:DescribeInstanceRefreshes",
+                            "autoscaling:StartInstanceRefresh"
+                        ],
+                        resources=["*"]
+                    ),
+                    # waiting for the refresh continues in a new invocation before the timeout
+                    aws_iam.PolicyStatement(
+                        actions=["lambda:InvokeFunction"],
+                        resources=[self.instance_refresh_lambda.function_arn]
+                    )
+                ]
+            )
+            self.instance_refresh_lambda_policy.node.default_child.override_logical_id(f"{id}InstanceRefreshPolicy")
+            self.instance_refresh_lambda.role.attach_inline_policy(self.instance_refresh_lambda_policy)
+            self.instance_refresh_custom_resource = CustomResource(
+                self,
+                "AsgInstanceRefreshCustomResource",
+                service_token=self.instance_refresh_lambda.function_arn,
+                properties={
+                    "asg_name": self.asg.ref,
+                    "checkpoint_delay": self.instance_refresh_checkpoint_delay_param.value_as_string,
+                    "checkpoint_percentages": self.instance_refresh_checkpoint_percentages_param.value_as_string,
+                    "instance_warmup": self.instance_refresh_instance_warmup_param.value_as_string,
+                    "launch_template_version": self.ec2_launch_template.attr_latest_version_number,
+                    "min_healthy_percentage": self.instance_refresh_min_healthy_percentage_param.value_as_string,
+                    "skip_matching": self.instance_refresh_skip_matching_param.value_as_string
+                }
+            )
+            self.instance_refresh_custom_resource.node.default_child.override_logical_id(f"{id}InstanceRefreshCustomResource")
+            self.instance_refresh_custom_resource.node.add_dependency(self.instance_refresh_lambda_policy)
+
+        if self._use_warm_pool:
+            self.warm_pool = aws_autoscaling.CfnWarmPool(
+                self,
+                "AsgWarmPool",
+                auto_scaling_group_name=self.asg.ref,
+                instance_reuse_policy=aws_autoscaling.CfnWarmPool.InstanceReusePolicyProperty(
+                    reuse_on_scale_in=True
+                ),
+                max_group_prepared_capacity=self.warm_pool_max_prepared_capacity_param.value_as_number,
+                min_size=self.warm_pool_min_size_param.value_as_number,
+                pool_state=self.warm_pool_state_param.value_as_string
+            )
+            self.warm_pool.override_logical_id(f"{id}WarmPool")
+
+        if self._use_target_tracking_scaling:
+            self.cpu_scaling_policy = self._target_tracking_scaling_policy(
+                "AsgCpuScalingPolicy",
+                "ASGAverageCPUUtilization",
+                self.scaling_cpu_target_param,
+                self.scaling_cpu_target_condition
+            )
+            self.cpu_scaling_policy.override_logical_id(f"{id}CpuScalingPolicy")
+            self.network_in_scaling_policy = self._target_tracking_scaling_policy(
+                "AsgNetworkInScalingPolicy",
+                "ASGAverageNetworkIn",
+                self.scaling_network_in_target_param,
+                self.scaling_network_in_target_condition
+            )
+            self.network_in_scaling_policy.override_logical_id(f"{id}NetworkInScalingPolicy")
+            self.network_out_scaling_policy = self._target_tracking_scaling_policy(
+                "AsgNetworkOutScalingPolicy",
+                "ASGAverageNetworkOut",
+                self.scaling_network_out_target_param,
+                self.scaling_network_out_target_condition
+            )
+            self.network_out_scaling_policy.override_logical_id(f"{id}NetworkOutScalingPolicy")
+            self.predictive_cpu_scaling_policy = self._predictive_scaling_policy(
+                "AsgPredictiveCpuScalingPolicy",
+                "ASGCPUUtilization",
+                self.scaling_cpu_target_param,
+                self.predictive_cpu_scaling_condition
+            )
+            self.predictive_cpu_scaling_policy.override_logical_id(f"{id}PredictiveCpuScalingPolicy")
 
         if notification_topic_arn:
             actions=[notification_topic_arn]
@@ -719,7 +1980,7 @@ class Asg(Construct):
                 metric_name="disk_used_percent",
                 dimensions=[
                     {"name": "AutoScalingGroupName", "value": self.asg.ref },
-                    {"name": "fstype", "value": "xfs"},
+                    {"name": "fstype", "value": data_volume_filesystem},
                     {"name": "path", "value": "/data"}
                 ],
                 statistic="Average",
@@ -732,6 +1993,46 @@ class Asg(Construct):
             )
             self.data_disk_alarm.override_logical_id(f"{id}DataDiskAlarm")
 
+        if self._use_cpu_credits:
+            self.cpu_credit_balance_alarm = aws_cloudwatch.CfnAlarm(
+                self,
+                "AsgCpuCreditBalanceAlarm",
+                namespace="AWS/EC2",
+                metric_name="CPUCreditBalance",
+                dimensions=[
+                    {"name": "AutoScalingGroupName", "value": self.asg.ref }
+                ],
+                statistic="Minimum",
+                period=300,
+                evaluation_periods=1,
+                threshold=self.cpu_credit_balance_alarm_threshold_param.value_as_number,
+                alarm_actions=actions,
+                ok_actions=actions,
+                comparison_operator="LessThanThreshold"
+            )
+            self.cpu_credit_balance_alarm.cfn_options.condition = self.burstable_instance_type_condition
+            self.cpu_credit_balance_alarm.override_logical_id(f"{id}CpuCreditBalanceAlarm")
+            self.cpu_surplus_credits_charged_alarm = aws_cloudwatch.CfnAlarm(
+                self,
+                "AsgCpuSurplusCreditsChargedAlarm",
+                namespace="AWS/EC2",
+                metric_name="CPUSurplusCreditsCharged",
+                dimensions=[
+                    {"name": "AutoScalingGroupName", "value": self.asg.ref }
+                ],
+                statistic="Sum",
+                period=300,
+                evaluation_periods=1,
+                threshold=0,
+                alarm_actions=actions,
+                ok_actions=actions,
+                comparison_operator="GreaterThanThreshold",
+                treat_missing_data="notBreaching"
+            )
+            self.cpu_surplus_credits_charged_alarm.cfn_options.condition = self.burstable_instance_type_condition
+            self.cpu_surplus_credits_charged_alarm.override_logical_id(f"{id}CpuSurplusCreditsChargedAlarm")
+
+        if use_data_volume and data_volume_count == 1:
             #
             # OUTPUTS
             #
@@ -744,6 +2045,230 @@ class Asg(Construct):
             )
             self.data_volume_backup_vault_arn_output.override_logical_id(f"{id}DataVolumeBackupVaultArnOutput")
 
+    # CloudFormation rules can not do arithmetic, so IOPS and throughput are offered in tiers
+    # and the ratios are enforced by listing the tiers that are valid for each other value;
+    # for a size parameter, by listing the sizes that are too small for each IOPS tier
+    def _volume_performance_parameters(self, name, label, size=None, size_param=None):
+        type_param = CfnParameter(
+            self,
+            f"Asg{name}Type",
+            allowed_values=[ "gp3", "io2" ],
+            default="gp3",
+            description=f"Required: The EBS volume type of the {label}."
+        )
+        type_param.override_logical_id(f"{self._id}{name}Type")
+        iops_param = CfnParameter(
+            self,
+            f"Asg{name}Iops",
+            allowed_values=[str(iops) for iops in Asg.VOLUME_IOPS],
+            default=3000,
+            description=f"Required: The provisioned IOPS of the {label}. gp3 volumes support up to {Asg.GP3_MAX_IOPS} IOPS and {Asg.GP3_MAX_IOPS_PER_GIB} IOPS per GiB, io2 volumes support {Asg.IO2_MAX_IOPS_PER_GIB} IOPS per GiB.",
+            type="Number"
+        )
+        iops_param.override_logical_id(f"{self._id}{name}Iops")
+        throughput_param = CfnParameter(
+            self,
+            f"Asg{name}Throughput",
+            allowed_values=[str(throughput) for throughput in Asg.VOLUME_THROUGHPUTS],
+            default=125,
+            description=f"Required: The throughput in MiB/s of the {label}, used for gp3 volumes only. gp3 volumes support {Asg.GP3_MAX_THROUGHPUT_PER_IOPS} MiB/s per provisioned IOPS.",
+            type="Number"
+        )
+        throughput_param.override_logical_id(f"{self._id}{name}Throughput")
+        gp3_condition = CfnCondition(
+            self,
+            f"Asg{name}Gp3Condition",
+            expression=Fn.condition_equals(type_param.value, "gp3")
+        )
+        gp3_condition.override_logical_id(f"{self._id}{name}Gp3Condition")
+
+        gp3_max_iops = Asg.GP3_MAX_IOPS
+        io2_max_iops = Asg.VOLUME_IOPS[-1]
+        if size:
+            # baseline gp3 performance is available at any size
+            gp3_max_iops = max(Asg.VOLUME_IOPS[0], min(gp3_max_iops, size * Asg.GP3_MAX_IOPS_PER_GIB))
+            io2_max_iops = min(io2_max_iops, size * Asg.IO2_MAX_IOPS_PER_GIB)
+        gp3_assertions = [
+            CfnRuleAssertion(
+                assert_=Fn.condition_contains(
+                    [str(iops) for iops in Asg.VOLUME_IOPS if iops <= gp3_max_iops],
+                    iops_param.value_as_string
+                ),
+                assert_description=f"The {label} IOPS must be at most {gp3_max_iops} for a gp3 volume{' of this size' if size else ''}."
+            )
+        ]
+        for throughput in Asg.VOLUME_THROUGHPUTS:
+            valid_iops = [str(iops) for iops in Asg.VOLUME_IOPS if iops * Asg.GP3_MAX_THROUGHPUT_PER_IOPS >= throughput]
+            if len(valid_iops) < len(Asg.VOLUME_IOPS):
+                gp3_assertions.append(
+                    CfnRuleAssertion(
+                        assert_=Fn.condition_or(
+                            Fn.condition_not(Fn.condition_equals(throughput_param.value_as_string, str(throughput))),
+                            Fn.condition_contains(valid_iops, iops_param.value_as_string)
+                        ),
+                        assert_description=f"The {label} throughput of {throughput} MiB/s requires at least {valid_iops[0]} IOPS."
+                    )
+                )
+        if size_param:
+            gp3_assertions += self._volume_size_assertions(label, "a gp3", iops_param, size_param, gp3_max_iops, Asg.GP3_MAX_IOPS_PER_GIB)
+        gp3_rule = CfnRule(
+            self,
+            f"Asg{name}Gp3PerformanceRule",
+            assertions=gp3_assertions,
+            rule_condition=Fn.condition_equals(type_param.value_as_string, "gp3")
+        )
+        gp3_rule.override_logical_id(f"{self._id}{name}Gp3PerformanceRule")
+        io2_assertions = []
+        if io2_max_iops < Asg.VOLUME_IOPS[-1]:
+            io2_assertions.append(
+                CfnRuleAssertion(
+                    assert_=Fn.condition_contains(
+                        [str(iops) for iops in Asg.VOLUME_IOPS if iops <= io2_max_iops],
+                        iops_param.value_as_string
+                    ),
+                    assert_description=f"The {label} IOPS must be at most {io2_max_iops} for an io2 volume of this size."
+                )
+            )
+        if size_param:
+            io2_assertions += self._volume_size_assertions(label, "an io2", iops_param, size_param, io2_max_iops, Asg.IO2_MAX_IOPS_PER_GIB)
+        if io2_assertions:
+            io2_rule = CfnRule(
+                self,
+                f"Asg{name}Io2PerformanceRule",
+                assertions=io2_assertions,
+                rule_condition=Fn.condition_equals(type_param.value_as_string, "io2")
+            )
+            io2_rule.override_logical_id(f"{self._id}{name}Io2PerformanceRule")
+        return type_param, iops_param, throughput_param, gp3_condition
+
+    # one assertion per IOPS tier that needs more than 1 GiB, failing for the sizes below its minimum
+    def _volume_size_assertions(self, label, volume_type, iops_param, size_param, max_iops, max_iops_per_gib):
+        assertions = []
+        for iops in Asg.VOLUME_IOPS:
+            min_size = math.ceil(iops / max_iops_per_gib)
+            if iops > max_iops or min_size <= 1:
+                continue
+            assertions.append(
+                CfnRuleAssertion(
+                    assert_=Fn.condition_or(
+                        Fn.condition_not(Fn.condition_equals(iops_param.value_as_string, str(iops))),
+                        Fn.condition_not(
+                            Fn.condition_contains([str(size) for size in range(1, min_size)], size_param.value_as_string)
+                        )
+                    ),
+                    assert_description=f"The {label} IOPS of {iops} requires {volume_type} volume of at least {min_size} GiB."
+                )
+            )
+        return assertions
+
+    def add_scheduled_action(self, name, recurrence, min_size=None, max_size=None, desired_capacity=None, time_zone=None, condition=None):
+        scheduled_action = aws_autoscaling.CfnScheduledAction(
+            self,
+            f"Asg{name}ScheduledAction",
+            auto_scaling_group_name=self.asg.ref,
+            desired_capacity=desired_capacity,
+            max_size=max_size,
+            min_size=min_size,
+            recurrence=recurrence,
+            time_zone=time_zone
+        )
+        scheduled_action.override_logical_id(f"{self._id}{name}ScheduledAction")
+        if condition:
+            scheduled_action.cfn_options.condition = condition
+        return scheduled_action
+
+    def _target_tracking_scaling_policy(self, construct_id, metric_type, target_param, condition, resource_label=None):
+        policy = aws_autoscaling.CfnScalingPolicy(
+            self,
+            construct_id,
+            auto_scaling_group_name=self.asg.ref,
+            policy_type="TargetTrackingScaling",
+            target_tracking_configuration=aws_autoscaling.CfnScalingPolicy.TargetTrackingConfigurationProperty(
+                predefined_metric_specification=aws_autoscaling.CfnScalingPolicy.PredefinedMetricSpecificationProperty(
+                    predefined_metric_type=metric_type,
+                    resource_label=resource_label
+                ),
+                target_value=target_param.value_as_number
+            )
+        )
+        policy.cfn_options.condition = condition
+        return policy
+
+    def _predictive_scaling_policy(self, construct_id, metric_pair_type, target_param, condition, resource_label=None):
+        policy = aws_autoscaling.CfnScalingPolicy(
+            self,
+            construct_id,
+            auto_scaling_group_name=self.asg.ref,
+            policy_type="PredictiveScaling",
+            predictive_scaling_configuration=aws_autoscaling.CfnScalingPolicy.PredictiveScalingConfigurationProperty(
+                metric_specifications=[
+                    aws_autoscaling.CfnScalingPolicy.PredictiveScalingMetricSpecificationProperty(
+                        predefined_metric_pair_specification=aws_autoscaling.CfnScalingPolicy.PredictiveScalingPredefinedMetricPairProperty(
+                            predefined_metric_type=metric_pair_type,
+                            resource_label=resource_label
+                        ),
+                        target_value=target_param.value_as_number
+                    )
+                ],
+                mode=self.predictive_scaling_mode_param.value_as_string,
+                scheduling_buffer_time=self.predictive_scaling_scheduling_buffer_param.value_as_number
+            )
+        )
+        policy.cfn_options.condition = condition
+        return policy
+
+    # registers the ALB target group with the Auto Scaling Group if the pattern has not already
+    def add_request_count_scaling_policy(self, alb):
+        if self._singleton:
+            raise ValueError("add_request_count_scaling_policy can not be used with a singleton Auto Scaling Group")
+        if not self._use_target_tracking_scaling:
+            raise ValueError("add_request_count_scaling_policy requires use_target_tracking_scaling")
+        target_group_arns = list(self.asg.target_group_arns or [])
+        if alb.target_group.ref not in target_group_arns:
+            self.asg.target_group_arns = target_group_arns + [alb.target_group.ref]
+        resource_label = Fn.join("/", [
+            alb.alb.attr_load_balancer_full_name,
+            alb.target_group.attr_target_group_full_name
+        ])
+        self.scaling_request_count_target_param = CfnParameter(
+            self,
+            "AsgScalingRequestCountTarget",
+            default=1000,
+            description="Optional: The target number of ALB requests per instance for the Auto Scaling Group. Set to 0 to disable request count based scaling.",
+            min_value=0,
+            type="Number"
+        )
+        self.scaling_request_count_target_param.override_logical_id(f"{self._id}ScalingRequestCountTarget")
+        self.scaling_request_count_target_condition = CfnCondition(
+            self,
+            "AsgScalingRequestCountTargetCondition",
+            expression=Fn.condition_not(Fn.condition_equals(self.scaling_request_count_target_param.value, "0"))
+        )
+        self.scaling_request_count_target_condition.override_logical_id(f"{self._id}ScalingRequestCountTargetCondition")
+        self.request_count_scaling_policy = self._target_tracking_scaling_policy(
+            "AsgRequestCountScalingPolicy",
+            "ALBRequestCountPerTarget",
+            self.scaling_request_count_target_param,
+            self.scaling_request_count_target_condition,
+            resource_label=resource_label
+        )
+        self.request_count_scaling_policy.override_logical_id(f"{self._id}RequestCountScalingPolicy")
+        self.predictive_request_count_scaling_condition = CfnCondition(
+            self,
+            "AsgPredictiveRequestCountScalingCondition",
+            expression=Fn.condition_and(self.predictive_scaling_condition, self.scaling_request_count_target_condition)
+        )
+        self.predictive_request_count_scaling_condition.override_logical_id(f"{self._id}PredictiveRequestCountScalingCondition")
+        self.predictive_request_count_scaling_policy = self._predictive_scaling_policy(
+            "AsgPredictiveRequestCountScalingPolicy",
+            "ALBRequestCount",
+            self.scaling_request_count_target_param,
+            self.predictive_request_count_scaling_condition,
+            resource_label=resource_label
+        )
+        self.predictive_request_count_scaling_policy.override_logical_id(f"{self._id}PredictiveRequestCountScalingPolicy")
+        return self.request_count_scaling_policy
+
     def data_volume_backup_vault_arn(self):
         if self._use_data_volume:
             return Token.as_string(
@@ -779,19 +2304,88 @@ class Asg(Construct):
             self.reprovision_string_param.logical_id,
             self.disk_usage_alarm_threshold_param.logical_id
         ]
+        if self._use_cpu_credits:
+            params += [
+                self.cpu_credits_param.logical_id,
+                self.cpu_credit_balance_alarm_threshold_param.logical_id
+            ]
         if not self._singleton:
             params += [
                 self.desired_capacity_param.logical_id,
                 self.max_size_param.logical_id,
                 self.min_size_param.logical_id
             ]
+        if self._use_target_tracking_scaling:
+            params += [
+                self.scaling_cpu_target_param.logical_id,
+                self.scaling_network_in_target_param.logical_id,
+                self.scaling_network_out_target_param.logical_id,
+                self.predictive_scaling_mode_param.logical_id,
+                self.predictive_scaling_scheduling_buffer_param.logical_id
+            ]
+        if self.scaling_request_count_target_param:
+            params.append(self.scaling_request_count_target_param.logical_id)
+        if self._use_mixed_instances_policy:
+            params += [
+                self.on_demand_base_capacity_param.logical_id,
+                self.on_demand_percentage_above_base_capacity_param.logical_id,
+                self.spot_allocation_strategy_param.logical_id
+            ]
+        if self._use_business_hours_schedule:
+            params += [
+                self.business_hours_schedule_param.logical_id,
+                self.business_hours_start_param.logical_id,
+                self.business_hours_end_param.logical_id,
+                self.business_hours_time_zone_param.logical_id,
+                self.off_hours_capacity_param.logical_id
+            ]
+        if self._deployment_instance_refresh:
+            params += [
+                self.instance_refresh_min_healthy_percentage_param.logical_id,
+                self.instance_refresh_instance_warmup_param.logical_id,
+                self.instance_refresh_checkpoint_percentages_param.logical_id,
+                self.instance_refresh_checkpoint_delay_param.logical_id,
+                self.instance_refresh_skip_matching_param.logical_id
+            ]
+        if self._use_warm_pool:
+            params += [
+                self.warm_pool_state_param.logical_id,
+                self.warm_pool_min_size_param.logical_id,
+                self.warm_pool_max_prepared_capacity_param.logical_id
+            ]
+        if self._use_capacity_reservation:
+            params += [
+                self.capacity_reservation_preference_param.logical_id,
+                self.capacity_reservation_target_param.logical_id
+            ]
+        if self._use_graceful_drain:
+            params += [
+                self.drain_timeout_param.logical_id
+            ]
+        if self._root_volume_size > 0:
+            params += [
+                self.root_volume_type_param.logical_id,
+                self.root_volume_iops_param.logical_id,
+                self.root_volume_throughput_param.logical_id
+            ]
         if self._use_data_volume:
             params += [
                 self.data_volume_size_param.logical_id,
-                self.data_volume_snapshot_param.logical_id,
-                self.data_volume_backup_retention_period_param.logical_id,
-                self.data_volume_backup_vault_arn_param.logical_id
+                self.data_volume_type_param.logical_id,
+                self.data_volume_iops_param.logical_id,
+                self.data_volume_throughput_param.logical_id
             ]
+            if self.data_volume_snapshot_param:
+                params.append(self.data_volume_snapshot_param.logical_id)
+            if self.data_volume_snapshots_param:
+                params.append(self.data_volume_snapshots_param.logical_id)
+            if self._data_volume_restore_mode == "prewarm":
+                params.append(self.data_volume_prewarm_rate_param.logical_id)
+            params.append(self.data_volume_backup_retention_period_param.logical_id)
+            if self._data_volume_count == 1:
+                params.append(self.data_volume_backup_vault_arn_param.logical_id)
+            if self._use_data_volume_recovery:
+                params.append(self.data_volume_recovery_subnet_param.logical_id)
         return [
             {
                 "Label": {
@@ -819,6 +2413,16 @@ class Asg(Construct):
                 "default": "Percent Disk Used Alarm Threshold"
             }
         }
+        if self._use_cpu_credits:
+            params = {
+                **params,
+                self.cpu_credits_param.logical_id: {
+                    "default": "EC2 CPU Credits"
+                },
+                self.cpu_credit_balance_alarm_threshold_param.logical_id: {
+                    "default": "CPU Credit Balance Alarm Threshold"
+                }
+            }
         if not self._singleton:
             params = {
                 **params,
@@ -832,22 +2436,165 @@ class Asg(Construct):
                     "default": "Auto Scaling Group Minimum Size"
                 }
             }
+        if self._use_target_tracking_scaling:
+            params = {
+                **params,
+                self.scaling_cpu_target_param.logical_id: {
+                    "default": "Auto Scaling Group Target CPU Utilization"
+                },
+                self.scaling_network_in_target_param.logical_id: {
+                    "default": "Auto Scaling Group Target Network In Bytes"
+                },
+                self.scaling_network_out_target_param.logical_id: {
+                    "default": "Auto Scaling Group Target Network Out Bytes"
+                },
+                self.predictive_scaling_mode_param.logical_id: {
+                    "default": "Auto Scaling Group Predictive Scaling Mode"
+                },
+                self.predictive_scaling_scheduling_buffer_param.logical_id: {
+                    "default": "Auto Scaling Group Predictive Scaling Scheduling Buffer"
+                }
+            }
+        if self.scaling_request_count_target_param:
+            params = {
+                **params,
+                self.scaling_request_count_target_param.logical_id: {
+                    "default": "Auto Scaling Group Target Requests Per Instance"
+                }
+            }
+        if self._use_mixed_instances_policy:
+            params = {
+                **params,
+                self.on_demand_base_capacity_param.logical_id: {
+                    "default": "Auto Scaling Group On-Demand Base Capacity"
+                },
+                self.on_demand_percentage_above_base_capacity_param.logical_id: {
+                    "default": "Auto Scaling Group On-Demand Percentage Above Base Capacity"
+                },
+                self.spot_allocation_strategy_param.logical_id: {
+                    "default": "Auto Scaling Group Spot Allocation Strategy"
+                }
+            }
+        if self._use_business_hours_schedule:
+            params = {
+                **params,
+                self.business_hours_schedule_param.logical_id: {
+                    "default": "Auto Scaling Group Business Hours Schedule"
+                },
+                self.business_hours_start_param.logical_id: {
+                    "default": "Auto Scaling Group Business Hours Start"
+                },
+                self.business_hours_end_param.logical_id: {
+                    "default": "Auto Scaling Group Business Hours End"
+                },
+                self.business_hours_time_zone_param.logical_id: {
+                    "default": "Auto Scaling Group Business Hours Time Zone"
+                },
+                self.off_hours_capacity_param.logical_id: {
+                    "default": "Auto Scaling Group Off Hours Capacity"
+                }
+            }
+        if self._deployment_instance_refresh:
+            params = {
+                **params,
+                self.instance_refresh_min_healthy_percentage_param.logical_id: {
+                    "default": "Auto Scaling Group Instance Refresh Minimum Healthy Percentage"
+                },
+                self.instance_refresh_instance_warmup_param.logical_id: {
+                    "default": "Auto Scaling Group Instance Refresh Instance Warmup"
+                },
+                self.instance_refresh_checkpoint_percentages_param.logical_id: {
+                    "default": "Auto Scaling Group Instance Refresh Checkpoint Percentages"
+                },
+                self.instance_refresh_checkpoint_delay_param.logical_id: {
+                    "default": "Auto Scaling Group Instance Refresh Checkpoint Delay"
+                },
+                self.instance_refresh_skip_matching_param.logical_id: {
+                    "default": "Auto Scaling Group Instance Refresh Skip Matching"
+                }
+            }
+        if self._use_warm_pool:
+            params = {
+                **params,
+                self.warm_pool_state_param.logical_id: {
+                    "default": "Auto Scaling Group Warm Pool State"
+                },
+                self.warm_pool_min_size_param.logical_id: {
+                    "default": "Auto Scaling Group Warm Pool Minimum Size"
+                },
+                self.warm_pool_max_prepared_capacity_param.logical_id: {
+                    "default": "Auto Scaling Group Warm Pool Maximum Prepared Capacity"
+                }
+            }
+        if self._use_capacity_reservation:
+            params = {
+                **params,
+                self.capacity_reservation_preference_param.logical_id: {
+                    "default": "Capacity Reservation Preference"
+                },
+                self.capacity_reservation_target_param.logical_id: {
+                    "default": "Capacity Reservation Target"
+                }
+            }
+        if self._use_graceful_drain:
+            params = {
+                **params,
+                self.drain_timeout_param.logical_id: {
+                    "default": "Auto Scaling Group Drain Timeout"
+                }
+            }
+        if self._root_volume_size > 0:
+            params = {
+                **params,
+                self.root_volume_type_param.logical_id: {
+                    "default": "Auto Scaling Group Root Volume Type"
+                },
+                self.root_volume_iops_param.logical_id: {
+                    "default": "Auto Scaling Group Root Volume IOPS"
+                },
+                self.root_volume_throughput_param.logical_id: {
+                    "default": "Auto Scaling Group Root Volume Throughput"
+                }
+            }
         if self._use_data_volume:
             params = {
                 **params,
                 self.data_volume_size_param.logical_id: {
                     "default": "Auto Scaling Group EBS Snapshot Size"
                 },
-                self.data_volume_snapshot_param.logical_id: {
-                    "default": "Auto Scaling Group EBS Snapshot ID"
+                self.data_volume_type_param.logical_id: {
+                    "default": "Auto Scaling Group EBS Volume Type"
                 },
-                self.data_volume_backup_vault_arn_param.logical_id: {
-                    "default": "Auto Scaling Group EBS Backup Vault ARN"
+                self.data_volume_iops_param.logical_id: {
+                    "default": "Auto Scaling Group EBS Volume IOPS"
+                },
+                self.data_volume_throughput_param.logical_id: {
+                    "default": "Auto Scaling Group EBS Volume Throughput"
                 },
                 self.data_volume_backup_retention_period_param.logical_id: {
                     "default": "Auto Scaling Group EBS Backup Retention in Days"
                 }
             }
+            if self._data_volume_count == 1:
+                params[self.data_volume_backup_vault_arn_param.logical_id] = {
+                    "default": "Auto Scaling Group EBS Backup Vault ARN"
+                }
+            if self.data_volume_snapshot_param:
+                params[self.data_volume_snapshot_param.logical_id] = {
+                    "default": "Auto Scaling Group EBS Snapshot ID"
+                }
+            if self.data_volume_snapshots_param:
+                params[self.data_volume_snapshots_param.logical_id] = {
+                    "default": "Auto Scaling Group EBS Snapshot IDs"
+                }
+            if self._data_volume_restore_mode == "prewarm":
+                params[self.data_volume_prewarm_rate_param.logical_id] = {
+                    "default": "Auto Scaling Group EBS Pre-warm Rate in MiB/s"
+                }
+            if self._use_data_volume_recovery:
+                params[self.data_volume_recovery_subnet_param.logical_id] = {
+                    "default": "Auto Scaling Group EBS Recovery Subnet"
+                }
         return params
 
     def cfn_lint_suppressions(self):
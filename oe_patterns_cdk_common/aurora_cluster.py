@@ -13,6 +13,7 @@ from aws_cdk import (
 
 from constructs import Construct
 from oe_patterns_cdk_common.db_secret import DbSecret
+from oe_patterns_cdk_common.instance_types import InstanceTypes
 from oe_patterns_cdk_common.vpc import Vpc
 
 class AuroraCluster(Construct):
@@ -33,43 +34,10 @@ class AuroraCluster(Construct):
         self.database_name = database_name
 
         self.default_instance_type = default_instance_type if default_instance_type else 'db.t4g.medium'
-        self.default_allowed_instance_types = [
-            "db.t3.medium",
-            "db.t3.large",
-            "db.t4g.medium",
-            "db.t4g.large",
-            "db.r5.large",
-            "db.r5.xlarge",
-            "db.r5.2xlarge",
-            "db.r5.4xlarge",
-            "db.r5.8xlarge",
-            "db.r5.12xlarge",
-            "db.r5.16xlarge",
-            "db.r5.24xlarge",
-            "db.r6i.large",
-            "db.r6i.xlarge",
-            "db.r6i.2xlarge",
-            "db.r6i.4xlarge",
-            "db.r6i.8xlarge",
-            "db.r6i.12xlarge",
-            "db.r6i.16xlarge",
-            "db.r6i.24xlarge",
-            "db.r6i.32xlarge",
-            "db.r6g.large",
-            "db.r6g.xlarge",
-            "db.r6g.2xlarge",
-            "db.r6g.4xlarge",
-            "db.r6g.8xlarge",
-            "db.r6g.12xlarge",
-            "db.r6g.16xlarge",
-            "db.x2g.large",
-            "db.x2g.xlarge",
-            "db.x2g.2xlarge",
-            "db.x2g.4xlarge",
-            "db.x2g.8xlarge",
-            "db.x2g.12xlarge",
-            "db.x2g.16xlarge"
-        ]
+        self.default_allowed_instance_types = InstanceTypes.query(
+            service="rds",
+            families=[ "t3", "t4g", "r5", "r6i", "r6g", "x2g" ]
+        )
 
         #
         # PARAMETERS
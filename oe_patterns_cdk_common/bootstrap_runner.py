@@ -0,0 +1,163 @@
+import re
+
+class BootstrapRunner:
+
+    DIRECTORY = "/var/lib/cloud/asg-bootstrap"
+    # step names are used in file names and bash case patterns
+    STEP_NAME_PATTERN = re.compile(r"^[a-z0-9_]+$")
+    STEP_DELIMITER = "ASG_BOOTSTRAP_STEP"
+
+    # each step runs in its own bash process, so the env file sourced at the start of every
+    # step is the only shell state they share. It exports exactly:
+    #   ASG_BOOTSTRAP_ENV  the path of the env file, steps append variables for their dependents to it
+    #   log                logs a timestamped message
+    #   error_exit         logs and exits 1, the runner signals the failure to CloudFormation
+    #   INSTANCE_ID        the EC2 instance id
+    #   DEVICE             the data device mounted at /data, appended by the data_volume step
+    # Fn::Sub variables such as ${AWS::Region} are substituted in every step as before
+    SETUP_SCRIPT = """
+echo "$(date): Preparing bootstrap steps"
+mkdir -p {directory}/steps {directory}/logs {directory}/status
+rm -f {directory}/status/*
+cat <<'EOF' > {directory}/env
+ASG_BOOTSTRAP_ENV={directory}/env
+function log {{
+  echo "$(date '+%Y-%m-%d %H:%M:%S') $1"
+}}
+function error_exit {{
+  log "Error: Exiting with failure"
+  exit 1
+}}
+EOF
+TOKEN=$(curl -X PUT "http://169.254.169.254/latest/api/token" -H "X-aws-ec2-metadata-token-ttl-seconds: 300" -s)
+echo "INSTANCE_ID=$(curl -H "X-aws-ec2-metadata-token: $TOKEN" -s http://169.254.169.254/latest/meta-data/instance-id)" >> {directory}/env
+"""
+
+    # steps start as soon as their dependencies succeed and are skipped when one fails;
+    # each step runs in its own bash process and fails when it exits non-zero. The runner
+    # is the only one to signal failure, steps leave it to the runner
+    RUN_SCRIPT = """
+{dependencies}
+function run_step {{
+  local NAME=$1
+  (
+    set -o pipefail
+    START=$(date +%s)
+    echo "$(date): Starting bootstrap step $NAME"
+    bash {directory}/steps/$NAME.sh 2>&1 | tee {directory}/logs/$NAME.log | sed -u "s/^/[$NAME] /"
+    STATUS=$?
+    echo "$(date): Bootstrap step $NAME exited with $STATUS after $(( $(date +%s) - START ))s"
+    echo $STATUS > {directory}/status/$NAME
+  ) &
+}}
+
+BOOTSTRAP_STEPS="{steps}"
+STARTED=""
+while true; do
+  COMPLETE=1
+  for NAME in $BOOTSTRAP_STEPS; do
+    if [[ -f {directory}/status/$NAME ]]; then
+      continue
+    fi
+    COMPLETE=0
+    if [[ " $STARTED " == *" $NAME "* ]]; then
+      continue
+    fi
+    READY=1
+    for DEPENDENCY in $(step_dependencies $NAME); do
+      if [[ ! -f {directory}/status/$DEPENDENCY ]]; then
+        READY=0
+      elif [[ "$(cat {directory}/status/$DEPENDENCY)" != "0" ]]; then
+        echo "$(date): Skipping bootstrap step $NAME, dependency $DEPENDENCY failed"
+        echo skipped > {directory}/status/$NAME
+        READY=0
+        break
+      fi
+    done
+    if [[ $READY -eq 1 ]]; then
+      STARTED="$STARTED $NAME"
+      run_step $NAME
+    fi
+  done
+  if [[ $COMPLETE -eq 1 ]]; then
+    break
+  fi
+  sleep 0.2
+done
+wait
+
+FAILED_STEPS=""
+for NAME in $BOOTSTRAP_STEPS; do
+  if [[ "$(cat {directory}/status/$NAME)" != "0" ]]; then
+    FAILED_STEPS="$FAILED_STEPS $NAME"
+  fi
+done
+if [[ -n "$FAILED_STEPS" ]]; then
+  echo "$(date): Bootstrap failed, steps not completed:$FAILED_STEPS"
+  cfn-signal --exit-code 1 --stack "${{AWS::StackName}}" --resource "${{AsgId}}" --region "${{AWS::Region}}"
+  exit 1
+fi
+echo "$(date): All bootstrap steps completed"
+"""
+
+    # steps are dicts with a name, the script contents and an optional
+    # depends_on list of step names
+    def __init__(self, steps: 'list[dict]'):
+        names = [step["name"] for step in steps]
+        for step in steps:
+            if not BootstrapRunner.STEP_NAME_PATTERN.match(step["name"]):
+                raise ValueError(f"Bootstrap step name {step['name']} may only contain lowercase letters, digits and underscores")
+            if names.count(step["name"]) > 1:
+                raise ValueError(f"Bootstrap step name {step['name']} is used more than once")
+            for dependency in step.get("depends_on", []):
+                if dependency not in names:
+                    raise ValueError(f"Bootstrap step {step['name']} depends on unknown step {dependency}")
+        self.steps = steps
+        self._check_cycles()
+
+    def _check_cycles(self):
+        resolved = set()
+        remaining = list(self.steps)
+        while remaining:
+            ready = [step for step in remaining if set(step.get("depends_on", [])) <= resolved]
+            if not ready:
+                raise ValueError(f"Bootstrap steps have a dependency cycle: {', '.join(step['name'] for step in remaining)}")
+            resolved.update(step["name"] for step in ready)
+            remaining = [step for step in remaining if step not in ready]
+
+    def dependencies_function(self):
+        lines = [ "function step_dependencies {", "  case $1 in" ]
+        for step in self.steps:
+            lines.append(f"    {step['name']}) echo \"{' '.join(step.get('depends_on', []))}\" ;;")
+        lines += [ "  esac", "}" ]
+        return "\n".join(lines)
+
+    # the shebang of the step contents is replaced, the env file is sourced right after it
+    def step_script(self, step):
+        contents = step["contents"].lstrip("\n")
+        if contents.startswith("#!"):
+            contents = contents.partition("\n")[2]
+        return "\n".join([
+            "",
+            f"cat <<'{BootstrapRunner.STEP_DELIMITER}' > {BootstrapRunner.DIRECTORY}/steps/{step['name']}.sh",
+            "#!/bin/bash",
+            f"source {BootstrapRunner.DIRECTORY}/env",
+            contents.rstrip("\n"),
+            BootstrapRunner.STEP_DELIMITER,
+            ""
+        ])
+
+    # named user data parts: the setup, one part writing each step script and the scheduler
+    def parts(self):
+        parts = [("bootstrap_runner_setup", BootstrapRunner.SETUP_SCRIPT.format(directory=BootstrapRunner.DIRECTORY))]
+        for step in self.steps:
+            parts.append((f"bootstrap_step_{step['name']}", self.step_script(step)))
+        parts.append((
+            "bootstrap_runner",
+            BootstrapRunner.RUN_SCRIPT.format(
+                dependencies=self.dependencies_function(),
+                directory=BootstrapRunner.DIRECTORY,
+                steps=" ".join(step["name"] for step in self.steps)
+            )
+        ))
+        return parts
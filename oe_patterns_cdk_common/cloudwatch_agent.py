@@ -0,0 +1,148 @@
+import json
+
+class CloudWatchAgentConfig:
+
+    AGENT_ETC_PATH = "/opt/aws/amazon-cloudwatch-agent/etc"
+    AGENT_LOG_FILE = "/opt/aws/amazon-cloudwatch-agent/logs/amazon-cloudwatch-agent.log"
+
+    # files collected to the system log group when building the full agent config
+    DEFAULT_SYSTEM_LOG_FILES = [
+        { "file_path": "/var/log/cloud-init-output.log", "log_group": "system" },
+        { "file_path": "/var/log/messages", "log_group": "system" },
+        { "file_path": "/var/log/syslog", "log_group": "system" }
+    ]
+    LOG_GROUPS = [ "app", "system" ]
+
+    # collection interval in seconds and the plugins collected on top of the
+    # disk_used_percent metric the Asg disk alarms rely on
+    METRICS_PROFILES = {
+        "standard": { "interval": 60, "plugins": [] },
+        "detailed": { "interval": 60, "plugins": [ "diskio", "mem", "netstat", "procstat", "swap" ] },
+        "high-resolution": { "interval": 10, "plugins": [ "diskio", "mem", "netstat", "procstat", "swap" ] }
+    }
+    MIN_COLLECTION_INTERVAL = 10
+
+    PLUGIN_MEASUREMENTS = {
+        # io_time and iops_in_progress show device saturation and queue depth
+        "diskio": [ "io_time", "iops_in_progress", "read_bytes", "read_time", "reads", "write_bytes", "write_time", "writes" ],
+        "mem": [ "mem_available_percent", "mem_used_percent" ],
+        "netstat": [ "tcp_close_wait", "tcp_established", "tcp_fin_wait1", "tcp_syn_recv", "tcp_syn_sent", "tcp_time_wait" ],
+        "procstat": [ "cpu_usage", "memory_rss" ],
+        "swap": [ "swap_used_percent" ]
+    }
+
+    def __init__(
+            self,
+            metrics_profile: str = "standard",
+            metrics_collection_interval: int = None,
+            procstat_patterns: 'list[str]' = []):
+        if metrics_profile not in CloudWatchAgentConfig.METRICS_PROFILES:
+            raise ValueError(f"metrics_profile must be one of {', '.join(CloudWatchAgentConfig.METRICS_PROFILES.keys())}")
+        if metrics_collection_interval is not None and metrics_collection_interval < CloudWatchAgentConfig.MIN_COLLECTION_INTERVAL:
+            raise ValueError(f"metrics_collection_interval must be at least {CloudWatchAgentConfig.MIN_COLLECTION_INTERVAL} seconds")
+        self.metrics_profile = metrics_profile
+        self.metrics_collection_interval = metrics_collection_interval or CloudWatchAgentConfig.METRICS_PROFILES[metrics_profile]["interval"]
+        self.procstat_patterns = procstat_patterns
+
+    @property
+    def plugins(self):
+        plugins = CloudWatchAgentConfig.METRICS_PROFILES[self.metrics_profile]["plugins"]
+        # procstat needs a process selector for every entry
+        if not self.procstat_patterns:
+            plugins = [ plugin for plugin in plugins if plugin != "procstat" ]
+        return plugins
+
+    def metrics_collected(self):
+        metrics_collected = {}
+        for plugin in self.plugins:
+            if plugin == "procstat":
+                metrics_collected[plugin] = [
+                    {
+                        "pattern": pattern,
+                        "measurement": CloudWatchAgentConfig.PLUGIN_MEASUREMENTS[plugin],
+                        "metrics_collection_interval": self.metrics_collection_interval
+                    } for pattern in self.procstat_patterns
+                ]
+            else:
+                metrics_collected[plugin] = {
+                    "measurement": CloudWatchAgentConfig.PLUGIN_MEASUREMENTS[plugin],
+                    "metrics_collection_interval": self.metrics_collection_interval
+                }
+                if plugin == "diskio":
+                    metrics_collected[plugin]["resources"] = [ "*" ]
+        return metrics_collected
+
+    # user data appending the profile metrics to the agent config baked into the AMI
+    def metrics_profile_script(self):
+        if not self.plugins:
+            return ""
+        config_path = f"{CloudWatchAgentConfig.AGENT_ETC_PATH}/asg-metrics-profile.json"
+        config = json.dumps({ "metrics": { "metrics_collected": self.metrics_collected() } }, sort_keys=True)
+        return "\n".join([
+            "",
+            f'echo "$(date): Applying {self.metrics_profile} CloudWatch agent metrics profile"',
+            f"cat <<'EOF' > {config_path}",
+            config,
+            "EOF",
+            f"/opt/aws/amazon-cloudwatch-agent/bin/amazon-cloudwatch-agent-ctl -a append-config -m ec2 -s -c file:{config_path}",
+            ""
+        ])
+
+    # full agent config replacing the one baked into the AMI; log files are dicts with a
+    # file_path, a log_group of app or system and an optional log_stream_name,
+    # multi_line_start_pattern and timestamp_format
+    def config(self, app_log_group_name, system_log_group_name, log_files: 'list[dict]' = [], emf: bool = False):
+        log_group_names = { "app": app_log_group_name, "system": system_log_group_name }
+        collect_list = []
+        for log_file in CloudWatchAgentConfig.DEFAULT_SYSTEM_LOG_FILES + log_files:
+            log_group = log_file.get("log_group", "app")
+            if log_group not in CloudWatchAgentConfig.LOG_GROUPS:
+                raise ValueError(f"log_group for {log_file['file_path']} must be one of {', '.join(CloudWatchAgentConfig.LOG_GROUPS)}")
+            entry = {
+                "file_path": log_file["file_path"],
+                "log_group_name": log_group_names[log_group],
+                "log_stream_name": log_file.get("log_stream_name", "{instance_id}" + log_file["file_path"])
+            }
+            for key in [ "multi_line_start_pattern", "timestamp_format" ]:
+                if key in log_file:
+                    entry[key] = log_file[key]
+            collect_list.append(entry)
+        logs_collected = { "files": { "collect_list": collect_list } }
+        if emf:
+            logs_collected["emf"] = {}
+
+        metrics_collected = {
+            # disk_used_percent rolled up by AutoScalingGroupName, fstype and path backs the Asg disk alarms
+            "disk": {
+                "drop_device": True,
+                "ignore_file_system_types": [ "devtmpfs", "overlay", "squashfs", "sysfs", "tmpfs" ],
+                "measurement": [ "used_percent" ],
+                "metrics_collection_interval": self.metrics_collection_interval,
+                "resources": [ "*" ]
+            }
+        }
+        metrics_collected.update(self.metrics_collected())
+        return {
+            "agent": {
+                "logfile": CloudWatchAgentConfig.AGENT_LOG_FILE,
+                "metrics_collection_interval": self.metrics_collection_interval,
+                "run_as_user": "root"
+            },
+            "logs": {
+                "logs_collected": logs_collected
+            },
+            "metrics": {
+                "aggregation_dimensions": [
+                    [ "AutoScalingGroupName" ],
+                    [ "AutoScalingGroupName", "fstype", "path" ],
+                    [ "AutoScalingGroupName", "name" ]
+                ],
+                "append_dimensions": {
+                    "AutoScalingGroupName": "${aws:AutoScalingGroupName}",
+                    "InstanceId": "${aws:InstanceId}",
+                    "InstanceType": "${aws:InstanceType}"
+                },
+                "metrics_collected": metrics_collected,
+                "namespace": "CWAgent"
+            }
+        }
@@ -0,0 +1,106 @@
+import base64
+import gzip
+import re
+
+class CompressedUserData:
+
+    BOUNDARY = "==ASG_USER_DATA_BOUNDARY=="
+    DIRECTORY = "/var/lib/cloud/asg-user-data"
+    # EC2 limit on the user data size before base64 encoding
+    MAX_SIZE = 16384
+    # Fn::Sub values are only known at deploy time, assume this many bytes per value
+    VARIABLE_SIZE_ESTIMATE = 128
+    VARIABLE_PATTERN = re.compile(r"\$\{([^!}][^}]*)\}")
+
+    # the gzip part has to run the same script Fn::Sub would have produced, so it
+    # carries the template and renders it with the values written by the variables part
+    RENDER_SCRIPT = """#!/bin/bash
+mkdir -p {directory}
+chmod 700 {directory}
+cat <<'ASG_USER_DATA_TEMPLATE' > {directory}/template
+{template}
+ASG_USER_DATA_TEMPLATE
+python3 - <<'EOF'
+import re
+def resolve(match):
+    if match.group(1):
+        return "${{" + match.group(2) + "}}"
+    with open("{directory}/variables/" + match.group(2)) as f:
+        return f.read()[:-1]
+with open("{directory}/template") as f:
+    contents = re.sub(r"\\$\\{{(!?)([^}}]*)\\}}", resolve, f.read())
+with open("{directory}/user-data", "w") as f:
+    f.write(contents)
+EOF
+exec bash {directory}/user-data
+"""
+
+    def __init__(self, parts: 'list[tuple[str, str]]'):
+        self.parts = parts
+        self.template = "".join(contents for name, contents in parts)
+        self.variable_names = sorted(set(CompressedUserData.VARIABLE_PATTERN.findall(self.template)))
+
+    @staticmethod
+    def _compress(contents):
+        # fixed mtime keeps synth output stable
+        return gzip.compress(contents.encode("utf-8"), compresslevel=9, mtime=0)
+
+    def variables_script(self):
+        lines = [
+            "#!/bin/bash",
+            f"mkdir -p {CompressedUserData.DIRECTORY}/variables",
+            f"chmod 700 {CompressedUserData.DIRECTORY}"
+        ]
+        for name in self.variable_names:
+            lines += [
+                f"cat <<'ASG_USER_DATA_VARIABLE' > \"{CompressedUserData.DIRECTORY}/variables/{name}\"",
+                "${" + name + "}",
+                "ASG_USER_DATA_VARIABLE"
+            ]
+        return "\n".join(lines) + "\n"
+
+    def render_script(self):
+        return CompressedUserData.RENDER_SCRIPT.format(directory=CompressedUserData.DIRECTORY, template=self.template)
+
+    # MIME multipart document to pass to Fn::Sub, only the variables part is substituted
+    def contents(self):
+        compressed = base64.encodebytes(CompressedUserData._compress(self.render_script())).decode("ascii")
+        return "\n".join([
+            f'Content-Type: multipart/mixed; boundary="{CompressedUserData.BOUNDARY}"',
+            "MIME-Version: 1.0",
+            "",
+            f"--{CompressedUserData.BOUNDARY}",
+            'Content-Type: text/x-shellscript; charset="us-ascii"',
+            "MIME-Version: 1.0",
+            'Content-Disposition: attachment; filename="00-user-data-variables.sh"',
+            "",
+            self.variables_script(),
+            f"--{CompressedUserData.BOUNDARY}",
+            "Content-Type: application/x-gzip",
+            "MIME-Version: 1.0",
+            "Content-Transfer-Encoding: base64",
+            'Content-Disposition: attachment; filename="01-user-data.sh"',
+            "",
+            compressed,
+            f"--{CompressedUserData.BOUNDARY}--",
+            ""
+        ])
+
+    def size_estimate(self):
+        substituted = sum(len("${" + name + "}") for name in self.variable_names)
+        return len(self.contents()) - substituted + len(self.variable_names) * CompressedUserData.VARIABLE_SIZE_ESTIMATE
+
+    def check_size(self):
+        size = self.size_estimate()
+        if size <= CompressedUserData.MAX_SIZE:
+            return
+        breakdown = [
+            f"  variables: {len(self.variable_names)} values at {CompressedUserData.VARIABLE_SIZE_ESTIMATE} bytes each"
+        ]
+        for name, contents in self.parts:
+            compressed_size = len(base64.encodebytes(CompressedUserData._compress(contents)))
+            breakdown.append(f"  {name}: {len(contents)} bytes, {compressed_size} bytes compressed and base64 encoded")
+        raise ValueError(
+            f"Compressed user data is an estimated {size} bytes, over the {CompressedUserData.MAX_SIZE} byte limit:\n" +
+            "\n".join(breakdown)
+        )
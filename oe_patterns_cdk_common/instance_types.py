@@ -0,0 +1,367 @@
+import re
+
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class InstanceType:
+    name: str
+    family: str
+    generation: int
+    architecture: str
+    vcpu: int
+    memory_gib: float
+    network_gbps: float
+    local_nvme_gb: int
+    burstable: bool
+    current_generation: bool
+    services: frozenset
+
+class InstanceTypes:
+
+    ARM64 = "arm64"
+    X86_64 = "x86_64"
+
+    PREVIOUS_GENERATION_FAMILIES = [ "m4", "r4", "t2" ]
+
+    SERVICE_NAME_FORMATS = {
+        "ec2": "{}",
+        "elasticache": "cache.{}",
+        "opensearch": "{}.search",
+        "rds": "db.{}"
+    }
+
+    # name, vCPUs, memory (GiB), peak network bandwidth (Gbps), local NVMe storage (GB), services offering the type
+    CATALOG = [
+    ("t2.nano", 1, 0.5, 1, 0, "ec2"),
+    ("t2.micro", 1, 1, 1, 0, "ec2"),
+    ("t2.small", 1, 2, 1, 0, "ec2"),
+    ("t2.medium", 2, 4, 1, 0, "ec2"),
+    ("t2.large", 2, 8, 1, 0, "ec2"),
+    ("t2.xlarge", 4, 16, 1, 0, "ec2"),
+    ("t2.2xlarge", 8, 32, 1, 0, "ec2"),
+    ("t3.nano", 2, 0.5, 5, 0, "ec2"),
+    ("t3.micro", 2, 1, 5, 0, "ec2 elasticache"),
+    ("t3.small", 2, 2, 5, 0, "ec2 elasticache opensearch"),
+    ("t3.medium", 2, 4, 5, 0, "ec2 rds elasticache opensearch"),
+    ("t3.large", 2, 8, 5, 0, "ec2 rds"),
+    ("t3.xlarge", 4, 16, 5, 0, "ec2"),
+    ("t3.2xlarge", 8, 32, 5, 0, "ec2"),
+    ("t4g.nano", 2, 0.5, 5, 0, "ec2"),
+    ("t4g.micro", 2, 1, 5, 0, "ec2 elasticache"),
+    ("t4g.small", 2, 2, 5, 0, "ec2 elasticache"),
+    ("t4g.medium", 2, 4, 5, 0, "ec2 rds elasticache"),
+    ("t4g.large", 2, 8, 5, 0, "ec2 rds"),
+    ("t4g.xlarge", 4, 16, 5, 0, "ec2"),
+    ("t4g.2xlarge", 8, 32, 5, 0, "ec2"),
+    ("a1.medium", 1, 2, 10, 0, "ec2"),
+    ("a1.large", 2, 4, 10, 0, "ec2"),
+    ("a1.xlarge", 4, 8, 10, 0, "ec2"),
+    ("a1.2xlarge", 8, 16, 10, 0, "ec2"),
+    ("a1.4xlarge", 16, 32, 10, 0, "ec2"),
+    ("a1.metal", 16, 32, 10, 0, "ec2"),
+    ("m4.large", 2, 8, 0.45, 0, "ec2 elasticache"),
+    ("m4.xlarge", 4, 16, 0.75, 0, "ec2 elasticache"),
+    ("m4.2xlarge", 8, 32, 1, 0, "ec2 elasticache"),
+    ("m4.4xlarge", 16, 64, 2, 0, "ec2 elasticache"),
+    ("m4.10xlarge", 40, 160, 10, 0, "ec2 elasticache"),
+    ("m4.16xlarge", 64, 256, 25, 0, "ec2"),
+    ("r4.large", 2, 15.25, 10, 0, "ec2 elasticache"),
+    ("r4.xlarge", 4, 30.5, 10, 0, "ec2 elasticache"),
+    ("r4.2xlarge", 8, 61, 10, 0, "ec2 elasticache"),
+    ("r4.4xlarge", 16, 122, 10, 0, "ec2 elasticache"),
+    ("r4.8xlarge", 32, 244, 10, 0, "ec2 elasticache"),
+    ("r4.16xlarge", 64, 488, 25, 0, "ec2 elasticache"),
+    ("i3.large", 2, 15.25, 10, 475, "ec2 opensearch"),
+    ("i3.xlarge", 4, 30.5, 10, 950, "ec2 opensearch"),
+    ("i3.2xlarge", 8, 61, 10, 1900, "ec2 opensearch"),
+    ("i3.4xlarge", 16, 122, 10, 3800, "ec2 opensearch"),
+    ("i3.8xlarge", 32, 244, 10, 7600, "ec2 opensearch"),
+    ("i3.16xlarge", 64, 488, 25, 15200, "ec2 opensearch"),
+    ("c5.large", 2, 4, 10, 0, "ec2 opensearch"),
+    ("c5.xlarge", 4, 8, 10, 0, "ec2 opensearch"),
+    ("c5.2xlarge", 8, 16, 10, 0, "ec2 opensearch"),
+    ("c5.4xlarge", 16, 32, 10, 0, "ec2 opensearch"),
+    ("c5.9xlarge", 36, 72, 12, 0, "ec2 opensearch"),
+    ("c5.12xlarge", 48, 96, 12, 0, "ec2"),
+    ("c5.18xlarge", 72, 144, 25, 0, "ec2 opensearch"),
+    ("c5.24xlarge", 96, 192, 25, 0, "ec2"),
+    ("c5.metal", 96, 192, 25, 0, "ec2"),
+    ("c5d.large", 2, 4, 10, 50, "ec2"),
+    ("c5d.xlarge", 4, 8, 10, 100, "ec2"),
+    ("c5d.2xlarge", 8, 16, 10, 200, "ec2"),
+    ("c5d.4xlarge", 16, 32, 10, 400, "ec2"),
+    ("c5d.9xlarge", 36, 72, 12, 900, "ec2"),
+    ("c5d.12xlarge", 48, 96, 12, 1800, "ec2"),
+    ("c5d.18xlarge", 72, 144, 25, 1800, "ec2"),
+    ("c5d.24xlarge", 96, 192, 25, 3600, "ec2"),
+    ("c5d.metal", 96, 192, 25, 3600, "ec2"),
+    ("m5.large", 2, 8, 10, 0, "ec2 elasticache opensearch"),
+    ("m5.xlarge", 4, 16, 10, 0, "ec2 elasticache opensearch"),
+    ("m5.2xlarge", 8, 32, 10, 0, "ec2 elasticache opensearch"),
+    ("m5.4xlarge", 16, 64, 10, 0, "ec2 elasticache opensearch"),
+    ("m5.8xlarge", 32, 128, 10, 0, "ec2"),
+    ("m5.12xlarge", 48, 192, 12, 0, "ec2 elasticache opensearch"),
+    ("m5.16xlarge", 64, 256, 20, 0, "ec2"),
+    ("m5.24xlarge", 96, 384, 25, 0, "ec2 elasticache"),
+    ("m5.metal", 96, 384, 25, 0, "ec2"),
+    ("m5d.large", 2, 8, 10, 75, "ec2"),
+    ("m5d.xlarge", 4, 16, 10, 150, "ec2"),
+    ("m5d.2xlarge", 8, 32, 10, 300, "ec2"),
+    ("m5d.4xlarge", 16, 64, 10, 600, "ec2"),
+    ("m5d.8xlarge", 32, 128, 10, 1200, "ec2"),
+    ("m5d.12xlarge", 48, 192, 12, 1800, "ec2"),
+    ("m5d.16xlarge", 64, 256, 20, 2400, "ec2"),
+    ("m5d.24xlarge", 96, 384, 25, 3600, "ec2"),
+    ("m5d.metal", 96, 384, 25, 3600, "ec2"),
+    ("r5.large", 2, 16, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r5.xlarge", 4, 32, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r5.2xlarge", 8, 64, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r5.4xlarge", 16, 128, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r5.8xlarge", 32, 256, 10, 0, "ec2 rds"),
+    ("r5.12xlarge", 48, 384, 12, 0, "ec2 rds elasticache opensearch"),
+    ("r5.16xlarge", 64, 512, 20, 0, "ec2 rds"),
+    ("r5.24xlarge", 96, 768, 25, 0, "ec2 rds elasticache"),
+    ("r5.metal", 96, 768, 25, 0, "ec2"),
+    ("r5d.large", 2, 16, 10, 75, "ec2"),
+    ("r5d.xlarge", 4, 32, 10, 150, "ec2"),
+    ("r5d.2xlarge", 8, 64, 10, 300, "ec2"),
+    ("r5d.4xlarge", 16, 128, 10, 600, "ec2"),
+    ("r5d.8xlarge", 32, 256, 10, 1200, "ec2"),
+    ("r5d.12xlarge", 48, 384, 12, 1800, "ec2"),
+    ("r5d.16xlarge", 64, 512, 20, 2400, "ec2"),
+    ("r5d.24xlarge", 96, 768, 25, 3600, "ec2"),
+    ("r5d.metal", 96, 768, 25, 3600, "ec2"),
+    ("r6i.large", 2, 16, 12.5, 0, "ec2 rds"),
+    ("r6i.xlarge", 4, 32, 12.5, 0, "ec2 rds"),
+    ("r6i.2xlarge", 8, 64, 12.5, 0, "ec2 rds"),
+    ("r6i.4xlarge", 16, 128, 12.5, 0, "ec2 rds"),
+    ("r6i.8xlarge", 32, 256, 12.5, 0, "ec2 rds"),
+    ("r6i.12xlarge", 48, 384, 18.75, 0, "ec2 rds"),
+    ("r6i.16xlarge", 64, 512, 25, 0, "ec2 rds"),
+    ("r6i.24xlarge", 96, 768, 37.5, 0, "ec2 rds"),
+    ("r6i.32xlarge", 128, 1024, 50, 0, "ec2 rds"),
+    ("c6g.medium", 1, 2, 10, 0, "ec2"),
+    ("c6g.large", 2, 4, 10, 0, "ec2 opensearch"),
+    ("c6g.xlarge", 4, 8, 10, 0, "ec2 opensearch"),
+    ("c6g.2xlarge", 8, 16, 10, 0, "ec2 opensearch"),
+    ("c6g.4xlarge", 16, 32, 10, 0, "ec2 opensearch"),
+    ("c6g.8xlarge", 32, 64, 12, 0, "ec2 opensearch"),
+    ("c6g.12xlarge", 48, 96, 20, 0, "ec2 opensearch"),
+    ("c6g.16xlarge", 64, 128, 25, 0, "ec2"),
+    ("c6g.metal", 64, 128, 25, 0, "ec2"),
+    ("m6g.medium", 1, 4, 10, 0, "ec2"),
+    ("m6g.large", 2, 8, 10, 0, "ec2 elasticache opensearch"),
+    ("m6g.xlarge", 4, 16, 10, 0, "ec2 elasticache opensearch"),
+    ("m6g.2xlarge", 8, 32, 10, 0, "ec2 elasticache opensearch"),
+    ("m6g.4xlarge", 16, 64, 10, 0, "ec2 elasticache opensearch"),
+    ("m6g.8xlarge", 32, 128, 12, 0, "ec2 elasticache opensearch"),
+    ("m6g.12xlarge", 48, 192, 20, 0, "ec2 elasticache opensearch"),
+    ("m6g.16xlarge", 64, 256, 25, 0, "ec2 elasticache"),
+    ("m6g.metal", 64, 256, 25, 0, "ec2"),
+    ("r6g.medium", 1, 8, 10, 0, "ec2"),
+    ("r6g.large", 2, 16, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r6g.xlarge", 4, 32, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r6g.2xlarge", 8, 64, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r6g.4xlarge", 16, 128, 10, 0, "ec2 rds elasticache opensearch"),
+    ("r6g.8xlarge", 32, 256, 12, 0, "ec2 rds elasticache opensearch"),
+    ("r6g.12xlarge", 48, 384, 20, 0, "ec2 rds elasticache opensearch"),
+    ("r6g.16xlarge", 64, 512, 25, 0, "ec2 rds elasticache"),
+    ("r6g.metal", 64, 512, 25, 0, "ec2"),
+    ("r6gd.medium", 1, 8, 10, 59, "ec2"),
+    ("r6gd.large", 2, 16, 10, 118, "ec2 opensearch"),
+    ("r6gd.xlarge", 4, 32, 10, 237, "ec2 opensearch"),
+    ("r6gd.2xlarge", 8, 64, 10, 474, "ec2 opensearch"),
+    ("r6gd.4xlarge", 16, 128, 10, 950, "ec2 opensearch"),
+    ("r6gd.8xlarge", 32, 256, 12, 1900, "ec2 opensearch"),
+    ("r6gd.12xlarge", 48, 384, 20, 2850, "ec2 opensearch"),
+    ("r6gd.16xlarge", 64, 512, 25, 3800, "ec2 opensearch"),
+    ("r6gd.metal", 64, 512, 25, 3800, "ec2"),
+    ("x2g.medium", 1, 16, 10, 0, "ec2"),
+    ("x2g.large", 2, 32, 10, 0, "ec2 rds"),
+    ("x2g.xlarge", 4, 64, 10, 0, "ec2 rds"),
+    ("x2g.2xlarge", 8, 128, 10, 0, "ec2 rds"),
+    ("x2g.4xlarge", 16, 256, 10, 0, "ec2 rds"),
+    ("x2g.8xlarge", 32, 512, 12, 0, "ec2 rds"),
+    ("x2g.12xlarge", 48, 768, 20, 0, "ec2 rds"),
+    ("x2g.16xlarge", 64, 1024, 25, 0, "ec2 rds"),
+    ("x2g.metal", 64, 1024, 25, 0, "ec2"),
+    ("c7g.medium", 1, 2, 12.5, 0, "ec2"),
+    ("c7g.large", 2, 4, 12.5, 0, "ec2"),
+    ("c7g.xlarge", 4, 8, 12.5, 0, "ec2"),
+    ("c7g.2xlarge", 8, 16, 12.5, 0, "ec2"),
+    ("c7g.4xlarge", 16, 32, 12.5, 0, "ec2"),
+    ("c7g.8xlarge", 32, 64, 15, 0, "ec2"),
+    ("c7g.12xlarge", 48, 96, 22.5, 0, "ec2"),
+    ("c7g.16xlarge", 64, 128, 30, 0, "ec2"),
+    ("c7g.metal", 64, 128, 30, 0, "ec2"),
+    ("m7g.medium", 1, 4, 12.5, 0, "ec2"),
+    ("m7g.large", 2, 8, 12.5, 0, "ec2"),
+    ("m7g.xlarge", 4, 16, 12.5, 0, "ec2"),
+    ("m7g.2xlarge", 8, 32, 12.5, 0, "ec2"),
+    ("m7g.4xlarge", 16, 64, 12.5, 0, "ec2"),
+    ("m7g.8xlarge", 32, 128, 15, 0, "ec2"),
+    ("m7g.12xlarge", 48, 192, 22.5, 0, "ec2"),
+    ("m7g.16xlarge", 64, 256, 30, 0, "ec2"),
+    ("m7g.metal", 64, 256, 30, 0, "ec2"),
+    ("r7g.medium", 1, 8, 12.5, 0, "ec2"),
+    ("r7g.large", 2, 16, 12.5, 0, "ec2"),
+    ("r7g.xlarge", 4, 32, 12.5, 0, "ec2"),
+    ("r7g.2xlarge", 8, 64, 12.5, 0, "ec2"),
+    ("r7g.4xlarge", 16, 128, 12.5, 0, "ec2"),
+    ("r7g.8xlarge", 32, 256, 15, 0, "ec2"),
+    ("r7g.12xlarge", 48, 384, 22.5, 0, "ec2"),
+    ("r7g.16xlarge", 64, 512, 30, 0, "ec2"),
+    ("r7g.metal", 64, 512, 30, 0, "ec2"),
+    ("c7i.large", 2, 4, 12.5, 0, "ec2"),
+    ("c7i.xlarge", 4, 8, 12.5, 0, "ec2"),
+    ("c7i.2xlarge", 8, 16, 12.5, 0, "ec2"),
+    ("c7i.4xlarge", 16, 32, 12.5, 0, "ec2"),
+    ("c7i.8xlarge", 32, 64, 12.5, 0, "ec2"),
+    ("c7i.12xlarge", 48, 96, 18.75, 0, "ec2"),
+    ("c7i.16xlarge", 64, 128, 25, 0, "ec2"),
+    ("c7i.24xlarge", 96, 192, 37.5, 0, "ec2"),
+    ("c7i.48xlarge", 192, 384, 50, 0, "ec2"),
+    ("m7i.large", 2, 8, 12.5, 0, "ec2"),
+    ("m7i.xlarge", 4, 16, 12.5, 0, "ec2"),
+    ("m7i.2xlarge", 8, 32, 12.5, 0, "ec2"),
+    ("m7i.4xlarge", 16, 64, 12.5, 0, "ec2"),
+    ("m7i.8xlarge", 32, 128, 12.5, 0, "ec2"),
+    ("m7i.12xlarge", 48, 192, 18.75, 0, "ec2"),
+    ("m7i.16xlarge", 64, 256, 25, 0, "ec2"),
+    ("m7i.24xlarge", 96, 384, 37.5, 0, "ec2"),
+    ("m7i.48xlarge", 192, 768, 50, 0, "ec2"),
+    ("r7i.large", 2, 16, 12.5, 0, "ec2"),
+    ("r7i.xlarge", 4, 32, 12.5, 0, "ec2"),
+    ("r7i.2xlarge", 8, 64, 12.5, 0, "ec2"),
+    ("r7i.4xlarge", 16, 128, 12.5, 0, "ec2"),
+    ("r7i.8xlarge", 32, 256, 12.5, 0, "ec2"),
+    ("r7i.12xlarge", 48, 384, 18.75, 0, "ec2"),
+    ("r7i.16xlarge", 64, 512, 25, 0, "ec2"),
+    ("r7i.24xlarge", 96, 768, 37.5, 0, "ec2"),
+    ("r7i.48xlarge", 192, 1536, 50, 0, "ec2"),
+    ("c8g.medium", 1, 2, 12.5, 0, "ec2"),
+    ("c8g.large", 2, 4, 12.5, 0, "ec2"),
+    ("c8g.xlarge", 4, 8, 12.5, 0, "ec2"),
+    ("c8g.2xlarge", 8, 16, 15, 0, "ec2"),
+    ("c8g.4xlarge", 16, 32, 15, 0, "ec2"),
+    ("c8g.8xlarge", 32, 64, 15, 0, "ec2"),
+    ("c8g.12xlarge", 48, 96, 22.5, 0, "ec2"),
+    ("c8g.16xlarge", 64, 128, 30, 0, "ec2"),
+    ("c8g.24xlarge", 96, 192, 40, 0, "ec2"),
+    ("c8g.48xlarge", 192, 384, 50, 0, "ec2"),
+    ("m8g.medium", 1, 4, 12.5, 0, "ec2"),
+    ("m8g.large", 2, 8, 12.5, 0, "ec2"),
+    ("m8g.xlarge", 4, 16, 12.5, 0, "ec2"),
+    ("m8g.2xlarge", 8, 32, 15, 0, "ec2"),
+    ("m8g.4xlarge", 16, 64, 15, 0, "ec2"),
+    ("m8g.8xlarge", 32, 128, 15, 0, "ec2"),
+    ("m8g.12xlarge", 48, 192, 22.5, 0, "ec2"),
+    ("m8g.16xlarge", 64, 256, 30, 0, "ec2"),
+    ("m8g.24xlarge", 96, 384, 40, 0, "ec2"),
+    ("m8g.48xlarge", 192, 768, 50, 0, "ec2"),
+    ("r8g.medium", 1, 8, 12.5, 0, "ec2"),
+    ("r8g.large", 2, 16, 12.5, 0, "ec2"),
+    ("r8g.xlarge", 4, 32, 12.5, 0, "ec2"),
+    ("r8g.2xlarge", 8, 64, 15, 0, "ec2"),
+    ("r8g.4xlarge", 16, 128, 15, 0, "ec2"),
+    ("r8g.8xlarge", 32, 256, 15, 0, "ec2"),
+    ("r8g.12xlarge", 48, 384, 22.5, 0, "ec2"),
+    ("r8g.16xlarge", 64, 512, 30, 0, "ec2"),
+    ("r8g.24xlarge", 96, 768, 40, 0, "ec2"),
+    ("r8g.48xlarge", 192, 1536, 50, 0, "ec2"),
+    ]
+
+    _by_name = {}
+    _by_family = {}
+    _by_service = {}
+
+    @staticmethod
+    def _parse(name, vcpu, memory_gib, network_gbps, local_nvme_gb, services):
+        family = name.split(".")[0]
+        prefix, generation, attributes = re.match(r"^([a-z]+)(\d+)([a-z]*)$", family).groups()
+        return InstanceType(
+            name=name,
+            family=family,
+            generation=int(generation),
+            architecture=InstanceTypes.ARM64 if "g" in attributes or family == "a1" else InstanceTypes.X86_64,
+            vcpu=vcpu,
+            memory_gib=memory_gib,
+            network_gbps=network_gbps,
+            local_nvme_gb=local_nvme_gb,
+            burstable=prefix == "t",
+            current_generation=family not in InstanceTypes.PREVIOUS_GENERATION_FAMILIES,
+            services=frozenset(services.split())
+        )
+
+    @staticmethod
+    def _index():
+        if not InstanceTypes._by_name:
+            for row in InstanceTypes.CATALOG:
+                instance_type = InstanceTypes._parse(*row)
+                InstanceTypes._by_name[instance_type.name] = instance_type
+                InstanceTypes._by_family.setdefault(instance_type.family, []).append(instance_type)
+                for service in instance_type.services:
+                    InstanceTypes._by_service.setdefault(service, []).append(instance_type)
+
+    @staticmethod
+    def get(name):
+        InstanceTypes._index()
+        for service, name_format in InstanceTypes.SERVICE_NAME_FORMATS.items():
+            prefix, suffix = name_format.split("{}")
+            if service != "ec2" and name.startswith(prefix) and name.endswith(suffix):
+                name = name[len(prefix):len(name) - len(suffix)]
+                break
+        return InstanceTypes._by_name.get(name)
+
+    # returns instance type names formatted for the service, ordered by families if given, then by size
+    @staticmethod
+    def query(
+            service: str = "ec2",
+            architecture: str = None,
+            burstable: bool = None,
+            current_generation: bool = None,
+            families: 'list[str]' = None,
+            local_nvme: bool = None,
+            max_memory_gib: float = None,
+            max_vcpu: int = None,
+            metal: bool = None,
+            min_generation: int = None,
+            min_memory_gib: float = None,
+            min_network_gbps: float = None,
+            min_vcpu: int = None):
+        InstanceTypes._index()
+        if families is not None:
+            candidates = [
+                instance_type
+                for family in families
+                for instance_type in InstanceTypes._by_family.get(family, [])
+                if service in instance_type.services
+            ]
+        else:
+            candidates = InstanceTypes._by_service.get(service, [])
+        results = []
+        for instance_type in candidates:
+            if architecture is not None and instance_type.architecture != architecture:
+                continue
+            if burstable is not None and instance_type.burstable != burstable:
+                continue
+            if current_generation is not None and instance_type.current_generation != current_generation:
+                continue
+            if local_nvme is not None and (instance_type.local_nvme_gb > 0) != local_nvme:
+                continue
+            if max_memory_gib is not None and instance_type.memory_gib > max_memory_gib:
+                continue
+            if max_vcpu is not None and instance_type.vcpu > max_vcpu:
+                continue
+            if metal is not None and instance_type.name.endswith(".metal") != metal:
+                continue
+            if min_generation is not None and instance_type.generation < min_generation:
+                continue
+            if min_memory_gib is not None and instance_type.memory_gib < min_memory_gib:
+                continue
+            if min_network_gbps is not None and instance_type.network_gbps < min_network_gbps:
+                continue
+            if min_vcpu is not None and instance_type.vcpu < min_vcpu:
+                continue
+            results.append(InstanceTypes.SERVICE_NAME_FORMATS[service].format(instance_type.name))
+        return results
@@ -0,0 +1,64 @@
+import boto3
+import cfnresponse
+import json
+import time
+import traceback
+
+client = boto3.client("ec2")
+
+# optimizing takes about an hour per TiB, longer waits give up and let the volume hydrate lazily
+MAX_WAIT_SECONDS = 3300
+
+def fast_snapshot_restore_state(snapshot_id, availability_zone):
+    response = client.describe_fast_snapshot_restores(
+        Filters=[
+            {"Name": "snapshot-id", "Values": [snapshot_id]},
+            {"Name": "availability-zone", "Values": [availability_zone]}
+        ]
+    )
+    states = [item["State"] for item in response["FastSnapshotRestores"]]
+    return states[0] if states else "disabled"
+
+def enable(event, context, snapshot_id, availability_zone):
+    if "wait_started" not in event:
+        print(f"Enabling fast snapshot restore for {snapshot_id} in {availability_zone}")
+        client.enable_fast_snapshot_restores(AvailabilityZones=[availability_zone], SourceSnapshotIds=[snapshot_id])
+        event["wait_started"] = int(time.time())
+    while True:
+        state = fast_snapshot_restore_state(snapshot_id, availability_zone)
+        print(f"Fast snapshot restore state: {state}")
+        if state == "enabled":
+            return True
+        if time.time() - event["wait_started"] > MAX_WAIT_SECONDS:
+            print("Timed out waiting for fast snapshot restore, the volume is created with lazy loading")
+            return True
+        if context.get_remaining_time_in_millis() < 60000:
+            # continue waiting in a new invocation, the response is sent once enabled
+            boto3.client("lambda").invoke(
+                FunctionName=context.function_name,
+                InvocationType="Event",
+                Payload=json.dumps(event)
+            )
+            return False
+        time.sleep(30)
+
+def disable(snapshot_id, availability_zone):
+    if fast_snapshot_restore_state(snapshot_id, availability_zone) != "disabled":
+        print(f"Disabling fast snapshot restore for {snapshot_id} in {availability_zone}")
+        client.disable_fast_snapshot_restores(AvailabilityZones=[availability_zone], SourceSnapshotIds=[snapshot_id])
+
+def handler(event, context):
+    try:
+        print(event)
+        props = event["ResourceProperties"]
+        snapshot_id = props["snapshot_id"]
+        availability_zone = props["availability_zone"]
+        if snapshot_id:
+            if event["RequestType"] == "Delete" or props["action"] == "disable":
+                disable(snapshot_id, availability_zone)
+            elif not enable(event, context, snapshot_id, availability_zone):
+                return
+        cfnresponse.send(event, context, cfnresponse.SUCCESS, {}, f"{props['action']}-{availability_zone}-{snapshot_id}")
+    except Exception:
+        cfnresponse.send(event, context, cfnresponse.FAILED, {})
+        traceback.print_exc()
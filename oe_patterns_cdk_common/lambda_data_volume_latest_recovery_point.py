@@ -0,0 +1,52 @@
+import boto3
+import cfnresponse
+import traceback
+
+client = boto3.client("backup")
+
+def latest_recovery_point(backup_vault_name, volume_name):
+    recovery_points = []
+    paginator = client.get_paginator("list_recovery_points_by_backup_vault")
+    for page in paginator.paginate(BackupVaultName=backup_vault_name, ByResourceType="EBS"):
+        recovery_points += [item for item in page["RecoveryPoints"] if item["Status"] == "COMPLETED"]
+    recovery_points.sort(key=lambda item: item["CreationDate"], reverse=True)
+    # the vault may be shared, recovery points carry the tags of the backed up volume
+    for recovery_point in recovery_points:
+        tags = client.list_tags(ResourceArn=recovery_point["RecoveryPointArn"])["Tags"]
+        if tags.get("Name") == volume_name:
+            return recovery_point
+    return None
+
+def handler(event, context):
+    try:
+        print(event)
+        if event["RequestType"] == "Delete":
+            cfnresponse.send(event, context, cfnresponse.SUCCESS, {})
+            return
+        props = event["ResourceProperties"]
+        # the data volume is created from the recovered snapshot, clearing the recovery subnet
+        # would replace it with an empty volume, so the update fails before the volume changes
+        old_props = event.get("OldResourceProperties", {})
+        if event["RequestType"] == "Update" and old_props.get("recovery_subnet") and not props["recovery_subnet"]:
+            message = f"The recovery subnet can not be set back to empty once set, this would replace the recovered data volume {props['volume_name']} with an empty one. Set it to the subnet to run in, which recovers the data volume there again."
+            print(message)
+            cfnresponse.send(event, context, cfnresponse.FAILED, {}, physicalResourceId=event["PhysicalResourceId"], reason=message)
+            return
+        responseData = {"recovery_point_arn": "", "snapshot_id": ""}
+        if props["recovery_subnet"]:
+            recovery_point = latest_recovery_point(props["backup_vault_name"], props["volume_name"])
+            if recovery_point is None:
+                message = f"No completed recovery point for {props['volume_name']} in backup vault {props['backup_vault_name']}"
+                print(message)
+                cfnresponse.send(event, context, cfnresponse.FAILED, {}, reason=message)
+                return
+            # EBS recovery point ARNs are snapshot ARNs
+            responseData = {
+                "recovery_point_arn": recovery_point["RecoveryPointArn"],
+                "snapshot_id": recovery_point["RecoveryPointArn"].split("/")[-1]
+            }
+        print(responseData)
+        cfnresponse.send(event, context, cfnresponse.SUCCESS, responseData)
+    except Exception:
+        cfnresponse.send(event, context, cfnresponse.FAILED, {})
+        traceback.print_exc()
@@ -0,0 +1,112 @@
+import boto3
+import cfnresponse
+import json
+import time
+import traceback
+from botocore.exceptions import ClientError
+
+client = boto3.client("autoscaling")
+
+# a custom resource times out after an hour, longer refreshes keep running untracked
+MAX_WAIT_SECONDS = 3300
+FAILED_STATUSES = ["Failed", "Cancelled", "RollbackSuccessful", "RollbackFailed"]
+
+def start_instance_refresh(asg_name, preferences):
+    for attempt in range(12):
+        try:
+            return client.start_instance_refresh(
+                AutoScalingGroupName=asg_name,
+                Strategy="Rolling",
+                Preferences=preferences
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "InstanceRefreshInProgress":
+                raise e
+            # a newer launch template version supersedes the running refresh
+            if attempt == 0:
+                print(f"Cancelling instance refresh in progress for {asg_name}")
+                client.cancel_instance_refresh(AutoScalingGroupName=asg_name)
+            time.sleep(10)
+    raise Exception(f"Timed out waiting for the instance refresh in progress for {asg_name} to cancel")
+
+# the Auto Scaling API requires ascending checkpoints ending with 100
+def checkpoint_percentages(value):
+    checkpoints = [int(item) for item in value.split(",") if item.strip()]
+    if checkpoints and (checkpoints[-1] != 100 or checkpoints != sorted(set(checkpoints))):
+        raise ValueError(f"Checkpoint percentages {value} must be ascending and end with 100")
+    return checkpoints
+
+# returns None while the refresh is in progress, otherwise the custom resource status and reason
+def wait_for_instance_refresh(event, context):
+    props = event["ResourceProperties"]
+    while True:
+        response = client.describe_instance_refreshes(
+            AutoScalingGroupName=props["asg_name"],
+            InstanceRefreshIds=[event["instance_refresh_id"]]
+        )
+        refresh = response["InstanceRefreshes"][0]
+        print(f"Instance refresh {event['instance_refresh_id']}: {refresh['Status']} {refresh.get('PercentageComplete', 0)}%")
+        if refresh["Status"] == "Successful":
+            return cfnresponse.SUCCESS, None
+        if refresh["Status"] in FAILED_STATUSES:
+            return cfnresponse.FAILED, f"Instance refresh {event['instance_refresh_id']} {refresh['Status']}: {refresh.get('StatusReason', '')}"
+        if time.time() - event["wait_started"] > MAX_WAIT_SECONDS:
+            print("Stopped waiting for the instance refresh, it continues in the background")
+            return cfnresponse.SUCCESS, None
+        if context.get_remaining_time_in_millis() < 60000:
+            # continue waiting in a new invocation, the response is sent once the refresh ends
+            boto3.client("lambda").invoke(
+                FunctionName=context.function_name,
+                InvocationType="Event",
+                Payload=json.dumps(event)
+            )
+            return None
+        time.sleep(30)
+
+# the default physical id is the log stream name, which changes when the function re-invokes itself
+def physical_resource_id(event):
+    return event.get("PhysicalResourceId") or f"{event['ResourceProperties']['asg_name']}-instance-refresh"
+
+def handler(event, context):
+    try:
+        print(event)
+        physical_id = physical_resource_id(event)
+        if event["RequestType"] != "Update":
+            cfnresponse.send(event, context, cfnresponse.SUCCESS, {}, physicalResourceId=physical_id)
+            return
+        props     = event["ResourceProperties"]
+        old_props = event["OldResourceProperties"]
+        if "instance_refresh_id" not in event:
+            if props["launch_template_version"] == old_props["launch_template_version"]:
+                print("Launch template version unchanged, skipping instance refresh")
+                cfnresponse.send(event, context, cfnresponse.SUCCESS, {}, physicalResourceId=physical_id)
+                return
+
+            preferences = {
+                "CheckpointDelay": int(props["checkpoint_delay"]),
+                "InstanceWarmup": int(props["instance_warmup"]),
+                "MinHealthyPercentage": int(props["min_healthy_percentage"]),
+                "SkipMatching": props["skip_matching"] == "true"
+            }
+            checkpoints = checkpoint_percentages(props["checkpoint_percentages"])
+            if checkpoints:
+                preferences["CheckpointPercentages"] = checkpoints
+
+            response = start_instance_refresh(props["asg_name"], preferences)
+            event["instance_refresh_id"] = response["InstanceRefreshId"]
+            event["wait_started"] = int(time.time())
+
+        result = wait_for_instance_refresh(event, context)
+        if result is None:
+            return
+        status, reason = result
+        responseData = {"instance_refresh_id": event["instance_refresh_id"]}
+        print(responseData)
+        if reason:
+            print(reason)
+            cfnresponse.send(event, context, status, responseData, physicalResourceId=physical_id, reason=reason)
+        else:
+            cfnresponse.send(event, context, status, responseData, physicalResourceId=physical_id)
+    except Exception as e:
+        cfnresponse.send(event, context, cfnresponse.FAILED, {}, physicalResourceId=event.get("PhysicalResourceId"), reason=str(e))
+        traceback.print_exc()
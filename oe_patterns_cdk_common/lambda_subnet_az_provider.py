@@ -0,0 +1,25 @@
+import boto3
+import cfnresponse
+import traceback
+
+# created once per execution environment and reused across invocations
+client = boto3.client("ec2")
+
+def handler(event, context):
+    try:
+        print(event)
+        if event["RequestType"] == "Delete":
+            cfnresponse.send(event, context, cfnresponse.SUCCESS, {})
+            return
+        subnets = event["ResourceProperties"].get("subnets", {})
+        azs = {}
+        if subnets:
+            # every subnet is resolved in a single call
+            response = client.describe_subnets(SubnetIds=sorted(set(subnets.values())))
+            azs = {subnet["SubnetId"]: subnet["AvailabilityZone"] for subnet in response["Subnets"]}
+        responseData = {key: azs[subnet_id] for key, subnet_id in subnets.items()}
+        print(responseData)
+        cfnresponse.send(event, context, cfnresponse.SUCCESS, responseData)
+    except Exception:
+        cfnresponse.send(event, context, cfnresponse.FAILED, {})
+        traceback.print_exc()
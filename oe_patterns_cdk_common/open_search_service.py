@@ -11,6 +11,7 @@ from aws_cdk import (
 )
 
 from constructs import Construct
+from oe_patterns_cdk_common.instance_types import InstanceTypes
 from oe_patterns_cdk_common.vpc import Vpc
 
 class OpenSearchService(Construct):
@@ -29,57 +30,10 @@ class OpenSearchService(Construct):
         self.port = 80
 
         self.default_instance_type = default_instance_type
-        self.default_allowed_instance_types = [
-            "c5.large.search",
-            "c5.xlarge.search",
-            "c5.2xlarge.search",
-            "c5.4xlarge.search",
-            "c5.9xlarge.search",
-            "c5.18xlarge.search",
-            "c6g.large.search",
-            "c6g.xlarge.search",
-            "c6g.2xlarge.search",
-            "c6g.4xlarge.search",
-            "c6g.8xlarge.search",
-            "c6g.12xlarge.search",
-            "i3.large.search",
-            "i3.xlarge.search",
-            "i3.2xlarge.search",
-            "i3.4xlarge.search",
-            "i3.8xlarge.search",
-            "i3.16xlarge.search",
-            "m5.large.search",
-            "m5.xlarge.search",
-            "m5.2xlarge.search",
-            "m5.4xlarge.search",
-            "m5.12xlarge.search",
-            "m6g.large.search",
-            "m6g.xlarge.search",
-            "m6g.2xlarge.search",
-            "m6g.4xlarge.search",
-            "m6g.8xlarge.search",
-            "m6g.12xlarge.search",
-            "r5.large.search",
-            "r5.xlarge.search",
-            "r5.2xlarge.search",
-            "r5.4xlarge.search",
-            "r5.12xlarge.search",
-            "r6g.large.search",
-            "r6g.xlarge.search",
-            "r6g.2xlarge.search",
-            "r6g.4xlarge.search",
-            "r6g.8xlarge.search",
-            "r6g.12xlarge.search",
-            "r6gd.large.search",
-            "r6gd.xlarge.search",
-            "r6gd.2xlarge.search",
-            "r6gd.4xlarge.search",
-            "r6gd.8xlarge.search",
-            "r6gd.12xlarge.search",
-            "r6gd.16xlarge.search",
-            "t3.small.search",
-            "t3.medium.search"
-        ]
+        self.default_allowed_instance_types = InstanceTypes.query(
+            service="opensearch",
+            families=[ "c5", "c6g", "i3", "m5", "m6g", "r5", "r6g", "r6gd", "t3" ]
+        )
 
         self.open_search_service_ebs_volume_size_param = CfnParameter(
             self,
@@ -0,0 +1,161 @@
+class PerformanceProfile:
+
+    NOFILE_LIMITS = {
+        "web": 1048576,
+        "database": 65536,
+        "cache": 1048576,
+        "search": 65536
+    }
+    # sysctl settings applied on top of the distribution defaults
+    SYSCTL_SETTINGS = {
+        "web": {
+            "net.core.somaxconn": 65535,
+            "net.core.netdev_max_backlog": 16384,
+            "net.ipv4.tcp_max_syn_backlog": 65535,
+            "net.ipv4.ip_local_port_range": "1024 65535",
+            "net.ipv4.tcp_tw_reuse": 1,
+            "net.ipv4.tcp_fin_timeout": 15,
+            "vm.swappiness": 10,
+            "vm.dirty_ratio": 20,
+            "vm.dirty_background_ratio": 10
+        },
+        "database": {
+            "net.core.somaxconn": 4096,
+            "net.ipv4.tcp_max_syn_backlog": 4096,
+            "net.ipv4.ip_local_port_range": "10240 65535",
+            "vm.swappiness": 1,
+            # smaller dirty ratios keep checkpoint write bursts short
+            "vm.dirty_ratio": 15,
+            "vm.dirty_background_ratio": 5
+        },
+        "cache": {
+            "net.core.somaxconn": 65535,
+            "net.core.netdev_max_backlog": 16384,
+            "net.ipv4.tcp_max_syn_backlog": 65535,
+            "net.ipv4.ip_local_port_range": "1024 65535",
+            "vm.swappiness": 1,
+            # fork based snapshots fail without overcommit
+            "vm.overcommit_memory": 1
+        },
+        "search": {
+            "net.core.somaxconn": 4096,
+            "net.ipv4.tcp_max_syn_backlog": 4096,
+            "vm.swappiness": 1,
+            # Lucene memory maps every index segment
+            "vm.max_map_count": 262144
+        }
+    }
+    # transparent huge pages cause latency spikes for databases and caches
+    TRANSPARENT_HUGE_PAGES = {
+        "web": "madvise",
+        "database": "never",
+        "cache": "never",
+        "search": "madvise"
+    }
+    # EBS and instance store NVMe devices do their own scheduling
+    NVME_IO_SCHEDULER = "none"
+    RPS_SOCK_FLOW_ENTRIES = 32768
+
+    def __init__(self, profile: str):
+        if profile not in PerformanceProfile.SYSCTL_SETTINGS:
+            raise ValueError(f"performance_profile must be one of {', '.join(PerformanceProfile.SYSCTL_SETTINGS.keys())}")
+        self.profile = profile
+
+    @property
+    def nofile_limit(self):
+        return PerformanceProfile.NOFILE_LIMITS[self.profile]
+
+    @property
+    def sysctl_settings(self):
+        settings = dict(PerformanceProfile.SYSCTL_SETTINGS[self.profile])
+        settings["net.core.rps_sock_flow_entries"] = PerformanceProfile.RPS_SOCK_FLOW_ENTRIES
+        return settings
+
+    @property
+    def transparent_huge_pages(self):
+        return PerformanceProfile.TRANSPARENT_HUGE_PAGES[self.profile]
+
+    def sysctl_conf(self):
+        return "".join(f"{key} = {value}\n" for key, value in self.sysctl_settings.items())
+
+    # recent kernels default fs.file-max to the maximum long, so it is only raised when lower
+    @property
+    def file_max(self):
+        return max(self.nofile_limit * 2, 2097152)
+
+    def limits_conf(self):
+        return "".join(f"* {kind} nofile {self.nofile_limit}\n" for kind in ["soft", "hard"])
+
+    # settings under /sys do not persist, so they are applied again on every boot;
+    # RPS spreads receive processing over all CPUs when the network interface has
+    # fewer receive queues than the instance size has CPUs
+    def per_boot_script(self):
+        return f"""#!/bin/bash
+
+for FILE in /sys/kernel/mm/transparent_hugepage/enabled /sys/kernel/mm/transparent_hugepage/defrag; do
+  if [[ -w $FILE ]]; then
+    echo {self.transparent_huge_pages} > $FILE
+  fi
+done
+
+CPUS=$(nproc)
+INTERFACE=$(ip -o route show default | awk '{{ print $5; exit }}')
+QUEUES=$(ls -d /sys/class/net/$INTERFACE/queues/rx-* 2> /dev/null | wc -l)
+if [[ $CPUS -gt 1 && $QUEUES -gt 0 && $QUEUES -lt $CPUS ]]; then
+  # one 32 bit hex group per 32 CPUs, highest CPUs first
+  MASK=""
+  REMAINING=$CPUS
+  while [[ $REMAINING -gt 0 ]]; do
+    BITS=$(( REMAINING > 32 ? 32 : REMAINING ))
+    GROUP=$(printf '%08x' $(( (1 << BITS) - 1 )))
+    if [[ -n "$MASK" ]]; then
+      MASK="$GROUP,$MASK"
+    else
+      MASK=$GROUP
+    fi
+    REMAINING=$(( REMAINING - BITS ))
+  done
+  for QUEUE in /sys/class/net/$INTERFACE/queues/rx-*; do
+    echo $MASK > $QUEUE/rps_cpus
+    echo $(( {PerformanceProfile.RPS_SOCK_FLOW_ENTRIES} / QUEUES )) > $QUEUE/rps_flow_cnt
+  done
+  echo "$(date): Enabled RPS on $INTERFACE for $QUEUES receive queues over $CPUS CPUs"
+fi
+"""
+
+    # user data installing the profile, run before the pattern user data starts services
+    def script(self):
+        return f"""
+echo "$(date): Applying {self.profile} performance profile"
+cat <<'EOF' > /etc/sysctl.d/90-asg-performance-profile.conf
+{self.sysctl_conf()}EOF
+if [[ $(cat /proc/sys/fs/file-max) -lt {self.file_max} ]]; then
+  echo "fs.file-max = {self.file_max}" >> /etc/sysctl.d/90-asg-performance-profile.conf
+fi
+sysctl --system > /dev/null
+
+mkdir -p /etc/security/limits.d /etc/systemd/system.conf.d
+cat <<'EOF' > /etc/security/limits.d/90-asg-performance-profile.conf
+{self.limits_conf()}EOF
+cat <<'EOF' > /etc/systemd/system.conf.d/90-asg-performance-profile.conf
+[Manager]
+DefaultLimitNOFILE={self.nofile_limit}
+EOF
+systemctl daemon-reexec
+
+cat <<'EOF' > /etc/udev/rules.d/90-asg-performance-profile.rules
+ACTION=="add|change", KERNEL=="nvme[0-9]*n[0-9]*", ENV{{DEVTYPE}}=="disk", ATTR{{queue/scheduler}}="{PerformanceProfile.NVME_IO_SCHEDULER}"
+EOF
+udevadm control --reload-rules
+udevadm trigger --subsystem-match=block --action=change
+
+if systemctl cat irqbalance.service > /dev/null 2>&1; then
+  systemctl enable --now irqbalance.service
+fi
+
+mkdir -p /var/lib/cloud/scripts/per-boot
+cat <<'EOF' > /var/lib/cloud/scripts/per-boot/asg-performance-profile.sh
+{self.per_boot_script()}EOF
+chmod +x /var/lib/cloud/scripts/per-boot/asg-performance-profile.sh
+/var/lib/cloud/scripts/per-boot/asg-performance-profile.sh
+"""
@@ -6,62 +6,197 @@ function log {
 
 function error_exit {
   log "Error: Exiting with failure"
-  cfn-signal --exit-code 1 --stack "${AWS::StackName}" --resource "${AsgId}" --region "${AWS::Region}"
+  report_timings
+  # the bootstrap runner signals the failure of its steps itself
+  if [[ -z "$ASG_BOOTSTRAP_ENV" ]]; then
+    cfn-signal --exit-code 1 --stack "${AWS::StackName}" --resource "${AsgId}" --region "${AWS::Region}"
+  fi
   exit 1
 }
 
+function now_ms {
+  date +%s%3N
+}
+
+PHASE_TIMINGS=""
+ATTACH_START=$(now_ms)
+
+function record_phase {
+  local ELAPSED=$(( $(now_ms) - $2 ))
+  log "Phase $1 completed in $ELAPSED ms"
+  PHASE_TIMINGS="$PHASE_TIMINGS $1=$ELAPSED"
+}
+
+# exponential backoff with full jitter: 250ms doubling per attempt, capped at 5 seconds
+function backoff_sleep {
+  local MAX_MS=$(( 250 * (1 << ($1 < 5 ? $1 : 5)) ))
+  if [[ $MAX_MS -gt 5000 ]]; then
+    MAX_MS=5000
+  fi
+  local SLEEP_MS=$(( RANDOM % MAX_MS + 1 ))
+  sleep "$(( SLEEP_MS / 1000 )).$(printf '%03d' $(( SLEEP_MS % 1000 )))"
+}
+
+# phase timings go to the system log and, in a single call, to the system log group
+function report_timings {
+  local MESSAGE="attach-ebs volumes=$(echo ${EbsIds} | tr ' ' ',') instance=$INSTANCE_ID total=$(( $(now_ms) - ATTACH_START ))$PHASE_TIMINGS"
+  logger -t attach-ebs "$MESSAGE"
+  aws logs create-log-stream --region "${AWS::Region}" --log-group-name "${AsgSystemLogGroup}" --log-stream-name "$INSTANCE_ID/attach-ebs" 2> /dev/null
+  aws logs put-log-events --region "${AWS::Region}" --log-group-name "${AsgSystemLogGroup}" --log-stream-name "$INSTANCE_ID/attach-ebs" \
+    --log-events "[{\"timestamp\": $(now_ms), \"message\": \"$MESSAGE\"}]" > /dev/null \
+    || log "Unable to report EBS attach timings to CloudWatch Logs"
+}
+
+PHASE_START=$(now_ms)
 log "Fetching instance metadata"
 TOKEN=$(curl -X PUT "http://169.254.169.254/latest/api/token" -H "X-aws-ec2-metadata-token-ttl-seconds: 21600" -s)
 INSTANCE_ID=$(curl -H "X-aws-ec2-metadata-token: $TOKEN" -s http://169.254.169.254/latest/meta-data/instance-id)
+record_phase metadata $PHASE_START
 
-MAX_ATTACH_TRIES=180  # 180 tries * 10s = 30 minutes
-ATTACH_TRIES=0
+ATTACH_DEADLINE=$(( $(date +%s) + 1800 ))  # 30 minutes
+DEVICE_DEADLINE=0
 
-log "Attaching EBS volume (timeout: 30 minutes)"
-while ! aws ec2 attach-volume --region "${AWS::Region}" --volume-id "${EbsId}" --instance-id "$INSTANCE_ID" --device /dev/sdf; do
-  ((ATTACH_TRIES++))
-  if [[ $ATTACH_TRIES -ge $MAX_ATTACH_TRIES ]]; then
-    log "EBS volume attachment failed after $ATTACH_TRIES attempts"
-    error_exit
-  fi
-  sleep 10
-done
+function attach_volume {
+  local VOLUME_ID=$1
+  local DEVICE_NAME=$2
+  local ATTEMPT=0
+  log "Waiting for EBS volume $VOLUME_ID to become available (timeout: 30 minutes)"
+  while true; do
+    read -r VOLUME_STATE ATTACHED_INSTANCE_ID <<< "$(aws ec2 describe-volumes --region "${AWS::Region}" --volume-ids "$VOLUME_ID" --query 'Volumes[0].[State, Attachments[0].InstanceId]' --output text)"
+    if [[ "$VOLUME_STATE" == "in-use" && "$ATTACHED_INSTANCE_ID" == "$INSTANCE_ID" ]]; then
+      log "EBS volume $VOLUME_ID already attached to this instance"
+      return
+    fi
+    if [[ "$VOLUME_STATE" == "available" ]]; then
+      if aws ec2 attach-volume --region "${AWS::Region}" --volume-id "$VOLUME_ID" --instance-id "$INSTANCE_ID" --device "$DEVICE_NAME" > /dev/null; then
+        return
+      fi
+      log "EBS volume $VOLUME_ID attach request failed, retrying"
+    fi
+    if [[ $(date +%s) -ge $ATTACH_DEADLINE ]]; then
+      log "EBS volume $VOLUME_ID attachment failed after $ATTEMPT attempts (last state: $VOLUME_STATE)"
+      error_exit
+    fi
+    ((ATTEMPT++))
+    backoff_sleep $ATTEMPT
+  done
+}
+
+# the NVMe serial number is the volume id without the dash, which udev exposes under /dev/disk/by-id
+function detect_device {
+  local VOLUME_SERIAL=$(echo "$1" | sed 's/-//g')
+  DEVICE=""
+  while [[ -z "$DEVICE" ]]; do
+    if [[ -e "/dev/disk/by-id/nvme-Amazon_Elastic_Block_Store_$VOLUME_SERIAL" ]]; then
+      DEVICE=$(readlink -f "/dev/disk/by-id/nvme-Amazon_Elastic_Block_Store_$VOLUME_SERIAL")
+    else
+      DEVICE=$(lsblk -d -n -o NAME,SERIAL | awk -v serial="$VOLUME_SERIAL" '$2 == serial { print "/dev/" $1 }')
+    fi
+    if [[ -z "$DEVICE" && -b "$2" ]]; then
+      DEVICE=$2
+    fi
+    if [[ -z "$DEVICE" ]]; then
+      if [[ $(date +%s) -ge $DEVICE_DEADLINE ]]; then
+        log "Device detection for $1 timed out"
+        error_exit
+      fi
+      sleep 0.5
+    fi
+  done
+}
 
-MAX_WAITS=12  # 12 tries * 10s = 2 minutes
-CURRENT_WAITS=0
+DEVICE_LETTERS="f g h i j k l m n o p"
 
-log "Waiting for EBS volume to be detected"
-while [[ -z "$(lsblk -n -o NAME,SERIAL | grep $(aws ec2 describe-volumes --region ${AWS::Region} --volume-ids ${EbsId} --query 'Volumes[0].Attachments[0].VolumeId' --output text | sed 's/-//g'))" ]]; do
-  if [[ $CURRENT_WAITS -ge $MAX_WAITS ]]; then
-    log "Device detection timed out"
-    error_exit
-  fi
-  log "Waiting for EBS volume to appear..."
-  sleep 10
-  ((CURRENT_WAITS++))
+PHASE_START=$(now_ms)
+DEVICE_COUNT=0
+for VOLUME_ID in ${EbsIds}; do
+  DEVICE_COUNT=$(( DEVICE_COUNT + 1 ))
+  attach_volume "$VOLUME_ID" "/dev/sd$(echo $DEVICE_LETTERS | cut -d' ' -f$DEVICE_COUNT)"
 done
+record_phase attach $PHASE_START
 
-# Detect the correct device name dynamically
-DEVICE=$(lsblk -n -o NAME,SERIAL | grep "$(aws ec2 describe-volumes --region ${AWS::Region} --volume-ids ${EbsId} --query 'Volumes[0].Attachments[0].VolumeId' --output text | sed 's/-//g')" | awk '{print "/dev/" $1}')
+PHASE_START=$(now_ms)
+DEVICE_DEADLINE=$(( $(date +%s) + 120 ))  # 2 minutes
+log "Waiting for EBS volumes to be detected"
+DEVICES=""
+DEVICE_COUNT=0
+for VOLUME_ID in ${EbsIds}; do
+  DEVICE_COUNT=$(( DEVICE_COUNT + 1 ))
+  detect_device "$VOLUME_ID" "/dev/xvd$(echo $DEVICE_LETTERS | cut -d' ' -f$DEVICE_COUNT)"
+  log "Device detected for $VOLUME_ID: $DEVICE"
+  DEVICES="$DEVICES $DEVICE"
+done
+record_phase detect $PHASE_START
 
-if [[ -z "$DEVICE" ]]; then
-  log "Error: Unable to determine device name"
-  error_exit
+# multiple data volumes are striped into a single RAID0 array
+if [[ $DEVICE_COUNT -gt 1 ]]; then
+  PHASE_START=$(now_ms)
+  if ! command -v mdadm > /dev/null; then
+    log "Installing mdadm"
+    if command -v apt-get > /dev/null; then
+      DEBIAN_FRONTEND=noninteractive apt-get install -y mdadm
+    else
+      yum install -y mdadm
+    fi
+  fi
+  FIRST_DEVICE=$(echo $DEVICES | cut -d' ' -f1)
+  # udev may have already assembled an existing array when its members were attached
+  ARRAY=$(lsblk -n -l -o NAME,TYPE "$FIRST_DEVICE" | awk '$2 == "raid0" { print "/dev/" $1 }' | head -n 1)
+  if [[ -n "$ARRAY" ]]; then
+    log "RAID0 array $ARRAY already assembled"
+  elif mdadm --examine "$FIRST_DEVICE" > /dev/null 2>&1; then
+    log "Assembling existing RAID0 array from$DEVICES"
+    ARRAY=/dev/md0
+    mdadm --assemble $ARRAY $DEVICES || error_exit
+  else
+    log "Creating RAID0 array from$DEVICES"
+    ARRAY=/dev/md0
+    mdadm --create $ARRAY --level=0 --raid-devices=$DEVICE_COUNT --name=data --run $DEVICES || error_exit
+  fi
+  MDADM_CONF=/etc/mdadm.conf
+  if [[ -d /etc/mdadm ]]; then
+    MDADM_CONF=/etc/mdadm/mdadm.conf
+  fi
+  # the script may run again on the same instance, only record the array once
+  ARRAY_UUID=$(mdadm --detail --export "$ARRAY" | awk -F= '$1 == "MD_UUID" { print $2 }')
+  if [[ -z "$ARRAY_UUID" ]] || ! grep -qs "UUID=$ARRAY_UUID" $MDADM_CONF; then
+    mdadm --detail --brief "$ARRAY" >> $MDADM_CONF
+  fi
+  DEVICE=$ARRAY
+  record_phase raid $PHASE_START
 fi
 
-log "Device detected: $DEVICE"
+log "Data device: $DEVICE"
 
+PHASE_START=$(now_ms)
 if ! blkid "$DEVICE"; then
-  log "No filesystem detected, formatting as XFS"
-  mkfs -t xfs $DEVICE
+  log "No filesystem detected, formatting as ${DataVolumeFilesystem} with options: ${DataVolumeMkfsOptions}"
+  mkfs -t ${DataVolumeFilesystem} ${DataVolumeMkfsOptions} $DEVICE || error_exit
 else
   log "Filesystem already exists on $DEVICE"
 fi
+# a volume restored from a snapshot keeps the filesystem it was created with
+FILESYSTEM=$(blkid -s TYPE -o value $DEVICE)
 
-log "Mounting $DEVICE to /data"
+log "Mounting $DEVICE to /data with options ${DataVolumeMountOptions}"
 mkdir -p /data
-mount $DEVICE /data
-echo "$DEVICE /data xfs defaults,nofail 0 2" >> /etc/fstab
-xfs_growfs -d /data
+mount -o "${DataVolumeMountOptions}" $DEVICE /data || error_exit
+# mount by filesystem UUID since NVMe and md device names are not stable across boots
+echo "UUID=$(blkid -s UUID -o value $DEVICE) /data $FILESYSTEM ${DataVolumeMountOptions} 0 2" >> /etc/fstab
+if [[ "$FILESYSTEM" == "xfs" ]]; then
+  xfs_growfs -d /data
+else
+  resize2fs $DEVICE
+fi
+if [[ "${DataVolumeTrim}" == "fstrim" ]]; then
+  log "Enabling weekly fstrim.timer"
+  systemctl enable --now fstrim.timer
+fi
+record_phase mount $PHASE_START
 
+report_timings
+# with the bootstrap runner, later steps get the data device from the shared env file
+if [[ -n "$ASG_BOOTSTRAP_ENV" ]]; then
+  echo "DEVICE=$DEVICE" >> "$ASG_BOOTSTRAP_ENV"
+fi
 log "EBS Volume setup completed successfully!"
@@ -0,0 +1,9 @@
+#!/bin/bash
+
+echo "$(date): Starting CloudWatch agent for early logging visibility"
+
+# Replace the agent config baked into the AMI with the one generated by the stack
+/opt/aws/amazon-cloudwatch-agent/bin/amazon-cloudwatch-agent-ctl -a fetch-config -m ec2 -s -c ssm:${AsgCloudWatchAgentConfigParameter}
+systemctl enable amazon-cloudwatch-agent
+
+echo "$(date): CloudWatch agent started successfully"
@@ -0,0 +1,64 @@
+
+echo "$(date): Installing launch lifecycle action completion service"
+
+# the launch lifecycle hook pauses an instance each time it moves into the warm pool
+# and again when it moves from the warm pool into service. Instances leaving a Running
+# pool or resuming from a Hibernated one do not boot, so a service polls the target
+# lifecycle state and completes the action for every new state.
+cat <<'EOF' > /usr/local/bin/asg-complete-lifecycle-action.sh
+#!/bin/bash
+
+function imds {
+  local TOKEN=$(curl -X PUT "http://169.254.169.254/latest/api/token" -H "X-aws-ec2-metadata-token-ttl-seconds: 300" -s)
+  curl -H "X-aws-ec2-metadata-token: $TOKEN" -s -f "http://169.254.169.254/latest/meta-data/$1"
+}
+
+# wait until the bootstrap in user data has completed on first boot
+until [[ -f /var/lib/cloud/asg-bootstrap-complete ]]; do
+  sleep 5
+done
+
+INSTANCE_ID=$(imds instance-id)
+ASG_NAME=""
+COMPLETED_STATE=""
+while true; do
+  STATE=$(imds autoscaling/target-lifecycle-state)
+  if [[ -n "$STATE" && "$STATE" != "$COMPLETED_STATE" ]]; then
+    if [[ -z "$ASG_NAME" ]]; then
+      ASG_NAME=$(aws autoscaling describe-auto-scaling-instances --region "${AWS::Region}" --instance-ids "$INSTANCE_ID" --query 'AutoScalingInstances[0].AutoScalingGroupName' --output text)
+    fi
+    echo "$(date): Completing lifecycle action ${AsgLaunchLifecycleHookName} for $INSTANCE_ID moving to $STATE"
+    aws autoscaling complete-lifecycle-action \
+      --region "${AWS::Region}" \
+      --auto-scaling-group-name "$ASG_NAME" \
+      --lifecycle-hook-name "${AsgLaunchLifecycleHookName}" \
+      --instance-id "$INSTANCE_ID" \
+      --lifecycle-action-result CONTINUE \
+      || echo "$(date): No pending lifecycle action for $INSTANCE_ID"
+    COMPLETED_STATE=$STATE
+  fi
+  sleep 5
+done
+EOF
+chmod +x /usr/local/bin/asg-complete-lifecycle-action.sh
+
+cat <<'EOF' > /etc/systemd/system/asg-complete-lifecycle-action.service
+[Unit]
+Description=Complete Auto Scaling Group launch lifecycle actions
+After=network-online.target
+
+[Service]
+Type=simple
+ExecStart=/usr/local/bin/asg-complete-lifecycle-action.sh
+Restart=on-failure
+RestartSec=5
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+systemctl daemon-reload
+systemctl enable --now asg-complete-lifecycle-action.service
+
+# the bootstrap is complete when the user data exits with success, including an early exit 0
+trap 'if [[ $? -eq 0 ]]; then touch /var/lib/cloud/asg-bootstrap-complete; fi' EXIT
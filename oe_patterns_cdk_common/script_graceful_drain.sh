@@ -0,0 +1,72 @@
+
+echo "$(date): Installing graceful drain service"
+
+# waits for the termination lifecycle hook, drains connections on the service ports and
+# completes the lifecycle action; executables in /etc/asg-drain.d run before completion
+mkdir -p /etc/asg-drain.d
+cat <<'EOF' > /usr/local/bin/asg-graceful-drain.sh
+#!/bin/bash
+
+function imds {
+  local TOKEN=$(curl -X PUT "http://169.254.169.254/latest/api/token" -H "X-aws-ec2-metadata-token-ttl-seconds: 300" -s)
+  curl -H "X-aws-ec2-metadata-token: $TOKEN" -s -f "http://169.254.169.254/latest/meta-data/$1"
+}
+
+until [[ "$(imds autoscaling/target-lifecycle-state)" == "Terminated" ]]; do
+  sleep 5
+done
+
+INSTANCE_ID=$(imds instance-id)
+# leave time to complete the lifecycle action before the heartbeat timeout
+DRAIN_DEADLINE=$(( $(date +%s) + ${AsgDrainTimeout} - 15 ))
+SPORT_FILTER=""
+for PORT in ${AsgDrainPorts}; do
+  if [[ -n "$SPORT_FILTER" ]]; then
+    SPORT_FILTER="$SPORT_FILTER or "
+  fi
+  SPORT_FILTER="$SPORT_FILTER sport = :$PORT"
+done
+
+echo "$(date): Instance $INSTANCE_ID is terminating, draining connections on ports ${AsgDrainPorts}"
+while true; do
+  CONNECTIONS=$(ss -H -t state established "( $SPORT_FILTER )" | wc -l)
+  if [[ $CONNECTIONS -eq 0 ]]; then
+    echo "$(date): All connections drained"
+    break
+  fi
+  if [[ $(date +%s) -ge $DRAIN_DEADLINE ]]; then
+    echo "$(date): Drain timed out with $CONNECTIONS connections open"
+    break
+  fi
+  sleep 1
+done
+
+run-parts /etc/asg-drain.d
+
+ASG_NAME=$(aws autoscaling describe-auto-scaling-instances --region "${AWS::Region}" --instance-ids "$INSTANCE_ID" --query 'AutoScalingInstances[0].AutoScalingGroupName' --output text)
+echo "$(date): Completing lifecycle action ${AsgTerminationLifecycleHookName} for $INSTANCE_ID"
+aws autoscaling complete-lifecycle-action \
+  --region "${AWS::Region}" \
+  --auto-scaling-group-name "$ASG_NAME" \
+  --lifecycle-hook-name "${AsgTerminationLifecycleHookName}" \
+  --instance-id "$INSTANCE_ID" \
+  --lifecycle-action-result CONTINUE
+EOF
+chmod +x /usr/local/bin/asg-graceful-drain.sh
+
+cat <<'EOF' > /etc/systemd/system/asg-graceful-drain.service
+[Unit]
+Description=Drain connections before Auto Scaling Group termination
+After=network-online.target
+
+[Service]
+Type=simple
+ExecStart=/usr/local/bin/asg-graceful-drain.sh
+Restart=on-failure
+RestartSec=5
+
+[Install]
+WantedBy=multi-user.target
+EOF
+systemctl daemon-reload
+systemctl enable --now asg-graceful-drain.service
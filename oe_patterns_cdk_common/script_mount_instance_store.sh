@@ -0,0 +1,51 @@
+
+echo "$(date): Installing instance store mount script"
+
+# instance store contents do not survive a stop/start, so the disks are
+# detected, formatted if needed and mounted again on every boot
+mkdir -p /var/lib/cloud/scripts/per-boot
+cat <<'EOF' > /var/lib/cloud/scripts/per-boot/asg-mount-instance-store.sh
+#!/bin/bash
+
+MOUNT_PATH="${InstanceStorePath}"
+mkdir -p "$MOUNT_PATH"
+
+if mountpoint -q "$MOUNT_PATH"; then
+  echo "$(date): Instance store already mounted at $MOUNT_PATH"
+  exit 0
+fi
+
+DEVICES=$(lsblk -d -n -o NAME,MODEL | awk '/Amazon EC2 NVMe Instance Storage/ { print "/dev/" $1 }' | xargs)
+DEVICE_COUNT=$(echo $DEVICES | wc -w)
+if [[ $DEVICE_COUNT -eq 0 ]]; then
+  echo "$(date): No instance store NVMe devices found, $MOUNT_PATH uses the root volume"
+  exit 0
+fi
+echo "$(date): Found $DEVICE_COUNT instance store NVMe devices: $DEVICES"
+
+DEVICE=$DEVICES
+if [[ $DEVICE_COUNT -gt 1 ]]; then
+  if ! command -v mdadm > /dev/null; then
+    if command -v apt-get > /dev/null; then
+      DEBIAN_FRONTEND=noninteractive apt-get install -y mdadm
+    else
+      yum install -y mdadm
+    fi
+  fi
+  DEVICE=/dev/md/instance-store
+  if [[ ! -e $DEVICE ]]; then
+    mdadm --assemble $DEVICE $DEVICES > /dev/null 2>&1 \
+      || mdadm --create $DEVICE --level=0 --raid-devices=$DEVICE_COUNT --name=instance-store --run $DEVICES
+  fi
+fi
+
+if ! blkid "$DEVICE" > /dev/null; then
+  echo "$(date): Formatting $DEVICE as XFS"
+  mkfs -t xfs -f -K $DEVICE
+fi
+
+echo "$(date): Mounting $DEVICE to $MOUNT_PATH"
+mount -o noatime,nofail $DEVICE "$MOUNT_PATH"
+EOF
+chmod +x /var/lib/cloud/scripts/per-boot/asg-mount-instance-store.sh
+/var/lib/cloud/scripts/per-boot/asg-mount-instance-store.sh
@@ -0,0 +1,46 @@
+
+# blocks of a volume restored from a snapshot are loaded lazily from S3 on first read,
+# so read the whole device once in the background at a throttled rate
+VOLUME_ID=$(echo ${EbsIds} | cut -d' ' -f1)
+SNAPSHOT_ID=$(aws ec2 describe-volumes --region "${AWS::Region}" --volume-ids "$VOLUME_ID" --query 'Volumes[0].SnapshotId' --output text)
+PREWARMED=$(aws ec2 describe-volumes --region "${AWS::Region}" --volume-ids "$VOLUME_ID" --query 'Volumes[0].Tags[?Key==`Prewarmed`].Value | [0]' --output text)
+if [[ -n "$SNAPSHOT_ID" && "$SNAPSHOT_ID" != "None" && "$PREWARMED" != "true" ]]; then
+  log "Pre-warming data volume $VOLUME_ID restored from $SNAPSHOT_ID at ${AsgDataVolumePrewarmRate} MiB/s"
+  cat <<'EOF' > /usr/local/bin/asg-prewarm-data-volume.sh
+#!/bin/bash
+DEVICE=$1
+VOLUME_ID=$2
+INSTANCE_ID=$3
+CHUNK_MIB=${AsgDataVolumePrewarmRate}
+SIZE_MIB=$(( $(blockdev --getsize64 "$DEVICE") / 1048576 ))
+
+function report_progress {
+  aws cloudwatch put-metric-data --region "${AWS::Region}" --namespace CWAgent \
+    --metric-name data_volume_prewarm_percent --dimensions "InstanceId=$INSTANCE_ID" \
+    --value "$1" --unit Percent
+}
+
+OFFSET=0
+LAST_REPORT=0
+while [[ $OFFSET -lt $SIZE_MIB ]]; do
+  # one chunk per second keeps the read rate at the configured MiB/s
+  START_MS=$(date +%s%3N)
+  dd if="$DEVICE" of=/dev/null bs=1M skip=$OFFSET count=$CHUNK_MIB iflag=direct status=none
+  OFFSET=$(( OFFSET + CHUNK_MIB ))
+  ELAPSED_MS=$(( $(date +%s%3N) - START_MS ))
+  if [[ $ELAPSED_MS -lt 1000 ]]; then
+    SLEEP_MS=$(( 1000 - ELAPSED_MS ))
+    sleep "$(( SLEEP_MS / 1000 )).$(printf '%03d' $(( SLEEP_MS % 1000 )))"
+  fi
+  if [[ $(date +%s) -ge $(( LAST_REPORT + 60 )) ]]; then
+    report_progress $(( (OFFSET < SIZE_MIB ? OFFSET : SIZE_MIB) * 100 / SIZE_MIB ))
+    LAST_REPORT=$(date +%s)
+  fi
+done
+report_progress 100
+aws ec2 create-tags --region "${AWS::Region}" --resources "$VOLUME_ID" --tags Key=Prewarmed,Value=true
+echo "$(date): Pre-warm of $DEVICE completed"
+EOF
+  chmod +x /usr/local/bin/asg-prewarm-data-volume.sh
+  nohup setsid /usr/local/bin/asg-prewarm-data-volume.sh "$DEVICE" "$VOLUME_ID" "$INSTANCE_ID" > /var/log/asg-prewarm-data-volume.log 2>&1 &
+fi
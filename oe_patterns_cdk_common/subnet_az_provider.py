@@ -0,0 +1,72 @@
+from aws_cdk import (
+    aws_iam,
+    aws_lambda,
+    CustomResource,
+    Duration,
+    Stack,
+    Token
+)
+
+from constructs import Construct
+from oe_patterns_cdk_common.util import Util
+
+class SubnetAzProvider(Construct):
+
+    ID = "SubnetAzProvider"
+
+    # one provider per stack, use SubnetAzProvider.of(scope) rather than the constructor
+    @staticmethod
+    def of(scope: Construct):
+        stack = Stack.of(scope)
+        provider = stack.node.try_find_child(SubnetAzProvider.ID)
+        if provider is None:
+            provider = SubnetAzProvider(stack, SubnetAzProvider.ID)
+        return provider
+
+    def __init__(
+            self,
+            scope: Construct,
+            id: str,
+            **props):
+        super().__init__(scope, id, **props)
+        self._subnets = {}
+
+        lambda_code_path = Util.local_path("lambda_subnet_az_provider.py")
+        with open(lambda_code_path) as f:
+            lambda_code = f.read()
+        self.lambda_function = aws_lambda.Function(
+            self,
+            "SubnetAzProviderLambda",
+            runtime=aws_lambda.Runtime.PYTHON_3_13,
+            timeout=Duration.seconds(300),
+            handler="index.handler",
+            code=aws_lambda.Code.from_inline(lambda_code)
+        )
+        self.lambda_function.node.default_child.override_logical_id(f"{id}Lambda")
+        self.lambda_function.role.node.default_child.override_logical_id(f"{id}LambdaRole")
+        self.describe_subnets_policy = aws_iam.Policy(
+            self,
+            "DescribeSubnetsPolicy",
+            statements=[
+                aws_iam.PolicyStatement(
+                    actions=["ec2:DescribeSubnets"],
+                    resources=["*"]
+                )
+            ]
+        )
+        self.describe_subnets_policy.node.default_child.override_logical_id(f"{id}DescribeSubnetsPolicy")
+        self.lambda_function.role.attach_inline_policy(self.describe_subnets_policy)
+        self.custom_resource = CustomResource(
+            self,
+            "SubnetAzProviderCustomResource",
+            service_token=self.lambda_function.function_arn
+        )
+        self.custom_resource.node.default_child.override_logical_id(f"{id}CustomResource")
+        self.custom_resource.node.add_dependency(self.describe_subnets_policy)
+
+    # key names the subnet within the stack and becomes the custom resource attribute
+    def availability_zone(self, key: str, subnet_id: str):
+        if key not in self._subnets:
+            self._subnets[key] = subnet_id
+            self.custom_resource.node.default_child.add_property_override(f"subnets.{key}", subnet_id)
+        return Token.as_string(self.custom_resource.get_att(key))
@@ -38,3 +38,21 @@ def test_alb_http_port():
     },
   )
   template.resource_count_is("AWS::ElasticLoadBalancingV2::LoadBalancer", 1)
+
+def test_alb_deregistration_delay():
+  stack = Stack()
+  vpc = Vpc(stack, "TestVpc")
+  asg = Asg(stack, "TestAsg", ami_id="test", vpc=vpc)
+  Alb(stack, "TestAlb", asg=asg, vpc=vpc, deregistration_delay=120)
+  template = assertions.Template.from_stack(stack)
+  template.has_resource_properties(
+    "AWS::ElasticLoadBalancingV2::TargetGroup",
+    {
+      "TargetGroupAttributes": [
+        {
+          "Key": "deregistration_delay.timeout_seconds",
+          "Value": "120"
+        }
+      ]
+    },
+  )
@@ -1,4 +1,6 @@
 import json
+import pytest
+import re
 
 from aws_cdk import (
   assertions,
@@ -7,6 +9,7 @@ from aws_cdk import (
 )
 
 from oe_patterns_cdk_common.vpc import Vpc
+from oe_patterns_cdk_common.alb import Alb
 from oe_patterns_cdk_common.asg import Asg
 from . import print_resource
 
@@ -24,7 +27,10 @@ def test_asg():
   template = assertions.Template.from_stack(stack)
   # print_resource(template, 'AWS::AutoScaling::AutoScalingGroup')
   template.has_resource('AWS::AutoScaling::AutoScalingGroup', {
-    'UpdatePolicy': {'AutoScalingReplacingUpdate': assertions.Match.any_value()}
+    'UpdatePolicy': {
+      'AutoScalingReplacingUpdate': assertions.Match.any_value(),
+      'AutoScalingScheduledAction': {'IgnoreUnmodifiedGroupSizeProperties': True}
+    }
   })
 
 def test_singleton_asg():
@@ -250,3 +256,821 @@ def test_custom_ami_param_name_suffix():
   asg_ami_name_params = template.find_parameters('TestAsgAmiIdcustom_suffix')
 
   assert asg_ami_name_params['TestAsgAmiIdcustom_suffix']['Type'] == 'String'
+
+def test_target_tracking_scaling():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  asg = Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    use_target_tracking_scaling=True,
+    vpc=vpc
+  )
+  alb = Alb(stack, 'TestAlb', asg=asg, vpc=vpc)
+  asg.asg.target_group_arns = [alb.target_group.ref]
+  asg.add_request_count_scaling_policy(alb)
+  template = assertions.Template.from_stack(stack)
+  asg_resource = template.find_resources('AWS::AutoScaling::AutoScalingGroup')['TestAsg']
+  assert asg_resource['Properties']['TargetGroupARNs'] == [{'Ref': 'TestAlbTargetGroup'}]
+  # print_resource(template, 'AWS::AutoScaling::ScalingPolicy')
+  template.resource_count_is('AWS::AutoScaling::ScalingPolicy', 6)
+  template.has_resource('AWS::AutoScaling::ScalingPolicy', {
+    'Condition': 'TestAsgScalingCpuTargetCondition',
+    'Properties': {
+      'PolicyType': 'TargetTrackingScaling',
+      'TargetTrackingConfiguration': {
+        'PredefinedMetricSpecification': {'PredefinedMetricType': 'ASGAverageCPUUtilization'},
+        'TargetValue': {'Ref': 'TestAsgScalingCpuTarget'}
+      }
+    }
+  })
+  template.has_resource_properties('AWS::AutoScaling::ScalingPolicy', {
+    'TargetTrackingConfiguration': {
+      'PredefinedMetricSpecification': {
+        'PredefinedMetricType': 'ALBRequestCountPerTarget',
+        'ResourceLabel': assertions.Match.any_value()
+      }
+    }
+  })
+
+def test_target_tracking_scaling_singleton():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    singleton=True,
+    use_target_tracking_scaling=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.resource_count_is('AWS::AutoScaling::ScalingPolicy', 0)
+
+def test_mixed_instances_policy():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    mixed_instance_types=['t4g.medium', 'm7g.medium'],
+    use_mixed_instances_policy=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  # print_resource(template, 'AWS::AutoScaling::AutoScalingGroup')
+  asg = template.find_resources('AWS::AutoScaling::AutoScalingGroup')['TestAsg']['Properties']
+  assert 'LaunchTemplate' not in asg
+  assert asg['CapacityRebalance'] == True
+  policy = asg['MixedInstancesPolicy']
+  assert policy['InstancesDistribution']['SpotAllocationStrategy'] == {'Ref': 'TestAsgSpotAllocationStrategy'}
+  assert [o['InstanceType'] for o in policy['LaunchTemplate']['Overrides']] == [
+    {'Ref': 'TestAsgInstanceType'}, 't4g.medium', 'm7g.medium'
+  ]
+  instance_type_param = template.find_parameters('TestAsgInstanceType')['TestAsgInstanceType']
+  assert 't4g.medium' not in instance_type_param['AllowedValues']
+
+def test_mixed_instances_policy_requires_types():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  with pytest.raises(ValueError):
+    Asg(
+      stack,
+      'TestAsg',
+      ami_id="test",
+      use_mixed_instances_policy=True,
+      vpc=vpc
+    )
+
+def test_warm_pool():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    use_warm_pool=True,
+    user_data_contents='#!/bin/bash\necho ${MYVAR}\n',
+    user_data_variables={ 'MYVAR': 'Ref: MyParam' },
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  # print_resource(template, 'AWS::AutoScaling::WarmPool')
+  template.has_resource_properties('AWS::AutoScaling::WarmPool', {
+    'AutoScalingGroupName': {'Ref': 'TestAsg'},
+    'PoolState': {'Ref': 'TestAsgWarmPoolState'}
+  })
+  template.has_resource_properties('AWS::AutoScaling::AutoScalingGroup', {
+    'LifecycleHookSpecificationList': [{
+      'LifecycleHookName': 'TestAsgLaunchLifecycleHook',
+      'LifecycleTransition': 'autoscaling:EC2_INSTANCE_LAUNCHING'
+    }]
+  })
+  role = template.find_resources('AWS::IAM::Role')
+  assert 'AllowCompleteLifecycleAction' in [p['PolicyName'] for p in role['TestAsgInstanceRole']['Properties']['Policies']]
+  template.has_parameter('TestAsgWarmPoolState', {
+    'AllowedValues': ['Stopped', 'Running']
+  })
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert 'autoscaling/target-lifecycle-state' in contents
+  assert 'systemctl enable --now asg-complete-lifecycle-action.service' in contents
+  # the marker is set by an exit trap, which is in place before the pattern user data can exit early
+  assert contents.index('touch /var/lib/cloud/asg-bootstrap-complete; fi\' EXIT') < contents.index('echo ${MYVAR}')
+
+def test_instance_refresh_deploy_asg():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    deployment_instance_refresh=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  # print(json.dumps(template.to_json(), indent=4, sort_keys=True))
+  asg = template.find_resources('AWS::AutoScaling::AutoScalingGroup')['TestAsg']
+  assert 'AutoScalingReplacingUpdate' not in asg['UpdatePolicy']
+  assert 'AutoScalingRollingUpdate' not in asg['UpdatePolicy']
+  template.has_resource_properties('AWS::CloudFormation::CustomResource', {
+    'asg_name': {'Ref': 'TestAsg'},
+    'launch_template_version': {'Fn::GetAtt': ['TestAsgLaunchTemplate', 'LatestVersionNumber']},
+    'skip_matching': {'Ref': 'TestAsgInstanceRefreshSkipMatching'}
+  })
+  custom_resource = template.find_resources('AWS::CloudFormation::CustomResource')['TestAsgInstanceRefreshCustomResource']
+  assert 'TestAsgInstanceRefreshPolicy' in custom_resource['DependsOn']
+  pattern = re.compile(template.find_parameters('TestAsgInstanceRefreshCheckpointPercentages')['TestAsgInstanceRefreshCheckpointPercentages']['AllowedPattern'])
+  assert [value for value in ['', '100', '20,50,100', '20,50', '100,100'] if pattern.match(value)] == ['', '100', '20,50,100']
+
+def test_predictive_scaling():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    use_target_tracking_scaling=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  # print_resource(template, 'AWS::AutoScaling::ScalingPolicy')
+  template.has_resource('AWS::AutoScaling::ScalingPolicy', {
+    'Condition': 'TestAsgPredictiveCpuScalingCondition',
+    'Properties': {
+      'PolicyType': 'PredictiveScaling',
+      'PredictiveScalingConfiguration': {
+        'MetricSpecifications': [{
+          'PredefinedMetricPairSpecification': {'PredefinedMetricType': 'ASGCPUUtilization'},
+          'TargetValue': {'Ref': 'TestAsgScalingCpuTarget'}
+        }],
+        'Mode': {'Ref': 'TestAsgPredictiveScalingMode'},
+        'SchedulingBufferTime': {'Ref': 'TestAsgPredictiveScalingSchedulingBuffer'}
+      }
+    }
+  })
+  mode_param = template.find_parameters('TestAsgPredictiveScalingMode')['TestAsgPredictiveScalingMode']
+  assert mode_param['Default'] == 'Disabled'
+
+def test_scheduled_actions():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  asg = Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    use_business_hours_schedule=True,
+    vpc=vpc
+  )
+  asg.add_scheduled_action('BatchWindow', '0 1 * * *', desired_capacity=4, time_zone='America/New_York')
+  template = assertions.Template.from_stack(stack)
+  # print_resource(template, 'AWS::AutoScaling::ScheduledAction')
+  template.resource_count_is('AWS::AutoScaling::ScheduledAction', 3)
+  template.has_resource('AWS::AutoScaling::ScheduledAction', {
+    'Condition': 'TestAsgBusinessHoursScheduleCondition',
+    'Properties': {
+      'MinSize': {'Ref': 'TestAsgOffHoursCapacity'},
+      'DesiredCapacity': {'Ref': 'TestAsgOffHoursCapacity'},
+      'Recurrence': {'Ref': 'TestAsgBusinessHoursEnd'}
+    }
+  })
+  scheduled_actions = template.find_resources('AWS::AutoScaling::ScheduledAction')
+  assert scheduled_actions['TestAsgBatchWindowScheduledAction']['Properties'] == {
+    'AutoScalingGroupName': {'Ref': 'TestAsg'},
+    'DesiredCapacity': 4,
+    'Recurrence': '0 1 * * *',
+    'TimeZone': 'America/New_York'
+  }
+
+def test_volume_performance_params():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    root_volume_size=10,
+    use_data_volume=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  # print(json.dumps(template.to_json()['Rules'], indent=4, sort_keys=True))
+  template.has_resource_properties('AWS::EC2::Volume', {
+    'Iops': {'Ref': 'TestAsgDataVolumeIops'},
+    'Throughput': {'Fn::If': ['TestAsgDataVolumeGp3Condition', {'Ref': 'TestAsgDataVolumeThroughput'}, {'Ref': 'AWS::NoValue'}]},
+    'VolumeType': {'Ref': 'TestAsgDataVolumeType'}
+  })
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')
+  ebs = launch_template['TestAsgLaunchTemplate']['Properties']['LaunchTemplateData']['BlockDeviceMappings'][0]['Ebs']
+  assert ebs['Iops'] == {'Ref': 'TestAsgRootVolumeIops'}
+  rules = template.to_json()['Rules']
+  # 10 GiB gp3 root volume supports at most 5000 IOPS
+  root_iops = rules['TestAsgRootVolumeGp3PerformanceRule']['Assertions'][0]['Assert']['Fn::Contains'][0]
+  assert root_iops == ['3000', '4000', '5000']
+  assert 'TestAsgRootVolumeIo2PerformanceRule' in rules
+  assert 'TestAsgDataVolumeGp3PerformanceRule' in rules
+  # the data volume size is a parameter, each IOPS tier lists the sizes that are too small
+  io2_assertions = rules['TestAsgDataVolumeIo2PerformanceRule']['Assertions']
+  assert len(io2_assertions) == 12
+  not_iops, not_size = io2_assertions[-1]['Assert']['Fn::Or']
+  assert not_iops == {'Fn::Not': [{'Fn::Equals': [{'Ref': 'TestAsgDataVolumeIops'}, '64000']}]}
+  too_small, size = not_size['Fn::Not'][0]['Fn::Contains']
+  assert too_small == [str(size) for size in range(1, 64)]
+  assert size == {'Ref': 'TestAsgDataVolumeSize'}
+  gp3_size_assertions = [assertion for assertion in rules['TestAsgDataVolumeGp3PerformanceRule']['Assertions'] if 'GiB' in assertion['AssertDescription']]
+  assert gp3_size_assertions[-1]['AssertDescription'] == 'The EBS data volume IOPS of 16000 requires a gp3 volume of at least 32 GiB.'
+
+def test_striped_data_volumes():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    data_volume_count=3,
+    singleton=True,
+    use_data_volume=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  # print(json.dumps(template.to_json(), indent=4, sort_keys=True))
+  template.resource_count_is("AWS::EC2::Volume", 3)
+  volumes = template.find_resources('AWS::EC2::Volume')
+  assert sorted(volumes.keys()) == ['TestAsgDataVolume', 'TestAsgDataVolume2', 'TestAsgDataVolume3']
+  assert volumes['TestAsgDataVolume3']['Properties']['SnapshotId'] == {
+    'Fn::If': [
+      'TestAsgDataVolumeSnapshotsCondition',
+      {'Fn::Select': [2, {'Fn::Split': [',', {'Ref': 'TestAsgDataVolumeSnapshots'}]}]},
+      {'Ref': 'AWS::NoValue'}
+    ]
+  }
+  assert template.find_parameters('TestAsgDataVolumeSnapshot') == {}
+  pattern = template.find_parameters('TestAsgDataVolumeSnapshots')['TestAsgDataVolumeSnapshots']['AllowedPattern']
+  assert re.match(pattern, '')
+  assert re.match(pattern, 'snap-0123,snap-4567,snap-89ab')
+  assert not re.match(pattern, 'snap-0123,snap-4567')
+  # the volumes are snapshotted together as a set, not one by one by AWS Backup
+  template.resource_count_is('AWS::Backup::BackupSelection', 0)
+  assert template.find_parameters('TestAsgDataVolumeBackupVaultArn') == {}
+  policy = template.find_resources('AWS::DLM::LifecyclePolicy')['TestAsgDataVolumeSnapshotPolicy']
+  policy_details = policy['Properties']['PolicyDetails']
+  assert policy_details['ResourceTypes'] == ['INSTANCE']
+  assert policy_details['Parameters'] == {'ExcludeBootVolume': True}
+  assert policy_details['Schedules'][0]['RetainRule'] == {'Count': {'Ref': 'TestAsgDataVolumeBackupRetentionPeriod'}}
+  target_tag = policy_details['TargetTags'][0]
+  asg_tags = template.find_resources('AWS::AutoScaling::AutoScalingGroup')['TestAsg']['Properties']['Tags']
+  assert {'Key': target_tag['Key'], 'PropagateAtLaunch': True, 'Value': target_tag['Value']} in asg_tags
+
+def test_instance_store_mount_path():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    instance_store_mount_path="/mnt/cache",
+    user_data_contents='#!/bin/bash\necho ${InstanceStorePath}\n',
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert 'Amazon EC2 NVMe Instance Storage' in contents
+  assert contents.index('asg-mount-instance-store.sh') < contents.index('echo ${InstanceStorePath}')
+  assert variables['InstanceStorePath'] == '/mnt/cache'
+
+def test_metrics_profile():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    metrics_profile="high-resolution",
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub'][0]
+  assert contents.index('systemctl start amazon-cloudwatch-agent') < contents.index('append-config')
+
+def test_cloudwatch_agent_config():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    cloudwatch_agent_log_files=[{ "file_path": "/var/log/app.log" }],
+    metrics_profile="high-resolution",
+    use_cloudwatch_agent_config=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_resource_properties('AWS::SSM::Parameter', {
+    'Tier': 'Intelligent-Tiering',
+    'Type': 'String'
+  })
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert 'fetch-config' in contents
+  assert 'append-config' not in contents
+  assert 'PLACEHOLDER' not in contents
+  assert variables['AsgCloudWatchAgentConfigParameter'] == {'Ref': 'TestAsgCloudWatchAgentConfigParameter'}
+
+def test_compressed_user_data():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    use_compressed_user_data=True,
+    use_data_volume=True,
+    user_data_contents='#!/bin/bash\necho ${MYVAR}\n',
+    user_data_variables={ 'MYVAR': 'test' },
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert contents.startswith('Content-Type: multipart/mixed')
+  assert '${MYVAR}' in contents
+  assert '${EbsIds}' in contents
+  assert variables['MYVAR'] == 'test'
+
+def test_compressed_user_data_too_large():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  with pytest.raises(ValueError, match='user_data_contents'):
+    Asg(
+      stack,
+      'TestAsg',
+      ami_id="test",
+      use_compressed_user_data=True,
+      user_data_contents=''.join('echo ${{Var{}}}\n'.format(i) for i in range(200)),
+      vpc=vpc
+    )
+
+def test_graceful_drain():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    drain_ports=[8080],
+    use_graceful_drain=True,
+    use_warm_pool=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_resource_properties('AWS::AutoScaling::AutoScalingGroup', {
+    'LifecycleHookSpecificationList': [
+      assertions.Match.object_like({
+        'LifecycleHookName': 'TestAsgLaunchLifecycleHook',
+        'LifecycleTransition': 'autoscaling:EC2_INSTANCE_LAUNCHING'
+      }),
+      {
+        'DefaultResult': 'CONTINUE',
+        'HeartbeatTimeout': {'Ref': 'TestAsgDrainTimeout'},
+        'LifecycleHookName': 'TestAsgTerminationLifecycleHook',
+        'LifecycleTransition': 'autoscaling:EC2_INSTANCE_TERMINATING'
+      }
+    ]
+  })
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert 'asg-graceful-drain.service' in contents
+  assert variables['AsgDrainPorts'] == '8080'
+  assert variables['AsgTerminationLifecycleHookName'] == 'TestAsgTerminationLifecycleHook'
+
+def test_cluster_placement_group():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    default_instance_type="c7g.large",
+    placement_strategy="cluster",
+    use_public_subnets=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_resource_properties('AWS::EC2::PlacementGroup', {
+    'Strategy': 'cluster'
+  })
+  template.has_resource_properties('AWS::EC2::LaunchTemplate', {
+    'LaunchTemplateData': assertions.Match.object_like({
+      'Placement': {'GroupName': {'Ref': 'TestAsgPlacementGroup'}}
+    })
+  })
+  asg = template.find_resources('AWS::AutoScaling::AutoScalingGroup')['TestAsg']
+  assert len(asg['Properties']['VPCZoneIdentifier']) == 1
+  allowed_values = template.find_parameters('TestAsgInstanceType')['TestAsgInstanceType']['AllowedValues']
+  assert 't4g.small' not in allowed_values
+
+def test_partition_placement_group():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    placement_partition_count=3,
+    placement_strategy="partition",
+    singleton=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_resource_properties('AWS::EC2::PlacementGroup', {
+    'PartitionCount': 3,
+    'Strategy': 'partition'
+  })
+
+def test_placement_group_invalid_combinations():
+  for kwargs in [
+    { 'placement_strategy': 'host' },
+    { 'placement_strategy': 'partition' },
+    { 'placement_strategy': 'partition', 'placement_partition_count': 8 },
+    { 'placement_strategy': 'spread', 'placement_partition_count': 2 },
+    { 'placement_strategy': 'cluster' }
+  ]:
+    stack = Stack()
+    vpc = Vpc(stack, 'TestVpc')
+    with pytest.raises(ValueError):
+      Asg(stack, 'TestAsg', ami_id="test", vpc=vpc, **kwargs)
+
+def test_cpu_credits():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    notification_topic_arn="arn:aws:sns:us-east-1:123456789012:test",
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_resource_properties('AWS::EC2::LaunchTemplate', {
+    'LaunchTemplateData': assertions.Match.object_like({
+      'CreditSpecification': {
+        'Fn::If': [
+          'TestAsgBurstableInstanceTypeCondition',
+          {'CpuCredits': {'Ref': 'TestAsgCpuCredits'}},
+          {'Ref': 'AWS::NoValue'}
+        ]
+      }
+    })
+  })
+  condition = template.find_conditions('TestAsgBurstableInstanceTypeCondition')['TestAsgBurstableInstanceTypeCondition']
+  assert condition['Fn::Equals'][1] == 't4g'
+  for name in ['TestAsgCpuCreditBalanceAlarm', 'TestAsgCpuSurplusCreditsChargedAlarm']:
+    alarm = template.find_resources('AWS::CloudWatch::Alarm')[name]
+    assert alarm['Condition'] == 'TestAsgBurstableInstanceTypeCondition'
+    assert alarm['Properties']['AlarmActions'] == ["arn:aws:sns:us-east-1:123456789012:test"]
+
+def test_cpu_credits_without_burstable_types():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    allowed_instance_types=['m7g.large', 'm7g.xlarge'],
+    ami_id="test",
+    default_instance_type='m7g.large',
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  assert template.find_parameters('TestAsgCpuCredits') == {}
+  template.resource_count_is('AWS::CloudWatch::Alarm', 1)
+
+def test_hibernation():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    default_instance_type="m5.large",
+    root_volume_size=20,
+    use_graviton=False,
+    use_hibernation=True,
+    use_warm_pool=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_parameter('TestAsgWarmPoolState', {
+    'AllowedValues': ['Stopped', 'Hibernated', 'Running']
+  })
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  launch_template_data = launch_template['Properties']['LaunchTemplateData']
+  assert launch_template_data['HibernationOptions'] == {'Configured': True}
+  ebs = launch_template_data['BlockDeviceMappings'][0]['Ebs']
+  assert ebs['Encrypted'] == True
+  assert ebs['VolumeSize'] == {'Fn::FindInMap': ['TestAsgHibernationRootVolumeSize', {'Ref': 'TestAsgInstanceType'}, 'Size']}
+  mapping = template.find_mappings('TestAsgHibernationRootVolumeSize')['TestAsgHibernationRootVolumeSize']
+  assert mapping['m5.large'] == {'Size': 28}
+  allowed_values = template.find_parameters('TestAsgInstanceType')['TestAsgInstanceType']['AllowedValues']
+  assert sorted(allowed_values) == sorted(mapping.keys())
+  assert 'm5.24xlarge' not in allowed_values
+
+def test_hibernation_invalid():
+  for kwargs in [
+    { 'root_volume_size': 20, 'use_warm_pool': True },
+    { 'default_instance_type': 'm5.large', 'use_graviton': False, 'use_warm_pool': True },
+    { 'default_instance_type': 'm5.24xlarge', 'root_volume_size': 20, 'use_graviton': False, 'use_warm_pool': True },
+    { 'default_instance_type': 'm5.large', 'root_volume_size': 20, 'use_graviton': False },
+    { 'default_instance_type': 'm5d.large', 'root_volume_size': 20, 'use_graviton': False, 'use_warm_pool': True },
+    { 'default_instance_type': 'm5.large', 'instance_store_mount_path': '/scratch', 'root_volume_size': 20, 'use_graviton': False, 'use_warm_pool': True }
+  ]:
+    stack = Stack()
+    vpc = Vpc(stack, 'TestVpc')
+    with pytest.raises(ValueError):
+      Asg(stack, 'TestAsg', ami_id="test", use_hibernation=True, vpc=vpc, **kwargs)
+
+def test_hibernation_singleton():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    default_instance_type="m5.large",
+    root_volume_size=20,
+    singleton=True,
+    use_graviton=False,
+    use_hibernation=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  assert launch_template['Properties']['LaunchTemplateData']['HibernationOptions'] == {'Configured': True}
+  documents = template.find_resources('AWS::SSM::Document')
+  hibernate_steps = documents['TestAsgHibernateDocument']['Properties']['Content']['mainSteps']
+  assert [step['inputs'].get('Api') for step in hibernate_steps] == ['DescribeAutoScalingGroups', 'SuspendProcesses', 'StopInstances', 'DescribeInstances']
+  assert hibernate_steps[1]['inputs']['AutoScalingGroupName'] == {'Ref': 'TestAsg'}
+  assert hibernate_steps[1]['inputs']['ScalingProcesses'] == ['HealthCheck', 'ReplaceUnhealthy', 'AZRebalance']
+  assert hibernate_steps[2]['inputs']['Hibernate'] == True
+  resume_steps = documents['TestAsgResumeDocument']['Properties']['Content']['mainSteps']
+  assert [step['inputs'].get('Api') for step in resume_steps] == ['DescribeAutoScalingGroups', 'StartInstances', 'DescribeInstances', 'ResumeProcesses']
+
+def test_capacity_reservation():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    use_capacity_reservation=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_resource_properties('AWS::EC2::LaunchTemplate', {
+    'LaunchTemplateData': assertions.Match.object_like({
+      'CapacityReservationSpecification': {
+        'Fn::If': [
+          'TestAsgCapacityReservationTargetedCondition',
+          {
+            'CapacityReservationTarget': {
+              'Fn::If': [
+                'TestAsgCapacityReservationResourceGroupCondition',
+                {'CapacityReservationResourceGroupArn': {'Ref': 'TestAsgCapacityReservationTarget'}},
+                {'CapacityReservationId': {'Ref': 'TestAsgCapacityReservationTarget'}}
+              ]
+            }
+          },
+          {'CapacityReservationPreference': {'Ref': 'TestAsgCapacityReservationPreference'}}
+        ]
+      }
+    })
+  })
+  rules = template.to_json()['Rules']
+  assert 'TestAsgCapacityReservationTargetRule' in rules
+
+def test_data_volume_fast_snapshot_restore():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    data_volume_restore_mode="fast_snapshot_restore",
+    singleton=True,
+    use_data_volume=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  custom_resources = template.find_resources('AWS::CloudFormation::CustomResource')
+  enable = custom_resources['TestAsgEnableFastSnapshotRestoreCustomResource']
+  disable = custom_resources['TestAsgDisableFastSnapshotRestoreCustomResource']
+  assert enable['Properties']['snapshot_id'] == {'Ref': 'TestAsgDataVolumeSnapshot'}
+  assert disable['Properties']['volume_id'] == {'Ref': 'TestAsgDataVolume'}
+  volume = template.find_resources('AWS::EC2::Volume')['TestAsgDataVolume']
+  assert 'TestAsgEnableFastSnapshotRestoreCustomResource' in volume['DependsOn']
+
+def test_data_volume_prewarm():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  asg = Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    data_volume_restore_mode="prewarm",
+    singleton=True,
+    use_data_volume=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert contents.index('EBS Volume setup completed') < contents.index('asg-prewarm-data-volume.sh')
+  assert variables['AsgDataVolumePrewarmRate'] == {'Ref': 'TestAsgDataVolumePrewarmRate'}
+  assert asg.data_volume_prewarm_rate_param.logical_id in asg.metadata_parameter_group()[0]['Parameters']
+  assert asg.data_volume_prewarm_rate_param.logical_id in asg.metadata_parameter_labels()
+
+def test_data_volume_restore_mode_invalid():
+  for kwargs in [
+    { 'data_volume_restore_mode': 'prewarm' },
+    { 'data_volume_restore_mode': 'prewarm', 'use_data_volume': True, 'data_volume_count': 2 },
+    { 'data_volume_restore_mode': 'hydrate', 'use_data_volume': True }
+  ]:
+    stack = Stack()
+    vpc = Vpc(stack, 'TestVpc')
+    with pytest.raises(ValueError):
+      Asg(stack, 'TestAsg', ami_id="test", vpc=vpc, **kwargs)
+
+def test_data_volume_recovery():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    singleton=True,
+    use_data_volume=True,
+    use_data_volume_recovery=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  template.has_parameter('TestAsgDataVolumeRecoverySubnet', {
+    'AllowedValues': ['', '1', '2'],
+    'Default': ''
+  })
+  custom_resource = template.find_resources('AWS::CloudFormation::CustomResource')['TestAsgDataVolumeRecoveryCustomResource']
+  assert custom_resource['Properties']['recovery_subnet'] == {'Ref': 'TestAsgDataVolumeRecoverySubnet'}
+  volume = template.find_resources('AWS::EC2::Volume')['TestAsgDataVolume']
+  condition, recovered, snapshot = volume['Properties']['SnapshotId']['Fn::If']
+  assert condition == 'TestAsgDataVolumeRecoveryCondition'
+  assert recovered == {'Fn::GetAtt': ['TestAsgDataVolumeRecoveryCustomResource', 'snapshot_id']}
+  assert volume['Properties']['AvailabilityZone']['Fn::If'][0] == 'TestAsgDataVolumeRecoverySubnet2Condition'
+  asg = template.find_resources('AWS::AutoScaling::AutoScalingGroup')['TestAsg']
+  assert asg['Properties']['VPCZoneIdentifier'][0]['Fn::If'][0] == 'TestAsgDataVolumeRecoverySubnet2Condition'
+
+def test_data_volume_recovery_invalid():
+  for kwargs in [
+    { 'use_data_volume': True },
+    { 'singleton': True },
+    { 'singleton': True, 'use_data_volume': True, 'data_volume_count': 2 }
+  ]:
+    stack = Stack()
+    vpc = Vpc(stack, 'TestVpc')
+    with pytest.raises(ValueError):
+      Asg(stack, 'TestAsg', ami_id="test", vpc=vpc, use_data_volume_recovery=True, **kwargs)
+
+def test_performance_profile():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    performance_profile="web",
+    user_data_contents="# pattern user data\n",
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert 'net.core.somaxconn = 65535' in contents
+  assert contents.index('Applying web performance profile') < contents.index('# pattern user data')
+
+def test_data_volume_filesystem_options():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    data_volume_count=4,
+    data_volume_filesystem="ext4",
+    data_volume_mkfs_options="-I 512",
+    data_volume_mount_options=["noatime", "nodiratime"],
+    data_volume_trim="discard",
+    use_data_volume=True,
+    vpc=vpc
+  )
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert variables['DataVolumeFilesystem'] == 'ext4'
+  assert variables['DataVolumeMkfsOptions'] == '-E stride=128,stripe_width=512 -I 512'
+  assert variables['DataVolumeMountOptions'] == 'defaults,noatime,nodiratime,nofail,discard'
+  alarm = template.find_resources('AWS::CloudWatch::Alarm')['TestAsgDataDiskAlarm']
+  assert {'Name': 'fstype', 'Value': 'ext4'} in alarm['Properties']['Dimensions']
+
+def test_data_volume_filesystem_options_invalid():
+  for kwargs in [
+    { 'data_volume_filesystem': 'btrfs' },
+    { 'data_volume_trim': 'weekly' },
+    { 'data_volume_mount_options': ['discard'] },
+    { 'data_volume_mount_options': ['allocsize=64m'], 'data_volume_filesystem': 'ext4' }
+  ]:
+    stack = Stack()
+    vpc = Vpc(stack, 'TestVpc')
+    with pytest.raises(ValueError):
+      Asg(stack, 'TestAsg', ami_id="test", vpc=vpc, use_data_volume=True, **kwargs)
+
+def test_bootstrap_runner():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  asg = Asg(
+    stack,
+    'TestAsg',
+    ami_id="test",
+    bootstrap_steps=[
+      { 'name': 'packages', 'contents': 'apt-get install -y nginx\n' },
+      { 'name': 'config', 'contents': 'aws s3 cp s3://bucket/config /etc/app\n', 'depends_on': ['data_volume'] }
+    ],
+    instance_store_mount_path="/scratch",
+    use_bootstrap_runner=True,
+    use_data_volume=True,
+    use_warm_pool=True,
+    user_data_contents="# pattern user data\n",
+    vpc=vpc
+  )
+  steps = { step['name']: step.get('depends_on', []) for step in asg.bootstrap_runner.steps }
+  assert steps == {
+    'cloudwatch_agent': [],
+    'data_volume': [],
+    'instance_store': ['data_volume'],
+    'packages': [],
+    'config': ['data_volume'],
+    'user_data': ['cloudwatch_agent', 'data_volume', 'instance_store', 'packages', 'config']
+  }
+  template = assertions.Template.from_stack(stack)
+  launch_template = template.find_resources('AWS::EC2::LaunchTemplate')['TestAsgLaunchTemplate']
+  contents, variables = launch_template['Properties']['LaunchTemplateData']['UserData']['Fn::Base64']['Fn::Sub']
+  assert variables['AsgId'] == 'TestAsg'
+  assert contents.index('All bootstrap steps completed') < contents.index('touch /var/lib/cloud/asg-bootstrap-complete')
+
+def test_bootstrap_steps_without_runner():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  with pytest.raises(ValueError):
+    Asg(stack, 'TestAsg', ami_id="test", vpc=vpc, bootstrap_steps=[{ 'name': 'packages', 'contents': '' }])
+
+def test_request_count_scaling_policy_registers_target_group():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  asg = Asg(stack, 'TestAsg', ami_id="test", use_target_tracking_scaling=True, vpc=vpc)
+  alb = Alb(stack, 'TestAlb', asg=asg, vpc=vpc)
+  asg.add_request_count_scaling_policy(alb)
+  template = assertions.Template.from_stack(stack)
+  asg_resource = template.find_resources('AWS::AutoScaling::AutoScalingGroup')['TestAsg']
+  assert asg_resource['Properties']['TargetGroupARNs'] == [{'Ref': 'TestAlbTargetGroup'}]
+
+def test_request_count_scaling_policy_invalid():
+  for kwargs in [
+    { 'singleton': True, 'use_target_tracking_scaling': True },
+    {}
+  ]:
+    stack = Stack()
+    vpc = Vpc(stack, 'TestVpc')
+    asg = Asg(stack, 'TestAsg', ami_id="test", vpc=vpc, **kwargs)
+    alb = Alb(stack, 'TestAlb', asg=asg, vpc=vpc)
+    with pytest.raises(ValueError):
+      asg.add_request_count_scaling_policy(alb)
@@ -0,0 +1,61 @@
+import pytest
+import subprocess
+
+from oe_patterns_cdk_common.bootstrap_runner import BootstrapRunner
+
+def run(steps, directory):
+  contents = "".join(contents for name, contents in BootstrapRunner(steps).parts())
+  contents = contents.replace("${AWS::StackName}", "test").replace("${AsgId}", "TestAsg").replace("${AWS::Region}", "us-east-1")
+  return subprocess.run(['bash', '-c', contents], capture_output=True, text=True)
+
+def test_parts():
+  parts = BootstrapRunner([
+    { 'name': 'packages', 'contents': 'cat <<EOF\nnested\nEOF\n' },
+    { 'name': 'user_data', 'contents': 'echo done', 'depends_on': ['packages'] }
+  ]).parts()
+  assert [name for name, contents in parts] == ['bootstrap_runner_setup', 'bootstrap_step_packages', 'bootstrap_step_user_data', 'bootstrap_runner']
+  assert '    user_data) echo "packages" ;;' in parts[-1][1]
+  assert 'cfn-signal --exit-code 1 --stack "${AWS::StackName}" --resource "${AsgId}"' in parts[-1][1]
+  assert 'Failure already signaled' not in parts[-1][1]
+
+def test_step_script():
+  runner = BootstrapRunner([{ 'name': 'user_data', 'contents': '\n#!/bin/sh\necho hello\n' }])
+  lines = runner.step_script(runner.steps[0]).split('\n')
+  assert lines[2:5] == ['#!/bin/bash', f'source {BootstrapRunner.DIRECTORY}/env', 'echo hello']
+
+def test_run_order_and_failure(monkeypatch, tmp_path):
+  monkeypatch.setattr(BootstrapRunner, 'DIRECTORY', str(tmp_path))
+  result = run([
+    { 'name': 'slow', 'contents': f'sleep 1\ndate +%s%N > {tmp_path}/slow' },
+    { 'name': 'fast', 'contents': f'date +%s%N > {tmp_path}/fast' },
+    { 'name': 'after_slow', 'contents': f'date +%s%N > {tmp_path}/after_slow', 'depends_on': ['slow', 'fast'] },
+    { 'name': 'broken', 'contents': 'exit 3' },
+    { 'name': 'after_broken', 'contents': f'touch {tmp_path}/after_broken', 'depends_on': ['broken'] }
+  ], tmp_path)
+  assert result.returncode == 1
+  assert 'steps not completed: broken after_broken' in result.stdout
+  assert int((tmp_path / 'fast').read_text()) < int((tmp_path / 'slow').read_text()) < int((tmp_path / 'after_slow').read_text())
+  assert not (tmp_path / 'after_broken').exists()
+  assert (tmp_path / 'status' / 'broken').read_text() == '3\n'
+  assert (tmp_path / 'status' / 'after_broken').read_text() == 'skipped\n'
+
+def test_run_success(monkeypatch, tmp_path):
+  monkeypatch.setattr(BootstrapRunner, 'DIRECTORY', str(tmp_path))
+  result = run([
+    { 'name': 'first', 'contents': 'echo "DEVICE=/dev/md0" >> $ASG_BOOTSTRAP_ENV\necho hello' },
+    { 'name': 'second', 'contents': 'log "device $DEVICE"', 'depends_on': ['first'] }
+  ], tmp_path)
+  assert result.returncode == 0
+  assert '[first] hello' in result.stdout
+  assert (tmp_path / 'logs' / 'first.log').read_text() == 'hello\n'
+  assert 'device /dev/md0' in (tmp_path / 'logs' / 'second.log').read_text()
+
+def test_invalid_steps():
+  for steps in [
+    [{ 'name': 'Bad-Name', 'contents': '' }],
+    [{ 'name': 'twice', 'contents': '' }, { 'name': 'twice', 'contents': '' }],
+    [{ 'name': 'orphan', 'contents': '', 'depends_on': ['missing'] }],
+    [{ 'name': 'a', 'contents': '', 'depends_on': ['b'] }, { 'name': 'b', 'contents': '', 'depends_on': ['a'] }]
+  ]:
+    with pytest.raises(ValueError):
+      BootstrapRunner(steps)
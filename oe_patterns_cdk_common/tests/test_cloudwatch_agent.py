@@ -0,0 +1,66 @@
+import json
+import pytest
+
+from oe_patterns_cdk_common.cloudwatch_agent import CloudWatchAgentConfig
+
+def test_standard_profile():
+  config = CloudWatchAgentConfig()
+  assert config.metrics_collection_interval == 60
+  assert config.metrics_collected() == {}
+  assert config.metrics_profile_script() == ""
+
+def test_high_resolution_profile():
+  config = CloudWatchAgentConfig(
+    metrics_profile="high-resolution",
+    procstat_patterns=["nginx", "php-fpm"]
+  )
+  metrics_collected = config.metrics_collected()
+  assert sorted(metrics_collected.keys()) == ['diskio', 'mem', 'netstat', 'procstat', 'swap']
+  assert metrics_collected['mem']['metrics_collection_interval'] == 10
+  assert 'iops_in_progress' in metrics_collected['diskio']['measurement']
+  assert [item['pattern'] for item in metrics_collected['procstat']] == ['nginx', 'php-fpm']
+  script = config.metrics_profile_script()
+  assert 'append-config' in script
+  assert '${' not in script
+  assert json.loads(script.split('\n')[3])['metrics']['metrics_collected'] == metrics_collected
+
+def test_detailed_profile_without_procstat_patterns():
+  config = CloudWatchAgentConfig(metrics_profile="detailed", metrics_collection_interval=30)
+  metrics_collected = config.metrics_collected()
+  assert 'procstat' not in metrics_collected
+  assert metrics_collected['netstat']['metrics_collection_interval'] == 30
+
+def test_invalid_profile():
+  with pytest.raises(ValueError):
+    CloudWatchAgentConfig(metrics_profile="verbose")
+  with pytest.raises(ValueError):
+    CloudWatchAgentConfig(metrics_profile="high-resolution", metrics_collection_interval=5)
+
+def test_config():
+  config = CloudWatchAgentConfig(metrics_profile="detailed").config(
+    "app-log-group",
+    "system-log-group",
+    log_files=[
+      { "file_path": "/var/log/nginx/error.log", "multi_line_start_pattern": "^\\d{4}/" },
+      { "file_path": "/var/log/php-fpm.log", "log_group": "system", "log_stream_name": "{instance_id}/php-fpm" }
+    ],
+    emf=True
+  )
+  collect_list = config['logs']['logs_collected']['files']['collect_list']
+  assert collect_list[0]['log_group_name'] == 'system-log-group'
+  assert collect_list[-2] == {
+    'file_path': '/var/log/nginx/error.log',
+    'log_group_name': 'app-log-group',
+    'log_stream_name': '{instance_id}/var/log/nginx/error.log',
+    'multi_line_start_pattern': '^\\d{4}/'
+  }
+  assert collect_list[-1]['log_stream_name'] == '{instance_id}/php-fpm'
+  assert config['logs']['logs_collected']['emf'] == {}
+  metrics_collected = config['metrics']['metrics_collected']
+  assert metrics_collected['disk']['measurement'] == ['used_percent']
+  assert 'mem' in metrics_collected
+  assert ['AutoScalingGroupName', 'fstype', 'path'] in config['metrics']['aggregation_dimensions']
+
+def test_config_invalid_log_group():
+  with pytest.raises(ValueError):
+    CloudWatchAgentConfig().config("app", "system", log_files=[{ "file_path": "/tmp/x.log", "log_group": "audit" }])
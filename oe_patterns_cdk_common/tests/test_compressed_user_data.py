@@ -0,0 +1,36 @@
+import email
+import gzip
+import pytest
+import random
+import string
+
+from oe_patterns_cdk_common.compressed_user_data import CompressedUserData
+
+def test_contents():
+  user_data = CompressedUserData([
+    ("script.sh", "#!/bin/bash\necho ${AWS::Region} ${AsgId} ${!Literal}\n"),
+    ("reprovision_snippet", "\n# reprovision string: ${AsgReprovisionString}")
+  ])
+  assert user_data.variable_names == ['AWS::Region', 'AsgId', 'AsgReprovisionString']
+  message = email.message_from_string(user_data.contents())
+  variables_part, compressed_part = message.get_payload()
+  assert variables_part.get_content_type() == 'text/x-shellscript'
+  assert '${AsgId}' in variables_part.get_payload()
+  assert compressed_part.get_content_type() == 'application/x-gzip'
+  render_script = gzip.decompress(compressed_part.get_payload(decode=True)).decode('utf-8')
+  assert 'echo ${AWS::Region} ${AsgId} ${!Literal}' in render_script
+  # only the variables part is visible to Fn::Sub
+  assert '${!Literal}' not in user_data.contents()
+
+def test_check_size():
+  user_data = CompressedUserData([
+    ("script.sh", "#!/bin/bash\n" + "echo compressible\n" * 2000)
+  ])
+  user_data.check_size()
+  rng = random.Random(0)
+  user_data = CompressedUserData([
+    ("script.sh", "#!/bin/bash\n"),
+    ("random.sh", ''.join(rng.choice(string.ascii_letters) for i in range(30000)))
+  ])
+  with pytest.raises(ValueError, match=r'random\.sh: 30000 bytes'):
+    user_data.check_size()
@@ -0,0 +1,43 @@
+from oe_patterns_cdk_common.instance_types import InstanceTypes
+
+def test_get():
+  instance_type = InstanceTypes.get('r6gd.large')
+  assert instance_type.family == 'r6gd'
+  assert instance_type.generation == 6
+  assert instance_type.architecture == InstanceTypes.ARM64
+  assert instance_type.vcpu == 2
+  assert instance_type.memory_gib == 16
+  assert instance_type.local_nvme_gb > 0
+  assert not instance_type.burstable
+
+def test_get_service_names():
+  assert InstanceTypes.get('db.r6g.large').name == 'r6g.large'
+  assert InstanceTypes.get('cache.t4g.micro').burstable
+  assert InstanceTypes.get('t3.small.search').architecture == InstanceTypes.X86_64
+  assert InstanceTypes.get('z9.large') is None
+
+def test_query_by_characteristics():
+  instance_types = InstanceTypes.query(
+    architecture=InstanceTypes.ARM64,
+    current_generation=True,
+    min_memory_gib=16,
+    min_vcpu=4
+  )
+  assert 'm7g.xlarge' in instance_types
+  assert 'r8g.xlarge' in instance_types
+  assert 'm7g.large' not in instance_types
+  assert 'm5.xlarge' not in instance_types
+
+def test_query_families_order():
+  instance_types = InstanceTypes.query(families=['r7g', 'c7g'], max_vcpu=2)
+  assert instance_types == ['r7g.medium', 'r7g.large', 'c7g.medium', 'c7g.large']
+
+def test_query_service():
+  assert InstanceTypes.query(service='rds', families=['t4g']) == ['db.t4g.medium', 'db.t4g.large']
+  assert InstanceTypes.query(service='opensearch', families=['t3']) == ['t3.small.search', 't3.medium.search']
+  assert 'cache.r4.large' in InstanceTypes.query(service='elasticache', current_generation=False)
+
+def test_query_local_nvme():
+  instance_types = InstanceTypes.query(local_nvme=True)
+  assert 'c5d.large' in instance_types
+  assert 'c5.large' not in instance_types
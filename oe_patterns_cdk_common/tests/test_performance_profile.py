@@ -0,0 +1,27 @@
+import pytest
+import subprocess
+
+from oe_patterns_cdk_common.performance_profile import PerformanceProfile
+
+def test_database_profile():
+  profile = PerformanceProfile("database")
+  assert profile.transparent_huge_pages == "never"
+  assert profile.sysctl_settings['vm.swappiness'] == 1
+  script = profile.script()
+  assert 'vm.dirty_background_ratio = 5\n' in script
+  assert 'fs.file-max' not in profile.sysctl_settings
+  assert 'if [[ $(cat /proc/sys/fs/file-max) -lt 2097152 ]]; then' in script
+  assert '* hard nofile 65536\n' in script
+  assert 'DefaultLimitNOFILE=65536' in script
+  assert 'KERNEL=="nvme[0-9]*n[0-9]*", ENV{DEVTYPE}=="disk", ATTR{queue/scheduler}="none"' in script
+  assert 'echo never > $FILE' in script
+  # the script is passed through Fn::Sub
+  assert '${' not in script
+
+def test_profiles_are_valid_bash():
+  for name in PerformanceProfile.SYSCTL_SETTINGS.keys():
+    subprocess.run(['bash', '-n'], input=PerformanceProfile(name).script(), text=True, check=True)
+
+def test_invalid_profile():
+  with pytest.raises(ValueError):
+    PerformanceProfile("batch")
@@ -0,0 +1,40 @@
+from aws_cdk import (
+  assertions,
+  Stack
+)
+
+from oe_patterns_cdk_common.asg import Asg
+from oe_patterns_cdk_common.subnet_az_provider import SubnetAzProvider
+from oe_patterns_cdk_common.vpc import Vpc
+
+def test_subnet_az_provider():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  provider = SubnetAzProvider.of(stack)
+  assert SubnetAzProvider.of(vpc) is provider
+  provider.availability_zone('TestVpcPrivateSubnet2', vpc.private_subnet2_id())
+  asg = Asg(stack, 'TestAsg', ami_id="test", singleton=True, use_data_volume=True, use_subnet_az_provider=True, vpc=vpc)
+  assert asg.subnet_to_az_custom_resource is provider.custom_resource
+  assert asg.subnet_to_az_lambda is provider.lambda_function
+  Asg(stack, 'TestAsg2', ami_id="test", singleton=True, use_data_volume=True, use_subnet_az_provider=True, vpc=vpc)
+  template = assertions.Template.from_stack(stack)
+  template.resource_count_is('AWS::Lambda::Function', 1)
+  custom_resource = template.find_resources('AWS::CloudFormation::CustomResource')['SubnetAzProviderCustomResource']
+  assert sorted(custom_resource['Properties']['subnets'].keys()) == ['TestVpcPrivateSubnet1', 'TestVpcPrivateSubnet2']
+  template.has_resource_properties('AWS::EC2::Volume', {
+    'AvailabilityZone': {'Fn::GetAtt': ['SubnetAzProviderCustomResource', 'TestVpcPrivateSubnet1']}
+  })
+  custom_resource = template.find_resources('AWS::CloudFormation::CustomResource')['SubnetAzProviderCustomResource']
+  assert custom_resource['DependsOn'] == ['SubnetAzProviderDescribeSubnetsPolicy']
+
+def test_subnet_to_az_lambda():
+  stack = Stack()
+  vpc = Vpc(stack, 'TestVpc')
+  Asg(stack, 'TestAsg', ami_id="test", singleton=True, use_data_volume=True, vpc=vpc)
+  template = assertions.Template.from_stack(stack)
+  template.resource_count_is('AWS::Lambda::Function', 1)
+  assert list(template.find_resources('AWS::Lambda::Function').keys()) == ['TestAsgSubnetToAzLambda']
+  assert 'TestAsgSubnetToAzCustomResource' in template.find_resources('AWS::CloudFormation::CustomResource')
+  template.has_resource_properties('AWS::EC2::Volume', {
+    'AvailabilityZone': {'Fn::GetAtt': ['TestAsgSubnetToAzCustomResource', 'az']}
+  })